@@ -1,7 +1,9 @@
 import logging
+import numpy as np
 import pandas as pd
 
 from agents.prompts.prompt_builder import PromptBuilder
+from sleeper.player_pool import RemainingPlayers
 
 logging.basicConfig(format="%(asctime)s [%(levelname)s] %(message)s", level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -12,7 +14,7 @@ class DraftStatusPrompt(PromptBuilder):
     def __init__(self, current_roster: pd.DataFrame, 
                  position_count: pd.DataFrame, 
                  draft_picks: pd.DataFrame, 
-                 remaining_players: pd.DataFrame):
+                 remaining_players: RemainingPlayers):
         super().__init__()
         self.current_roster = current_roster
         self.position_count = position_count
@@ -39,18 +41,12 @@ class DraftStatusPrompt(PromptBuilder):
         Returns:
         - DataFrame of top available players
         """
-        df_filtered = self.remaining_players.copy()
+        # The remaining players are already in ADP order, only the selected rows are taken from the players table
+        rows = self.remaining_players.rows(position)
+        adp = self.remaining_players.values('adp', rows)
+        rows = rows[adp != np.nanmax(adp)] if len(rows) else rows
 
-        if position:
-            if isinstance(position, str):
-                df_filtered = df_filtered[df_filtered['position'] == position]
-            elif isinstance(position, list):
-                df_filtered = df_filtered[df_filtered['position'].isin(position)]
-
-        df_filtered = df_filtered[df_filtered['adp'] != df_filtered['adp'].max()]
-        df_sorted = df_filtered.sort_values(by='adp', ascending=True)
-
-        return df_sorted.head(n)
+        return self.remaining_players.take(rows[:n])
     
 
     def get_top_available_by_tier(self, position=None, tier_max=3, n=10):
@@ -66,18 +62,11 @@ class DraftStatusPrompt(PromptBuilder):
         Returns:
         - DataFrame of top available players
         """
-        df_filtered = self.remaining_players.copy()
-
-        if position:
-            if isinstance(position, str):
-                df_filtered = df_filtered[df_filtered['position'] == position]
-            elif isinstance(position, list):
-                df_filtered = df_filtered[df_filtered['position'].isin(position)]
-
-        df_filtered = df_filtered[df_filtered['tier'] <= tier_max]
-        df_sorted = df_filtered.sort_values(by=['tier', 'intra_tier_ranking'], ascending=[True, True])
+        rows = self.remaining_players.rows(position)
+        rows = rows[self.remaining_players.values('tier', rows) <= tier_max]
+        order = np.lexsort((self.remaining_players.values('intra_tier_ranking', rows), self.remaining_players.values('tier', rows)))
 
-        return df_sorted.head(n)
+        return self.remaining_players.take(rows[order[:n]])
 
 
     def summarize_recent_picks(self, n=10):
@@ -97,6 +86,5 @@ class DraftStatusPrompt(PromptBuilder):
         Returns:
         - int: count of remaining players matching criteria
         """
-        df = self.remaining_players
-        filtered = df[df['position'].isin(positions) & (df['tier'] <= tier_cutoff)]
-        return len(filtered)
\ No newline at end of file
+        rows = self.remaining_players.rows(positions)
+        return int((self.remaining_players.values('tier', rows) <= tier_cutoff).sum())
\ No newline at end of file
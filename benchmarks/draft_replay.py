@@ -0,0 +1,265 @@
+import argparse
+from collections import Counter
+from datetime import datetime, timedelta
+import json
+import logging
+import os
+import time
+
+import numpy as np
+import requests
+
+from agents.prompts.draft_status_prompt import DraftStatusPrompt
+import sleeper.ffcalc_api as ffcalc_api
+from sleeper.http_transport import get_transport, set_transport
+import sleeper.sleeper_api as sleeper_api
+from sleeper.sleeper_league import League
+from spreadsheets.draft_spreadsheet.draft_spreadsheet import DraftSpreadsheet
+from spreadsheets.gspread_client import MEMORY_BACKEND, get_spreadsheet
+from spreadsheets.memory_backend import configure_memory_client
+from spreadsheets.sheet_write_queue import TokenBucket
+from spreadsheets.players_spreadsheet.players_snapshot import PlayersSnapshot
+from spreadsheets.spreadsheet_names import EFantasySpreadsheets
+
+logging.basicConfig(format="%(asctime)s [%(levelname)s] %(message)s", level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+# Files of a recorded draft directory, written by record_draft
+LEAGUE_INFO_FILE = "league_info.json"
+LEAGUE_ROSTERS_FILE = "league_rosters.json"
+USERS_FILE = "users.json"
+DRAFT_INFO_FILE = "draft_info.json"
+DRAFT_PICKS_FILE = "draft_picks.json"
+PLAYERS_SNAPSHOT_FILE = "players_snapshot.parquet"
+ADP_FILE = "adp_{scoring_format}.json"
+
+ADP_FORMATS = ["standard", "ppr", "rookie"]
+
+# Write rate used when the replay is not paced like the real Sheets quota
+UNPACED_WRITES_PER_MINUTE = 1e9
+
+# Marks an endpoint with no recorded payload
+_MISSING = object()
+
+
+
+def record_draft(league_id: str, recording_dir: str, players_df):
+    """Saves every sleeper and ADP response a completed draft needs, plus the players table, so run_replay can replay it offline"""
+    os.makedirs(recording_dir, exist_ok=True)
+
+    league_info = sleeper_api.get_league_info(league_id)
+    rosters = sleeper_api.get_league_rosters(league_id)
+    users = {str(roster.get("owner_id")): sleeper_api.get_user_info(roster.get("owner_id")) for roster in rosters}
+    recorded = {
+        LEAGUE_INFO_FILE: league_info,
+        LEAGUE_ROSTERS_FILE: rosters,
+        USERS_FILE: users,
+        DRAFT_INFO_FILE: sleeper_api.get_draft_info(league_info["draft_id"]),
+        DRAFT_PICKS_FILE: sleeper_api.get_draft_picks(league_info["draft_id"]),
+    }
+    for scoring_format in ADP_FORMATS:
+        # The raw response body is recorded, ffcalc_api.get_adp unwraps its players list on replay as it does live
+        try:
+            response = get_transport().get(f"{ffcalc_api.BASE_URL}/{scoring_format}", endpoint=f"adp_{scoring_format}")
+            response.raise_for_status()
+            recorded[ADP_FILE.format(scoring_format=scoring_format)] = response.json()
+        except Exception as e:
+            logger.warning(f"Unable to record {scoring_format} ADP: {e}")
+
+    for file_name, payload in recorded.items():
+        with open(os.path.join(recording_dir, file_name), "w", encoding="utf-8") as f:
+            json.dump(payload, f)
+    PlayersSnapshot(os.path.join(recording_dir, PLAYERS_SNAPSHOT_FILE)).write(players_df, source_updated_at=datetime.now())
+
+    logger.info(f"Recorded draft {league_info['draft_id']} of league {league_id} to {recording_dir}")
+
+
+
+class ReplayTransport:
+    """
+    Stand-in for HttpTransport that answers sleeper and ADP requests from a recorded draft directory.
+    The draft is replayed up to pick_no: the picks endpoint only returns picks made so far and the draft info
+    reports a drafting status with change markers that move with every pick, until the last pick completes it.
+    """
+    def __init__(self, recording_dir: str):
+        self.recording_dir = recording_dir
+        self.league_info = self._load(LEAGUE_INFO_FILE)
+        self.rosters = self._load(LEAGUE_ROSTERS_FILE)
+        self.users = self._load(USERS_FILE)
+        self.draft_info = self._load(DRAFT_INFO_FILE)
+        self.picks = sorted(self._load(DRAFT_PICKS_FILE), key=lambda pick: pick["pick_no"])
+
+        self.pick_no = 0
+        self.requests = Counter()
+        self._started_at = int(time.time() * 1000)
+
+
+    @property
+    def total_picks(self) -> int:
+        return len(self.picks)
+
+
+    def advance(self, picks: int=1):
+        """Makes the next picks of the recorded draft"""
+        self.pick_no = min(self.total_picks, self.pick_no + picks)
+
+
+    def get(self, url: str, endpoint: str=None, timeout: float | tuple=None) -> requests.Response:
+        """Answers a request with the recorded payload of its endpoint, 404 when nothing was recorded for it"""
+        self.requests[endpoint] += 1
+        match endpoint:
+            case "league_info":
+                payload = self.league_info
+            case "league_rosters":
+                payload = self.rosters
+            case "user_info":
+                payload = self.users.get(url.rsplit("/", 1)[-1], _MISSING)
+            case "draft_info":
+                payload = self._draft_info()
+            case "draft_picks":
+                payload = [pick for pick in self.picks if pick["pick_no"] <= self.pick_no]
+            case _ if endpoint and endpoint.startswith("adp_"):
+                payload = self._load(ADP_FILE.format(scoring_format=endpoint.removeprefix("adp_")), default=_MISSING)
+                # Older recordings stored the unwrapped players list
+                if isinstance(payload, list):
+                    payload = {"players": payload}
+            case _:
+                payload = _MISSING
+
+        response = requests.Response()
+        response.url = url
+        response.status_code = 404 if payload is _MISSING else 200
+        response._content = json.dumps(None if payload is _MISSING else payload).encode()
+        return response
+
+
+    def close(self):
+        pass
+
+
+    def _draft_info(self) -> dict:
+        """Recorded draft info as it looked after pick_no picks"""
+        complete = self.pick_no >= self.total_picks
+        return {
+            **self.draft_info,
+            "status": "complete" if complete else "drafting",
+            "last_picked": self._started_at + self.pick_no * 1000 if self.pick_no else None,
+            "last_message_id": str(self.pick_no),
+            "last_message_time": self._started_at + self.pick_no * 1000,
+        }
+
+
+    def _load(self, file_name: str, default=None):
+        path = os.path.join(self.recording_dir, file_name)
+        if default is not None and not os.path.exists(path):
+            return default
+        with open(path, encoding="utf-8") as f:
+            return json.load(f)
+
+
+    def __repr__(self):
+        return f"{self.__class__.__name__}({self.recording_dir}, pick_no={self.pick_no}/{self.total_picks})"
+
+
+
+def run_replay(recording_dir: str,
+               my_user_id: str=None,
+               picks_per_poll: int=1,
+               pick_interval: float=0.0,
+               sheets_latency: float=0.0,
+               writes_per_minute: float=None) -> dict:
+    """
+    Replays a recorded draft pick by pick through League, DraftSpreadsheet (on the in-memory Sheets backend) and DraftStatusPrompt.
+    For every poll it measures the time from the pick being made to the draftboard writes being flushed and to the prompt being built,
+    and counts the sleeper and Sheets requests. picks_per_poll > 1 simulates bursts of auto-picks between two polls.
+    The Sheets write pacing is lifted unless writes_per_minute is given, so the replay runs at accelerated speed.
+    """
+    transport = ReplayTransport(recording_dir)
+    previous_transport = get_transport()
+    set_transport(transport)
+    memory_client = configure_memory_client(latency=sheets_latency)
+
+    try:
+        players_df = PlayersSnapshot(os.path.join(recording_dir, PLAYERS_SNAPSHOT_FILE), ttl=timedelta.max).load()
+        if players_df is None:
+            raise FileNotFoundError(f"No players snapshot in {recording_dir}")
+
+        league = League(transport.league_info["league_id"], league_json=transport.league_info, redraft=True)
+        my_user_id = my_user_id or next(user_id for user_id in league.users if user_id)
+        my_user = league.users[my_user_id]
+
+        spreadsheet = get_spreadsheet(EFantasySpreadsheets.TEST, backend=MEMORY_BACKEND)
+        draft_spreadsheet = DraftSpreadsheet(my_user, spreadsheet, league, players_df)
+        draft_spreadsheet.write_queue.bucket = TokenBucket(rate_per_minute=writes_per_minute or UNPACED_WRITES_PER_MINUTE)
+        draft_spreadsheet.flush_writes()
+
+        memory_client.stats.reset()
+        transport.requests.clear()
+        board_latencies, prompt_latencies = [], []
+
+        while transport.pick_no < transport.total_picks:
+            transport.advance(picks_per_poll)
+            picked_at = time.perf_counter()
+
+            draft_spreadsheet.update_draftboard_spreadsheet()
+            draft_spreadsheet.flush_writes()
+            board_latencies.append(time.perf_counter() - picked_at)
+
+            picks_df, remaining_players_df = league.draft.retrieve_draft_state(players_df, refresh=False)
+            prompt = DraftStatusPrompt(my_user.roster.df, my_user.roster.position_count, picks_df, remaining_players_df)
+            prompt.get_top_available_by_adp()
+            prompt.summarize_recent_picks()
+            prompt_latencies.append(time.perf_counter() - picked_at)
+
+            if pick_interval:
+                time.sleep(pick_interval)
+
+    finally:
+        set_transport(previous_transport)
+
+    polls = len(board_latencies)
+    sheets_stats = memory_client.stats.as_dict()
+    results = {
+        "picks": transport.total_picks,
+        "polls": polls,
+        "board_latency_ms": _percentiles(board_latencies),
+        "prompt_latency_ms": _percentiles(prompt_latencies),
+        "sheets_requests_per_pick": sheets_stats["requests"] / transport.total_picks,
+        "sheets_cells_written_per_pick": sheets_stats["cells_written"] / transport.total_picks,
+        "sleeper_requests_per_pick": sum(transport.requests.values()) / transport.total_picks,
+        "sheets_requests": sheets_stats["by_method"],
+        "sleeper_requests": dict(transport.requests),
+    }
+
+    logger.info(f"Replayed {results['picks']} picks in {polls} polls from {recording_dir}")
+    for label in ("board_latency_ms", "prompt_latency_ms"):
+        logger.info(f"{label:<18} " + "  ".join(f"{key} {value:8.2f}" for key, value in results[label].items()))
+    logger.info(
+        f"per pick: {results['sheets_requests_per_pick']:.2f} sheets requests, "
+        f"{results['sheets_cells_written_per_pick']:.0f} cells written, {results['sleeper_requests_per_pick']:.2f} sleeper requests"
+    )
+    return results
+
+
+def _percentiles(seconds: list[float]) -> dict:
+    """p50, p95 and p99 of a list of durations, in milliseconds"""
+    if not seconds:
+        return {"p50": 0.0, "p95": 0.0, "p99": 0.0}
+    p50, p95, p99 = np.percentile(np.array(seconds) * 1000, [50, 95, 99])
+    return {"p50": float(p50), "p95": float(p95), "p99": float(p99)}
+
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Replay a recorded sleeper draft and report per-pick latency and request counts")
+    parser.add_argument("recording_dir")
+    parser.add_argument("--my-user-id")
+    parser.add_argument("--picks-per-poll", type=int, default=1)
+    parser.add_argument("--pick-interval", type=float, default=0.0)
+    parser.add_argument("--sheets-latency", type=float, default=0.0)
+    parser.add_argument("--writes-per-minute", type=float)
+    args = parser.parse_args()
+
+    run_replay(args.recording_dir, my_user_id=args.my_user_id, picks_per_poll=args.picks_per_poll,
+               pick_interval=args.pick_interval, sheets_latency=args.sheets_latency, writes_per_minute=args.writes_per_minute)
@@ -0,0 +1,424 @@
+import argparse
+from collections import Counter
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import json
+import logging
+import random
+import threading
+import time
+from urllib.parse import urlsplit
+
+import numpy as np
+
+import sleeper.ffcalc_api as ffcalc_api
+import sleeper.sleeper_api as sleeper_api
+
+logging.basicConfig(format="%(asctime)s [%(levelname)s] %(message)s", level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+ADP_FORMATS = ["standard", "ppr", "half-ppr", "2qb", "dynasty", "rookie"]
+
+# Rough position mix of the sleeper player pool
+POSITION_WEIGHTS = {"WR": 0.3, "RB": 0.2, "TE": 0.15, "QB": 0.15, "K": 0.1, "DEF": 0.1}
+
+# Share of healthy players (injury_status null) and the statuses sleeper reports for the others
+INJURY_STATUSES = {None: 0.85, "Questionable": 0.08, "Doubtful": 0.02, "Out": 0.03, "IR": 0.02}
+
+TEAMS = ["ARI", "ATL", "BAL", "BUF", "CAR", "CHI", "CIN", "CLE", "DAL", "DEN", "DET", "GB", "HOU", "IND", "JAX", "KC",
+         "LAC", "LAR", "LV", "MIA", "MIN", "NE", "NO", "NYG", "NYJ", "PHI", "PIT", "SEA", "SF", "TB", "TEN", "WAS"]
+
+
+
+class MockDraft:
+    """
+    A simulated sleeper league and snake draft that advances on its own pick clock.
+    The pick order follows the ADP with per draft noise, picks are revealed as wall clock time passes.
+    """
+    def __init__(self, index: int, player_ids: list[str], teams: int, rounds: int, pick_clock: float, start_time: float, rng: np.random.Generator):
+        self.league_id = f"mock_league_{index}"
+        self.draft_id = f"mock_draft_{index}"
+        self.user_ids = [f"mock_user_{index}_{slot}" for slot in range(1, teams + 1)]
+        self.teams = teams
+        self.rounds = rounds
+        self.pick_clock = pick_clock
+        self.start_time = start_time
+
+        noisy_ranks = np.arange(len(player_ids)) + rng.normal(0, teams / 2, len(player_ids))
+        self.player_order = [player_ids[i] for i in np.argsort(noisy_ranks, kind="stable")[:teams * rounds]]
+
+
+    @property
+    def total_picks(self) -> int:
+        return self.teams * self.rounds
+
+
+    def picks_made(self, now: float) -> int:
+        """Number of picks made by the given time"""
+        if now < self.start_time:
+            return 0
+        return min(self.total_picks, int((now - self.start_time) / self.pick_clock))
+
+
+    def status(self, now: float) -> str:
+        if now < self.start_time:
+            return "pre_draft"
+        return "complete" if self.picks_made(now) >= self.total_picks else "drafting"
+
+
+    def league_info(self, now: float) -> dict:
+        return {
+            "league_id": self.league_id,
+            "name": f"Mock League {self.league_id.rsplit('_', 1)[-1]}",
+            "draft_id": self.draft_id,
+            "status": "in_season" if self.status(now) == "complete" else "pre_draft",
+            "total_rosters": self.teams,
+            "roster_positions": ["QB", "RB", "RB", "WR", "WR", "TE", "FLEX", "K", "DEF"] + ["BN"] * max(0, self.rounds - 9),
+            "scoring_settings": {"rec": 0.5},
+            "settings": {"teams": self.teams, "type": 0},
+        }
+
+
+    def rosters(self, now: float) -> list[dict]:
+        players_by_slot = {slot: [] for slot in range(1, self.teams + 1)}
+        for pick in self.picks(now):
+            players_by_slot[pick["draft_slot"]].append(pick["player_id"])
+        return [
+            {"roster_id": slot, "owner_id": user_id, "league_id": self.league_id, "players": players_by_slot[slot] or None}
+            for slot, user_id in enumerate(self.user_ids, start=1)
+        ]
+
+
+    def draft_info(self, now: float) -> dict:
+        picks_made = self.picks_made(now)
+        last_picked = self.start_time + picks_made * self.pick_clock if picks_made else None
+        return {
+            "draft_id": self.draft_id,
+            "league_id": self.league_id,
+            "type": "snake",
+            "status": self.status(now),
+            "start_time": int(self.start_time * 1000),
+            "last_picked": int(last_picked * 1000) if last_picked else None,
+            "last_message_id": str(picks_made),
+            "last_message_time": int((last_picked or self.start_time) * 1000),
+            "draft_order": {user_id: slot for slot, user_id in enumerate(self.user_ids, start=1)},
+            "settings": {"teams": self.teams, "slots": self.teams, "rounds": self.rounds, "pick_timer": self.pick_clock, "reversal_round": 0},
+        }
+
+
+    def picks(self, now: float) -> list[dict]:
+        picks = []
+        for pick_no in range(1, self.picks_made(now) + 1):
+            draft_round = (pick_no - 1) // self.teams + 1
+            position = (pick_no - 1) % self.teams
+            draft_slot = position + 1 if draft_round % 2 else self.teams - position
+            picks.append({
+                "pick_no": pick_no,
+                "round": draft_round,
+                "draft_slot": draft_slot,
+                "roster_id": draft_slot,
+                "player_id": self.player_order[pick_no - 1],
+                "picked_by": self.user_ids[draft_slot - 1],
+                "draft_id": self.draft_id,
+                "is_keeper": None,
+                "metadata": {},
+            })
+        return picks
+
+
+    def __repr__(self):
+        return f"{self.__class__.__name__}({self.draft_id}, {self.teams}x{self.rounds}, pick_clock={self.pick_clock}s)"
+
+
+
+class MockApiState:
+    """
+    Player pool, ADP boards and drafts served by MockApiServer, all generated from a seed.
+    Drafts start stagger seconds apart so the load on the watchers ramps up instead of arriving all at once.
+    """
+    def __init__(self,
+                 drafts: int=10,
+                 teams: int=12,
+                 rounds: int=15,
+                 pick_clock: float=5.0,
+                 stagger: float=0.0,
+                 players: int=3000,
+                 seed: int=0):
+        rng = np.random.default_rng(seed)
+        self.players = self._generate_players(players, rng)
+        player_ids = list(self.players)
+        self.adp = {scoring_format: self._generate_adp(player_ids, rng) for scoring_format in ADP_FORMATS}
+
+        start_time = time.time()
+        self.drafts = [
+            MockDraft(index, player_ids, teams, rounds, pick_clock, start_time + index * stagger, rng)
+            for index in range(drafts)
+        ]
+        self.drafts_by_id = {draft.draft_id: draft for draft in self.drafts}
+        self.drafts_by_league_id = {draft.league_id: draft for draft in self.drafts}
+        self.drafts_by_user_id = {user_id: draft for draft in self.drafts for user_id in draft.user_ids}
+
+        self.players_json = json.dumps(self.players).encode()
+
+
+    def user(self, user_id: str) -> dict | None:
+        if user_id not in self.drafts_by_user_id:
+            return None
+        return {"user_id": user_id, "username": user_id, "display_name": user_id.removeprefix("mock_")}
+
+
+    def _generate_players(self, count: int, rng: np.random.Generator) -> dict:
+        """Sleeper /players/nfl style payload keyed by player_id, with every field the draftboard, picks and roster worksheets read"""
+        positions = rng.choice(list(POSITION_WEIGHTS), size=count, p=list(POSITION_WEIGHTS.values()))
+        injury_statuses = rng.choice(len(INJURY_STATUSES), size=count, p=list(INJURY_STATUSES.values()))
+        players = {}
+        for i, (position, injury_status) in enumerate(zip(positions, injury_statuses)):
+            player_id = str(1000 + i)
+            first_name, last_name = f"Mock{i}", f"Player{i}"
+            players[player_id] = {
+                "player_id": player_id,
+                "first_name": first_name,
+                "last_name": last_name,
+                "full_name": f"{first_name} {last_name}",
+                "position": str(position),
+                "fantasy_positions": [str(position)],
+                "team": TEAMS[i % len(TEAMS)],
+                "injury_status": list(INJURY_STATUSES)[injury_status],
+                # sleeper sends height in inches and weight in pounds as strings
+                "height": str(int(rng.integers(68, 79))),
+                "weight": str(int(rng.integers(180, 330))),
+                "age": int(rng.integers(21, 36)),
+                "years_exp": int(rng.integers(0, 12)),
+                "search_rank": i + 1,
+                "active": True,
+                "status": "Active",
+                "sport": "nfl",
+            }
+        return players
+
+
+    def _generate_adp(self, player_ids: list[str], rng: np.random.Generator) -> list[dict]:
+        """FantasyFootballCalculator style ADP board for the top of the player pool"""
+        board = []
+        for rank, player_id in enumerate(player_ids[:300]):
+            player = self.players[player_id]
+            board.append({
+                "player_id": rank + 1,
+                "name": player["full_name"],
+                "position": "PK" if player["position"] == "K" else player["position"],
+                "team": player["team"],
+                "adp": round(float(rank + 1 + rng.normal(0, 1.5)), 1),
+                "times_drafted": int(rng.integers(50, 500)),
+            })
+        return sorted(board, key=lambda entry: entry["adp"])
+
+
+
+class MockApiServer:
+    """
+    Local HTTP server answering the sleeper and FantasyFootballCalculator endpoints sleeper_api and ffcalc_api use, for load testing the draft watchers.
+    Every request can be delayed by latency (+ up to latency_jitter) and fails with a 429 (with Retry-After) or a 500 at the given rates.
+    The sleeper endpoints are served from the root and the ADP boards from /adp, see sleeper_base_url and ffcalc_base_url.
+    """
+    def __init__(self,
+                 state: MockApiState=None,
+                 host: str="127.0.0.1",
+                 port: int=0,
+                 latency: float=0.0,
+                 latency_jitter: float=0.0,
+                 throttle_rate: float=0.0,
+                 error_rate: float=0.0,
+                 retry_after: float=1.0,
+                 seed: int=None):
+        self.state = state or MockApiState()
+        self.latency = latency
+        self.latency_jitter = latency_jitter
+        self.throttle_rate = throttle_rate
+        self.error_rate = error_rate
+        self.retry_after = retry_after
+
+        self.requests = Counter()
+        self.statuses = Counter()
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self._thread = None
+
+        self.httpd = ThreadingHTTPServer((host, port), self._handler_class())
+        self.httpd.daemon_threads = True
+
+
+    @property
+    def url(self) -> str:
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+
+    @property
+    def sleeper_base_url(self) -> str:
+        return self.url
+
+
+    @property
+    def ffcalc_base_url(self) -> str:
+        return f"{self.url}/adp"
+
+
+    def start(self) -> "MockApiServer":
+        """Serves requests from a background thread"""
+        self._thread = threading.Thread(target=self.httpd.serve_forever, name="mock_api_server", daemon=True)
+        self._thread.start()
+        logger.info(f"Started {self} with {len(self.state.drafts)} drafts")
+        return self
+
+
+    def stop(self):
+        logger.info(f"Stopping {self}, served {sum(self.requests.values())} requests {dict(self.statuses)}")
+        self.httpd.shutdown()
+        self.httpd.server_close()
+        if self._thread is not None:
+            self._thread.join()
+
+
+    @contextmanager
+    def patch_api_base_urls(self):
+        """Points sleeper_api and ffcalc_api at this server for the duration of the block"""
+        previous_urls = sleeper_api.BASE_URL, ffcalc_api.BASE_URL
+        sleeper_api.BASE_URL, ffcalc_api.BASE_URL = self.sleeper_base_url, self.ffcalc_base_url
+        try:
+            yield self
+        finally:
+            sleeper_api.BASE_URL, ffcalc_api.BASE_URL = previous_urls
+
+
+    def handle(self, path: str) -> tuple[int, bytes, dict]:
+        """Routes a request path, returns the status code, body and extra headers"""
+        parts = [part for part in urlsplit(path).path.split("/") if part]
+        route = self._route_name(parts)
+        with self._lock:
+            self.requests[route] += 1
+            delay = self.latency + (self._random.uniform(0, self.latency_jitter) if self.latency_jitter else 0.0)
+            fault = self._random.random()
+
+        if delay:
+            time.sleep(delay)
+
+        if fault < self.throttle_rate:
+            return self._respond(429, {"error": "rate limited"}, {"Retry-After": f"{self.retry_after:g}"})
+        if fault < self.throttle_rate + self.error_rate:
+            return self._respond(500, {"error": "injected error"})
+
+        now = time.time()
+        match parts:
+            case ["user", user_id]:
+                return self._respond(200, self.state.user(user_id))
+            case ["user", user_id, "leagues", _, _]:
+                draft = self.state.drafts_by_user_id.get(user_id)
+                return self._respond(200, [draft.league_info(now)] if draft else [])
+            case ["league", league_id]:
+                draft = self.state.drafts_by_league_id.get(league_id)
+                return self._respond(200, draft.league_info(now) if draft else None)
+            case ["league", league_id, "rosters"]:
+                draft = self.state.drafts_by_league_id.get(league_id)
+                return self._respond(200, draft.rosters(now) if draft else None)
+            case ["draft", draft_id]:
+                draft = self.state.drafts_by_id.get(draft_id)
+                return self._respond(200, draft.draft_info(now) if draft else None)
+            case ["draft", draft_id, "picks"]:
+                draft = self.state.drafts_by_id.get(draft_id)
+                return self._respond(200, draft.picks(now) if draft else None)
+            case ["players", "nfl"]:
+                return self._respond(200, body=self.state.players_json)
+            case ["adp", scoring_format] if scoring_format in self.state.adp:
+                return self._respond(200, {"status": "Success", "players": self.state.adp[scoring_format]})
+
+        return self._respond(404, {"error": f"Unknown path {path}"})
+
+
+    def _respond(self, status_code: int, payload=None, headers: dict=None, body: bytes=None) -> tuple[int, bytes, dict]:
+        with self._lock:
+            self.statuses[status_code] += 1
+        return status_code, body if body is not None else json.dumps(payload).encode(), headers or {}
+
+
+    @staticmethod
+    def _route_name(parts: list[str]) -> str:
+        """Request path with the ids stripped, used to count requests per endpoint"""
+        match parts:
+            case ["user", _]:
+                return "user_info"
+            case ["user", _, "leagues", *_]:
+                return "user_leagues"
+            case ["league", _]:
+                return "league_info"
+            case ["league", _, "rosters"]:
+                return "league_rosters"
+            case ["draft", _]:
+                return "draft_info"
+            case ["draft", _, "picks"]:
+                return "draft_picks"
+            case ["players", "nfl"]:
+                return "players"
+            case ["adp", scoring_format]:
+                return f"adp_{scoring_format}"
+        return "unknown"
+
+
+    def _handler_class(self) -> type[BaseHTTPRequestHandler]:
+        server = self
+
+        class MockApiHandler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_GET(self):
+                status_code, body, headers = server.handle(self.path)
+                self.send_response(status_code)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                for name, value in headers.items():
+                    self.send_header(name, value)
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                logger.debug(f"{self.address_string()} {format % args}")
+
+        return MockApiHandler
+
+
+    def __repr__(self):
+        return f"{self.__class__.__name__}({self.url}, latency={self.latency}s, throttle_rate={self.throttle_rate}, error_rate={self.error_rate})"
+
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Serve mock sleeper and FantasyFootballCalculator APIs with simulated drafts")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--drafts", type=int, default=10)
+    parser.add_argument("--teams", type=int, default=12)
+    parser.add_argument("--rounds", type=int, default=15)
+    parser.add_argument("--pick-clock", type=float, default=5.0, help="Seconds between picks in every draft")
+    parser.add_argument("--stagger", type=float, default=0.0, help="Seconds between the start of two drafts")
+    parser.add_argument("--players", type=int, default=3000)
+    parser.add_argument("--latency", type=float, default=0.0)
+    parser.add_argument("--latency-jitter", type=float, default=0.0)
+    parser.add_argument("--throttle-rate", type=float, default=0.0, help="Share of requests answered with a 429")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Share of requests answered with a 500")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    state = MockApiState(drafts=args.drafts, teams=args.teams, rounds=args.rounds, pick_clock=args.pick_clock,
+                         stagger=args.stagger, players=args.players, seed=args.seed)
+    server = MockApiServer(state, host=args.host, port=args.port, latency=args.latency, latency_jitter=args.latency_jitter,
+                           throttle_rate=args.throttle_rate, error_rate=args.error_rate, seed=args.seed)
+    server.start()
+    logger.info(f"export {sleeper_api.BASE_URL_ENV}={server.sleeper_base_url} {ffcalc_api.BASE_URL_ENV}={server.ffcalc_base_url}")
+    logger.info(f"League ids: {', '.join(draft.league_id for draft in state.drafts)}")
+
+    try:
+        while True:
+            time.sleep(60)
+            logger.info(f"Served {sum(server.requests.values())} requests: {dict(server.requests)}")
+    except KeyboardInterrupt:
+        server.stop()
@@ -0,0 +1,68 @@
+import logging
+import random
+import re
+import timeit
+
+import pandas as pd
+
+import spreadsheets.spreadsheet_utils as spreadsheet_utils
+from spreadsheets.spreadsheet_utils import normalize_names
+
+logging.basicConfig(format="%(asctime)s [%(levelname)s] %(message)s", level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+FIRST_NAMES = ["Patrick", "Ja'Marr", "D.K.", "Amon-Ra", "Kenneth", "Marvin", "Odell", "T.J.", "De'Von", "Travis"]
+LAST_NAMES = ["Mahomes", "Chase", "Metcalf", "St. Brown", "Walker", "Harrison", "Beckham", "Hockenson", "Achane", "Etienne"]
+SUFFIXES = ["", "", "", " Jr.", " Sr.", " II", " III", " IV", " V"]
+
+
+def legacy_normalize_name(name: str):
+    """normalize_name as it was before the vectorized engine, kept here as the benchmark baseline"""
+    if not isinstance(name, str):
+        name = ""
+    name = name.lower().strip()
+    name = re.sub(r'\b(jr\.?|sr\.?|ii|iii|iv|v)\b', '', name)
+    name = re.sub(r'[^\w\s]', '', name)
+    name = re.sub(r'\s+', ' ', name)
+    return name.strip()
+
+
+def build_names(n_players: int=12_000, seed: int=7) -> pd.Series:
+    """Builds a Series of player names shaped like the sleeper players table, with suffixes, punctuation and missing names"""
+    rng = random.Random(seed)
+    names = [
+        f"  {rng.choice(FIRST_NAMES)}  {rng.choice(LAST_NAMES)}{rng.choice(SUFFIXES)} {i} "
+        for i in range(n_players)
+    ]
+    for i in rng.sample(range(n_players), n_players // 50):
+        names[i] = None
+    return pd.Series(names, dtype=object)
+
+
+def run_benchmark(n_players: int=12_000, repeat: int=5) -> dict:
+    """Times the legacy Series.apply normalization against normalize_names with a cold and a warm memo"""
+    names = build_names(n_players)
+
+    expected = names.apply(legacy_normalize_name)
+    spreadsheet_utils._name_memo.clear()
+    assert normalize_names(names).tolist() == expected.tolist(), "normalize_names does not match the legacy normalization"
+
+    def cold():
+        spreadsheet_utils._name_memo.clear()
+        normalize_names(names)
+
+    results = {
+        "legacy_apply": min(timeit.repeat(lambda: names.apply(legacy_normalize_name), number=1, repeat=repeat)),
+        "normalize_names_cold": min(timeit.repeat(cold, number=1, repeat=repeat)),
+        "normalize_names_warm": min(timeit.repeat(lambda: normalize_names(names), number=1, repeat=repeat)),
+    }
+    for label, seconds in results.items():
+        logger.info(f"{label:<22} {seconds * 1000:8.2f} ms for {n_players} names ({results['legacy_apply'] / seconds:5.1f}x legacy)")
+
+    return results
+
+
+
+if __name__ == "__main__":
+    run_benchmark()
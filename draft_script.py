@@ -2,6 +2,8 @@ import logging
 import pandas as pd
 
 from agents.prompts.draft_status_prompt import DraftStatusPrompt
+from instrumentation.metrics import get_registry
+from instrumentation.tracing import get_tracer
 
 from sleeper.sleeper_draft import Draft
 from sleeper.sleeper_league import League
@@ -9,6 +11,7 @@ from sleeper.sleeper_user import User
 
 from spreadsheets.draft_tiers_worksheet import DraftTiersWorksheet
 from spreadsheets.draft_spreadsheet.draft_spreadsheet import DraftSpreadsheet
+from spreadsheets.players_spreadsheet.players_snapshot import PlayersSnapshot
 from spreadsheets.players_spreadsheet.players_spreadsheet import PlayersSpreadsheet
 from spreadsheets.gspread_client import get_spreadsheet
 from spreadsheets.spreadsheet_names import EFantasySpreadsheets
@@ -18,7 +21,11 @@ logger = logging.getLogger(__name__)
 
 
 def get_players_df():
-    """Retrieves a dataframe of the NFL player data from the PlayersSpreadsheet"""
+    """Retrieves a dataframe of the NFL player data, from the local PlayersSnapshot when it is fresh, otherwise from the PlayersSpreadsheet"""
+    players_df = PlayersSnapshot().load()
+    if players_df is not None:
+        return players_df
+
     spreadsheet = get_spreadsheet(EFantasySpreadsheets.PLAYERS)
     players_spreadsheet = PlayersSpreadsheet(spreadsheet)
     return players_spreadsheet.retrieve_player_data()
@@ -33,6 +40,26 @@ def merge_players_df_and_tier_df(players_df):
     return pd.merge(players_df, positional_tiers[["player_id", "tier", "intra_tier_ranking"]], how="left", on=["player_id"])
 
 
+def watch_draft(draft_spreadsheet: DraftSpreadsheet):
+    """Keeps the draft spreadsheet up to date until the draft is complete, polling at the pace set by its DraftPollScheduler"""
+    # In case the draft is already complete, call once before looping.
+    draft_spreadsheet.update_draftboard_spreadsheet()
+
+    while draft_spreadsheet.draft.status != Draft.COMPLETE:
+        update_status = draft_spreadsheet.update_draftboard_spreadsheet()
+
+        if update_status:
+            logger.info(f"{draft_spreadsheet} updated with new data.")
+
+        draft_spreadsheet.scheduler.sleep()
+
+    draft_spreadsheet.flush_writes()
+    get_tracer().write_summary()
+
+    if get_registry().enabled:
+        logger.info(f"Draft metrics: {get_registry().to_json()}")
+
+
 if __name__ == "__main__":
     # players_df = get_players_df()
     # my_user = User("thecondor")
@@ -44,14 +71,7 @@ if __name__ == "__main__":
     # spreadsheet = get_spreadsheet(EFantasySpreadsheets.TEST)
     # draft_spreadsheet = DraftSpreadsheet(my_user, spreadsheet, league, players_df)
 
-    # # In case the draft is already complete, call once before looping.
-    # draft_spreadsheet.update_draftboard_spreadsheet()
-
-    # while draft_spreadsheet.draft.status != Draft.COMPLETE:
-    #     update_status = draft_spreadsheet.update_draftboard_spreadsheet()
-
-    #     if update_status:
-    #         logger.info(f"{draft_spreadsheet} updated with new data.")
+    # watch_draft(draft_spreadsheet)
 
     players_df = get_players_df()
     tier_merged_df = merge_players_df_and_tier_df(players_df)
@@ -0,0 +1,197 @@
+import argparse
+import asyncio
+import logging
+from typing import Callable
+
+import pandas as pd
+
+from draft_script import get_players_df, merge_players_df_and_tier_df
+from instrumentation.tracing import get_tracer, span
+
+from sleeper.adp_provider import AdpProvider
+from sleeper.draft_scheduler import DraftPollScheduler
+from sleeper.sleeper_draft import Draft
+from sleeper.sleeper_league import League
+from sleeper.sleeper_user import User
+
+from spreadsheets.draft_spreadsheet.draft_spreadsheet import DraftSpreadsheet
+from spreadsheets.gspread_client import get_spreadsheet
+from spreadsheets.sheet_write_queue import DEFAULT_WRITES_PER_MINUTE, TokenBucket
+
+logging.basicConfig(format="%(asctime)s [%(levelname)s] %(message)s", level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+# Sleeper asks clients to stay under 1000 API calls per minute, this budget is shared by every watched draft
+DEFAULT_REQUESTS_PER_MINUTE = 600
+
+
+
+class WatchedDraft:
+    """A league watched by the DraftSupervisor, with the poll scheduler of its draft and its draft spreadsheet if it has one"""
+    def __init__(self, league: League, my_user: User=None, draft_spreadsheet: DraftSpreadsheet=None):
+        self.league = league
+        self.draft = league.draft
+        self.my_user = my_user
+        self.draft_spreadsheet = draft_spreadsheet
+        self.scheduler = draft_spreadsheet.scheduler if draft_spreadsheet else DraftPollScheduler(self.draft, my_user_id=my_user.id if my_user else None)
+
+        self.polls = 0
+        self.updates = 0
+
+
+    def __repr__(self):
+        return f"{self.__class__.__name__}({self.league.name}, {self.draft}, polls={self.polls}, updates={self.updates})"
+
+
+
+class DraftSupervisor:
+    """
+    Watches the drafts of several leagues from one process.
+    The players table and the ADP cache are loaded once and shared by every league, so the ADP sorted players table is built once.
+    Every draft is polled by its own DraftPollScheduler on a single event loop, all sleeper requests draw from one global token bucket
+    and all draft spreadsheets share one Sheets write budget.
+    New picks are handed to the league's DraftSpreadsheet (if a spreadsheet was given for it) and to the on_picks callback on a worker thread.
+    """
+    def __init__(self,
+                 league_ids: list[str],
+                 players_df: pd.DataFrame,
+                 my_username: str=None,
+                 redraft: bool=True,
+                 spreadsheets: dict=None,
+                 on_picks: Callable[[League, Draft], None]=None,
+                 requests_per_minute: float=DEFAULT_REQUESTS_PER_MINUTE,
+                 sheets_writes_per_minute: float=DEFAULT_WRITES_PER_MINUTE):
+        self.league_ids = list(dict.fromkeys(league_ids))
+        self.players_df = players_df
+        self.my_username = my_username
+        self.redraft = redraft
+        self.spreadsheets = spreadsheets or {}
+        self.on_picks = on_picks
+
+        self.adp_provider = AdpProvider(is_redraft=redraft)
+        self.request_bucket = TokenBucket(rate_per_minute=requests_per_minute, capacity=max(5, int(requests_per_minute // 30)))
+        self.sheets_bucket = TokenBucket(rate_per_minute=sheets_writes_per_minute)
+        self.watched = {}
+
+
+    def run(self):
+        """Builds the leagues and watches every draft until all of them are complete"""
+        asyncio.run(self.watch())
+
+
+    async def build(self):
+        """Creates every league with the shared ADP provider, and its draft spreadsheet if one was given"""
+        logger.info(f"Building {len(self.league_ids)} leagues for {self}")
+        leagues = await asyncio.gather(
+            *(League.create_async(league_id, redraft=self.redraft, adp_provider=self.adp_provider) for league_id in self.league_ids),
+            return_exceptions=True,
+        )
+
+        for league_id, league in zip(self.league_ids, leagues):
+            if isinstance(league, Exception):
+                logger.error(f"Unable to build league {league_id}, it will not be watched: {league}")
+                continue
+            self.watched[league_id] = await asyncio.to_thread(self._watch_league, league)
+
+        # Build the ADP sorted players table once, every draft reuses it
+        await asyncio.to_thread(self.adp_provider.merge, self.players_df)
+
+
+    async def watch(self):
+        """Polls every draft on this event loop until all of them are complete, then sends the remaining spreadsheet writes"""
+        if not self.watched:
+            await self.build()
+
+        await asyncio.gather(*(self._watch_draft(watched) for watched in self.watched.values()))
+
+        for watched in self.watched.values():
+            if watched.draft_spreadsheet:
+                await asyncio.to_thread(watched.draft_spreadsheet.flush_writes)
+        get_tracer().write_summary()
+
+        for watched in self.watched.values():
+            logger.info(f"{watched} finished, {watched.draft.requests_saved} picks requests saved")
+
+
+    def _watch_league(self, league: League) -> WatchedDraft:
+        """Finds my user in the league and creates its draft spreadsheet, on a worker thread since the spreadsheet setup blocks"""
+        my_user_id = league.username_id_map.get(self.my_username) if self.my_username else None
+        my_user = league.users.get(my_user_id)
+        if self.my_username and my_user is None:
+            logger.warning(f"{self.my_username} is not a member of {league}, its picks are not prioritized")
+
+        draft_spreadsheet = None
+        spreadsheet_name = self.spreadsheets.get(league.id)
+        if spreadsheet_name and my_user is None:
+            logger.warning(f"Skipping the draft spreadsheet of {league}, it needs a league member to build the roster worksheet")
+        elif spreadsheet_name:
+            draft_spreadsheet = DraftSpreadsheet(my_user, get_spreadsheet(spreadsheet_name), league, self.players_df)
+            draft_spreadsheet.write_queue.bucket = self.sheets_bucket
+
+        return WatchedDraft(league, my_user=my_user, draft_spreadsheet=draft_spreadsheet)
+
+
+    async def _watch_draft(self, watched: WatchedDraft):
+        """Poll loop of one draft, paced by its scheduler and by the global request budget"""
+        draft = watched.draft
+        while True:
+            await self.request_bucket.acquire_async()
+            requests_saved = draft.requests_saved
+            try:
+                status = await draft.update_picks_async()
+
+            except Exception as e:
+                logger.warning(f"Polling {draft} failed, retrying: {e}")
+                await asyncio.sleep(watched.scheduler.default_interval)
+                continue
+
+            if draft.requests_saved == requests_saved:
+                # The picks were fetched too, pay for the second request before the next poll
+                await self.request_bucket.acquire_async()
+            watched.polls += 1
+
+            if draft.new_picks or (not watched.updates and draft.picks):
+                await asyncio.to_thread(self._handle_picks, watched)
+
+            if status == Draft.COMPLETE:
+                return
+            await asyncio.sleep(watched.scheduler.next_interval())
+
+
+    def _handle_picks(self, watched: WatchedDraft):
+        """Hands the latest picks of a draft to its spreadsheet and the on_picks callback"""
+        with span("tick", draft_id=watched.draft.id, pick_no=watched.draft.last_pick_no, new_picks=len(watched.draft.new_picks)):
+            try:
+                if watched.draft_spreadsheet:
+                    watched.draft_spreadsheet.update_worksheets()
+                if self.on_picks:
+                    self.on_picks(watched.league, watched.draft)
+
+            except Exception as e:
+                logger.error(f"Failed to handle the new picks of {watched}: {e}")
+
+        watched.updates += 1
+        logger.info(f"{watched.league.name} pick {watched.draft.last_pick_no} handled")
+
+
+    def __repr__(self):
+        return f"{self.__class__.__name__}(leagues={len(self.league_ids)}, watched={len(self.watched)}, {self.request_bucket})"
+
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Watch the drafts of several sleeper leagues from one process")
+    parser.add_argument("league_ids", nargs="+")
+    parser.add_argument("--my-username")
+    parser.add_argument("--dynasty", action="store_true", help="Use the rookie ADP instead of the redraft ADP")
+    parser.add_argument("--spreadsheet", action="append", default=[], metavar="LEAGUE_ID=SPREADSHEET", help="Draft spreadsheet to keep up to date for a league")
+    parser.add_argument("--requests-per-minute", type=float, default=DEFAULT_REQUESTS_PER_MINUTE)
+    args = parser.parse_args()
+
+    players_df = merge_players_df_and_tier_df(get_players_df())
+    spreadsheets = dict(mapping.split("=", 1) for mapping in args.spreadsheet)
+
+    supervisor = DraftSupervisor(args.league_ids, players_df, my_username=args.my_username, redraft=not args.dynasty,
+                                 spreadsheets=spreadsheets, requests_per_minute=args.requests_per_minute)
+    supervisor.run()
@@ -0,0 +1,189 @@
+from bisect import bisect_left
+import functools
+import json
+import logging
+import os
+import threading
+import time
+
+logging.basicConfig(format="%(asctime)s [%(levelname)s] %(message)s", level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+# Set to 1 / true to collect metrics from startup, otherwise call enable_metrics
+METRICS_ENABLED_ENV = "METRICS_ENABLED"
+
+METRICS_PREFIX = "fantasy_draft"
+
+# Families of operations that are measured and the label that tells their members apart
+HTTP_REQUESTS = "http_requests"
+WORKSHEET_OPERATIONS = "worksheet_operations"
+DATAFRAME_STAGES = "dataframe_stages"
+
+LABEL_NAMES = {
+    HTTP_REQUESTS: "endpoint",
+    WORKSHEET_OPERATIONS: "operation",
+    DATAFRAME_STAGES: "stage",
+}
+
+# Upper bounds in seconds of the latency histogram buckets
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+
+class OperationStats:
+    """Call, error and byte counts and a latency histogram of one measured operation"""
+    __slots__ = ("calls", "errors", "bytes", "seconds", "max_seconds", "bucket_counts")
+
+    def __init__(self, buckets: int):
+        self.calls = 0
+        self.errors = 0
+        self.bytes = 0
+        self.seconds = 0.0
+        self.max_seconds = 0.0
+        self.bucket_counts = [0] * (buckets + 1)
+
+
+    def observe(self, bucket: int, seconds: float, nbytes: int, error: bool):
+        self.calls += 1
+        self.errors += error
+        self.bytes += nbytes
+        self.seconds += seconds
+        self.max_seconds = max(self.max_seconds, seconds)
+        self.bucket_counts[bucket] += 1
+
+
+
+class MetricsRegistry:
+    """
+    Process-wide store of operation metrics, grouped by family (HTTP requests, worksheet operations, dataframe stages) and label.
+    While disabled nothing is recorded, instrumented code only pays for a check of the enabled flag.
+    """
+    def __init__(self, enabled: bool=False, buckets: tuple[float]=LATENCY_BUCKETS):
+        self.enabled = enabled
+        self.buckets = buckets
+
+        self._lock = threading.Lock()
+        self._families = {}
+
+
+    def observe(self, family: str, label: str, seconds: float, nbytes: int=0, error: bool=False):
+        """Records one call of an operation"""
+        bucket = bisect_left(self.buckets, seconds)
+        with self._lock:
+            stats = self._families.setdefault(family, {}).get(label)
+            if stats is None:
+                stats = self._families[family][label] = OperationStats(len(self.buckets))
+            stats.observe(bucket, seconds, nbytes, error)
+
+
+    def reset(self):
+        """Drops everything recorded so far"""
+        with self._lock:
+            self._families = {}
+
+
+    def snapshot(self) -> dict:
+        """Copy of the recorded metrics as plain dicts, latencies in seconds"""
+        with self._lock:
+            return {
+                family: {
+                    label: {
+                        "calls": stats.calls,
+                        "errors": stats.errors,
+                        "bytes": stats.bytes,
+                        "seconds_total": stats.seconds,
+                        "seconds_mean": stats.seconds / stats.calls if stats.calls else 0.0,
+                        "seconds_max": stats.max_seconds,
+                        "buckets": dict(zip([*map(str, self.buckets), "+Inf"], stats.bucket_counts)),
+                    }
+                    for label, stats in sorted(labels.items())
+                }
+                for family, labels in sorted(self._families.items())
+            }
+
+
+    def to_json(self, indent: int=None) -> str:
+        """JSON snapshot of the recorded metrics"""
+        return json.dumps({"enabled": self.enabled, "timestamp": time.time(), "metrics": self.snapshot()}, indent=indent)
+
+
+    def to_prometheus(self) -> str:
+        """Recorded metrics in the Prometheus text exposition format"""
+        lines = []
+        for family, labels in self.snapshot().items():
+            name = f"{METRICS_PREFIX}_{family}"
+            label_name = LABEL_NAMES.get(family, "name")
+
+            for suffix, key, description in (("calls_total", "calls", "Calls"), ("errors_total", "errors", "Failed calls"), ("bytes_total", "bytes", "Bytes received")):
+                lines.append(f"# HELP {name}_{suffix} {description} per {label_name}")
+                lines.append(f"# TYPE {name}_{suffix} counter")
+                lines.extend(f'{name}_{suffix}{{{label_name}="{_escape(label)}"}} {stats[key]}' for label, stats in labels.items())
+
+            lines.append(f"# HELP {name}_seconds Latency per {label_name} in seconds")
+            lines.append(f"# TYPE {name}_seconds histogram")
+            for label, stats in labels.items():
+                cumulative = 0
+                for bound, count in stats["buckets"].items():
+                    cumulative += count
+                    lines.append(f'{name}_seconds_bucket{{{label_name}="{_escape(label)}",le="{bound}"}} {cumulative}')
+                lines.append(f'{name}_seconds_sum{{{label_name}="{_escape(label)}"}} {stats["seconds_total"]}')
+                lines.append(f'{name}_seconds_count{{{label_name}="{_escape(label)}"}} {stats["calls"]}')
+
+        return "\n".join(lines) + "\n"
+
+
+    def __repr__(self):
+        return f"{self.__class__.__name__}(enabled={self.enabled}, families={list(self._families)})"
+
+
+
+def _escape(label: str) -> str:
+    """Escapes a Prometheus label value"""
+    return str(label).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+
+_registry = MetricsRegistry(enabled=os.environ.get(METRICS_ENABLED_ENV, "").lower() in ("1", "true", "yes"))
+
+
+def get_registry() -> MetricsRegistry:
+    """Returns the process-wide metrics registry"""
+    return _registry
+
+
+def enable_metrics():
+    """Starts recording metrics"""
+    _registry.enabled = True
+    logger.info(f"Enabled metrics collection in {_registry}")
+
+
+def disable_metrics():
+    """Stops recording metrics, what was recorded so far is kept"""
+    _registry.enabled = False
+
+
+def instrumented(family: str, label: str=None):
+    """
+    Decorator recording the latency and errors of every call of the function in the given family, labelled with the function name by default.
+    Costs a single flag check per call while metrics are disabled.
+    """
+    def decorator(func):
+        name = label or func.__name__
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not _registry.enabled:
+                return func(*args, **kwargs)
+
+            started_at = time.perf_counter()
+            try:
+                result = func(*args, **kwargs)
+            except Exception:
+                _registry.observe(family, name, time.perf_counter() - started_at, error=True)
+                raise
+            _registry.observe(family, name, time.perf_counter() - started_at)
+            return result
+
+        return wrapper
+    return decorator
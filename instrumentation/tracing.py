@@ -0,0 +1,247 @@
+import argparse
+from collections import defaultdict
+from contextlib import contextmanager
+from contextvars import ContextVar
+import json
+import logging
+import os
+import threading
+import time
+import uuid
+
+logging.basicConfig(format="%(asctime)s [%(levelname)s] %(message)s", level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+# Set to a file path to trace from startup, otherwise call configure_tracer
+TRACE_FILE_ENV = "DRAFT_TRACE_FILE"
+
+TRACE_FILE = "cache/draft_trace.jsonl"
+
+# Separator of the span names in a flame stack, as in the folded stack format
+STACK_SEPARATOR = ";"
+
+
+
+class Span:
+    """A timed stage of a trace, with attributes such as the pick number and the rows and cells written"""
+    __slots__ = ("trace_id", "span_id", "parent_id", "name", "stack", "attributes", "start_time", "duration", "child_duration", "_started_at")
+
+    def __init__(self, name: str, parent: "Span"=None, attributes: dict=None):
+        self.trace_id = parent.trace_id if parent else uuid.uuid4().hex[:16]
+        self.span_id = uuid.uuid4().hex[:16]
+        self.parent_id = parent.span_id if parent else None
+        self.name = name
+        self.stack = f"{parent.stack}{STACK_SEPARATOR}{name}" if parent else name
+        self.attributes = dict(attributes or {})
+        self.start_time = time.time()
+        self.duration = None
+        self.child_duration = 0.0
+        self._started_at = time.perf_counter()
+
+
+    def set(self, **attributes):
+        """Sets attributes of the span"""
+        self.attributes.update(attributes)
+
+
+    def add(self, **counters):
+        """Adds to numeric attributes of the span, e.g. the rows and bytes of each write made inside it"""
+        for key, value in counters.items():
+            self.attributes[key] = self.attributes.get(key, 0) + value
+
+
+    def finish(self):
+        self.duration = time.perf_counter() - self._started_at
+
+
+    @property
+    def self_duration(self) -> float:
+        """Time spent in the span itself and not in its child spans of the same thread"""
+        return max(0.0, (self.duration or 0.0) - self.child_duration)
+
+
+    def to_dict(self) -> dict:
+        return {
+            "type": "span",
+            "trace_id": self.trace_id,
+            "span_id": self.span_id,
+            "parent_id": self.parent_id,
+            "name": self.name,
+            "stack": self.stack,
+            "start_time": self.start_time,
+            "duration_ms": (self.duration or 0.0) * 1000,
+            "self_ms": self.self_duration * 1000,
+            "thread": threading.current_thread().name,
+            "attributes": self.attributes,
+        }
+
+
+    def __repr__(self):
+        return f"{self.__class__.__name__}({self.stack}, trace_id={self.trace_id})"
+
+
+
+class _NoopSpan:
+    """Stand-in returned while tracing is disabled, every call is ignored"""
+    trace_id = span_id = parent_id = None
+    stack = ""
+
+    def set(self, **attributes):
+        pass
+
+    def add(self, **counters):
+        pass
+
+    def __bool__(self):
+        return False
+
+
+NOOP_SPAN = _NoopSpan()
+
+_current_span = ContextVar("current_span", default=NOOP_SPAN)
+
+
+
+class Tracer:
+    """
+    Writes the finished spans of every trace to a local JSONL file, one span per line, and keeps a flame summary of the time spent per stack.
+    Spans nest through a context variable within a thread, work handed to another thread passes its parent span explicitly.
+    While disabled span() yields a no-op span and nothing is timed or written.
+    """
+    def __init__(self, path: str=TRACE_FILE, enabled: bool=False):
+        self.path = path
+        self.enabled = enabled
+
+        self._lock = threading.Lock()
+        self._file = None
+        self._flame = defaultdict(lambda: {"calls": 0, "total_ms": 0.0, "self_ms": 0.0})
+
+
+    @contextmanager
+    def span(self, name: str, parent: Span=None, **attributes):
+        """Times the block as a span, a child of parent or of the current span of this thread"""
+        if not self.enabled:
+            yield NOOP_SPAN
+            return
+
+        # Only children running in the parent's own thread take time away from it, handed off work runs alongside it
+        nested = parent is None
+        parent = _current_span.get() if nested else parent
+        span = Span(name, parent=parent or None, attributes=attributes)
+        token = _current_span.set(span)
+        try:
+            yield span
+        except Exception as e:
+            span.set(error=f"{type(e).__name__}: {e}")
+            raise
+        finally:
+            _current_span.reset(token)
+            span.finish()
+            if parent and nested:
+                parent.child_duration += span.duration
+            self._record(span)
+
+
+    def flame_summary(self) -> dict:
+        """Calls, total and self time in milliseconds per span stack, recorded since the tracer was created"""
+        with self._lock:
+            return {stack: dict(stats) for stack, stats in sorted(self._flame.items())}
+
+
+    def write_summary(self):
+        """Appends the flame summary to the trace file"""
+        if not self.enabled:
+            return
+        self._write({"type": "flame_summary", "written_at": time.time(), "stacks": self.flame_summary()})
+
+
+    def close(self):
+        """Writes the flame summary and closes the trace file"""
+        self.write_summary()
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+
+
+    def _record(self, span: Span):
+        with self._lock:
+            stats = self._flame[span.stack]
+            stats["calls"] += 1
+            stats["total_ms"] += span.duration * 1000
+            stats["self_ms"] += span.self_duration * 1000
+        self._write(span.to_dict())
+
+
+    def _write(self, record: dict):
+        line = json.dumps(record, default=str)
+        with self._lock:
+            if self._file is None:
+                os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+                self._file = open(self.path, "a", encoding="utf-8", buffering=1)
+            self._file.write(line + "\n")
+
+
+    def __repr__(self):
+        return f"{self.__class__.__name__}({self.path}, enabled={self.enabled})"
+
+
+
+_tracer = Tracer(path=os.environ.get(TRACE_FILE_ENV) or TRACE_FILE, enabled=bool(os.environ.get(TRACE_FILE_ENV)))
+
+
+def get_tracer() -> Tracer:
+    """Returns the process-wide tracer"""
+    return _tracer
+
+
+def configure_tracer(path: str=TRACE_FILE, enabled: bool=True) -> Tracer:
+    """Replaces the process-wide tracer, closing the previous one"""
+    global _tracer
+    _tracer.close()
+    _tracer = Tracer(path=path, enabled=enabled)
+    logger.info(f"Configured {_tracer}")
+    return _tracer
+
+
+def span(name: str, parent: Span=None, **attributes):
+    """Times the block as a span of the process-wide tracer"""
+    return _tracer.span(name, parent=parent, **attributes)
+
+
+def current_span() -> Span | _NoopSpan:
+    """The innermost open span of this thread, a no-op span outside of any span"""
+    return _current_span.get()
+
+
+def summarize_trace_file(path: str=TRACE_FILE) -> dict:
+    """Rebuilds the flame summary from the spans of a trace file, e.g. one appended to by several runs"""
+    flame = defaultdict(lambda: {"calls": 0, "total_ms": 0.0, "self_ms": 0.0})
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            record = json.loads(line)
+            if record.get("type") != "span":
+                continue
+            stats = flame[record["stack"]]
+            stats["calls"] += 1
+            stats["total_ms"] += record["duration_ms"]
+            stats["self_ms"] += record["self_ms"]
+    return dict(sorted(flame.items()))
+
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Print the flame summary of a draft trace file")
+    parser.add_argument("path", nargs="?", default=TRACE_FILE)
+    parser.add_argument("--folded", action="store_true", help="Print folded stacks with self time in microseconds, for flamegraph tools")
+    args = parser.parse_args()
+
+    summary = summarize_trace_file(args.path)
+    if args.folded:
+        for stack, stats in summary.items():
+            print(f"{stack} {round(stats['self_ms'] * 1000)}")
+    else:
+        print(f"{'stack':<60} {'calls':>7} {'total ms':>11} {'self ms':>11} {'mean ms':>9}")
+        for stack, stats in sorted(summary.items(), key=lambda item: -item[1]["total_ms"]):
+            print(f"{stack:<60} {stats['calls']:>7} {stats['total_ms']:>11.1f} {stats['self_ms']:>11.1f} {stats['total_ms'] / stats['calls']:>9.2f}")
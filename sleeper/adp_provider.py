@@ -0,0 +1,161 @@
+from datetime import datetime, timedelta
+import logging
+import threading
+
+import pandas as pd
+
+from sleeper.ffcalc_api import get_half_ppr_adp_df, get_rookie_adp_df
+from sleeper.player_identity import PlayerIdentityIndex
+from spreadsheets.spreadsheet_utils import normalize_names
+
+logging.basicConfig(format="%(asctime)s [%(levelname)s] %(message)s", level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+
+def prepare_adp_df(adp_df: pd.DataFrame) -> pd.DataFrame:
+    """Drops unnamed ADP rows, names defenses like the sleeper players table and adds the normalized_name join column"""
+    # The rookie feed is not merged from two sources so its columns carry no _x suffix
+    adp_df = adp_df.rename(columns={
+        col: target for col, target in (("name", "full_name"), ("position", "position_x"), ("team", "team_x"))
+        if col in adp_df.columns and target not in adp_df.columns
+    })
+
+    adp_df = adp_df[adp_df['full_name'].notna()].copy()
+    adp_df.loc[adp_df['position_x'] == 'DEF', 'full_name'] = adp_df.loc[adp_df['position_x'] == 'DEF', 'team_x'] + ' Defense'
+    adp_df['normalized_name'] = normalize_names(adp_df['full_name'])
+
+    return adp_df
+
+
+def merge_players_with_adp(players_df: pd.DataFrame, adp_df: pd.DataFrame, identity_index: PlayerIdentityIndex=None) -> pd.DataFrame:
+    """
+    Adds the ADP to the players dataframe, players without an ADP get the max ADP + 1, and sorts by it.
+    ADP rows are matched to sleeper player_ids through the identity index, so near-miss names keep their ADP.
+    """
+    identity_index = identity_index or PlayerIdentityIndex(players_df)
+    adp_player_ids = identity_index.resolve_frame(adp_df, name_col='full_name', position_col='position_x', team_col='team_x')
+    adp_by_player_id = (
+        adp_df.assign(player_id=adp_player_ids)
+        .dropna(subset=['player_id'])
+        .sort_values('adp')
+        .drop_duplicates(subset='player_id')
+        .set_index('player_id')['adp']
+    )
+    merged_df = players_df.assign(adp=players_df['player_id'].astype(str).map(adp_by_player_id))
+
+    max_adp = adp_df['adp'].max()
+    merged_df['adp'] = merged_df['adp'].fillna(max_adp + 1)
+
+    return merged_df.sort_values('adp')
+
+
+
+class AdpProvider:
+    """
+    Keeps the FantasyFootballCalculator ADP table and the ADP sorted players table in memory.
+    The ADP is refetched once it is older than the ttl and the merged table is only rebuilt when the ADP or the players table changes.
+    A failed refetch keeps serving the cached ADP and is retried after retry_delay, it only raises when nothing is cached yet.
+    The returned tables are shared between callers and must not be modified in place.
+    """
+    def __init__(self, is_redraft: bool=True, ttl: timedelta=timedelta(hours=6), retry_delay: timedelta=timedelta(minutes=5)):
+        self.is_redraft = is_redraft
+        self.ttl = ttl
+        self.retry_delay = retry_delay
+
+        self._lock = threading.RLock()
+        self._adp_df = None
+        self._adp_version = None
+        self._adp_fetched_at = None
+
+        self._players_df = None
+        self._players_key = None
+        self._identity_index = None
+        self._merged_df = None
+        self._merged_adp_version = None
+
+
+    def get_adp_df(self, force_refresh: bool=False) -> pd.DataFrame:
+        """Returns the prepared ADP table, refetching it if it is missing or older than the ttl"""
+        with self._lock:
+            if force_refresh or self._adp_expired():
+                self._refresh_adp()
+            return self._adp_df
+
+
+    def merge(self, players_df: pd.DataFrame) -> pd.DataFrame:
+        """Returns players_df merged with and sorted by ADP, reusing the cached table when neither input changed"""
+        with self._lock:
+            adp_df = self.get_adp_df()
+            players_key = self._snapshot_key(players_df)
+
+            if (self._merged_df is not None
+                    and players_df is self._players_df
+                    and players_key == self._players_key
+                    and self._adp_version == self._merged_adp_version):
+                return self._merged_df
+
+            logger.info(f"Sorting players dataframe by ADP")
+            self._merged_df = merge_players_with_adp(players_df, adp_df, self.identity_index(players_df))
+            self._players_df = players_df
+            self._players_key = players_key
+            self._merged_adp_version = self._adp_version
+            return self._merged_df
+
+
+    def identity_index(self, players_df: pd.DataFrame) -> PlayerIdentityIndex:
+        """Returns the player identity index for players_df, building it only when the players table changed"""
+        with self._lock:
+            if (self._identity_index is None
+                    or players_df is not self._players_df
+                    or self._snapshot_key(players_df) != self._players_key):
+                self._identity_index = PlayerIdentityIndex(players_df)
+            return self._identity_index
+
+
+    def invalidate(self):
+        """Drops the cached ADP and merged tables so the next call refetches"""
+        with self._lock:
+            self._adp_df = None
+            self._adp_fetched_at = None
+            self._merged_df = None
+
+
+    def _refresh_adp(self):
+        """Fetches the ADP table, keeping the cached version if the data did not change"""
+        logger.info(f"Retrieving {'redraft' if self.is_redraft else 'rookie'} ADP for {self}")
+        try:
+            raw_adp_df = get_half_ppr_adp_df() if self.is_redraft else get_rookie_adp_df()
+            adp_df = prepare_adp_df(raw_adp_df)
+
+        except Exception as e:
+            if self._adp_df is None:
+                raise
+            # Every draft waits on this lock, keep serving the cached ADP and only try again after retry_delay
+            logger.warning(f"Unable to refresh the ADP for {self}, serving the cached ADP and retrying in {self.retry_delay}: {e}")
+            self._adp_fetched_at = datetime.now() - self.ttl + self.retry_delay
+            return
+
+        adp_version = int(pd.util.hash_pandas_object(adp_df[['normalized_name', 'adp']], index=False).sum())
+
+        if adp_version != self._adp_version:
+            logger.info(f"ADP changed, {self} will rebuild the merged players table")
+            self._adp_df = adp_df
+            self._adp_version = adp_version
+
+        self._adp_fetched_at = datetime.now()
+
+
+    def _adp_expired(self) -> bool:
+        """Checks whether the ADP table is missing or older than the ttl"""
+        return self._adp_df is None or datetime.now() - self._adp_fetched_at >= self.ttl
+
+
+    @staticmethod
+    def _snapshot_key(players_df: pd.DataFrame) -> tuple:
+        """Cheap identity of a players table, detects replaced rows or columns without hashing the data"""
+        return (players_df.shape, tuple(players_df.columns))
+
+
+    def __repr__(self):
+        return f"{self.__class__.__name__}(is_redraft={self.is_redraft}, ttl={self.ttl})"
@@ -0,0 +1,72 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+import functools
+import logging
+
+import sleeper.sleeper_api as sleeper_api
+
+logging.basicConfig(format="%(asctime)s [%(levelname)s] %(message)s", level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+# Each call runs the blocking sleeper_api request on a worker thread, so awaitable callers share the
+# HttpTransport connection pool, timeouts, retries and concurrency cap while fanning out with asyncio.gather.
+# The pool is sized well above the transport cap so the transport, not the executor, decides concurrency.
+_executor = ThreadPoolExecutor(max_workers=32, thread_name_prefix="sleeper_api")
+
+
+async def _run(func, *args):
+    """Runs a blocking sleeper_api function on the shared worker pool"""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_executor, functools.partial(func, *args))
+
+
+async def get_user_info(username: str):
+    """Retrieve user information by user ID or Username."""
+    return await _run(sleeper_api.get_user_info, username)
+
+
+async def get_user_leagues(user_id: str, sport: str = "nfl", year: int = 2025):
+    """Retrieve leagues associated with a user by user ID or Username."""
+    return await _run(sleeper_api.get_user_leagues, user_id, sport, year)
+
+
+async def get_league_info(league_id: str):
+    """Collects the settings of a given league"""
+    return await _run(sleeper_api.get_league_info, league_id)
+
+
+async def get_league_rosters(league_id: str):
+    """Collects the rosters of a given league"""
+    return await _run(sleeper_api.get_league_rosters, league_id)
+
+
+async def get_draft_info(draft_id: str):
+    """Collects the rosters of a given draft ID"""
+    return await _run(sleeper_api.get_draft_info, draft_id)
+
+
+async def get_draft_picks(draft_id: str):
+    """Collects all the draft picks of a given draft ID"""
+    return await _run(sleeper_api.get_draft_picks, draft_id)
+
+
+async def get_players():
+    """
+    Collects information on all players in the NFL.
+    USE AT MOST ONCE PER DAY.
+    """
+    return await _run(sleeper_api.get_players)
+
+
+async def get_users_info(usernames: list[str]) -> list:
+    """Retrieves the user information for several users concurrently, preserving the input order"""
+    logger.debug(f"Retrieving user information for {len(usernames)} users concurrently")
+    return await asyncio.gather(*(get_user_info(username) for username in usernames))
+
+
+
+if __name__ == "__main__":
+    import pprint
+
+    pprint.pprint(asyncio.run(get_user_leagues("TheCondor")))
@@ -0,0 +1,141 @@
+from datetime import datetime
+import logging
+import time
+
+logging.basicConfig(format="%(asctime)s [%(levelname)s] %(message)s", level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+
+class DraftPollScheduler:
+    """
+    Picks the wait before the next poll of a draft from its settings and pick clock.
+    Polls fast when my slot or an empty (auto-picking) slot is on the clock, when I am on deck or when the pick clock is about to expire,
+    and backs off while a human opponent has most of their pick clock left.
+    """
+    SNAKE = "snake"
+
+    def __init__(self,
+                 draft,
+                 my_user_id: str=None,
+                 min_interval: float=0.5,
+                 max_interval: float=10.0,
+                 on_deck_interval: float=2.0,
+                 paused_interval: float=5.0,
+                 default_interval: float=2.0,
+                 clock_fraction: float=0.25):
+        self.draft = draft
+        self.my_user_id = my_user_id
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.on_deck_interval = on_deck_interval
+        self.paused_interval = paused_interval
+        self.default_interval = default_interval
+        self.clock_fraction = clock_fraction
+
+
+    @property
+    def teams(self) -> int:
+        """Number of draft slots"""
+        settings = self.draft.settings or {}
+        return int(settings.get("teams") or settings.get("slots") or len(self.draft.order or {}) or 0)
+
+
+    @property
+    def pick_timer(self) -> float:
+        """Seconds each manager has to make a pick, 0 when the draft has no pick clock"""
+        return float((self.draft.settings or {}).get("pick_timer") or 0)
+
+
+    @property
+    def my_slot(self) -> int | None:
+        """Draft slot of my user, None if I am not in the draft order"""
+        return (self.draft.order or {}).get(self.my_user_id)
+
+
+    def slot_for_pick(self, pick_no: int) -> int | None:
+        """Draft slot that makes the given overall pick, following snake and third round reversal rules"""
+        teams = self.teams
+        if not teams:
+            return None
+
+        draft_round = (pick_no - 1) // teams + 1
+        round_idx = (pick_no - 1) % teams
+        reversed_round = self.draft.type == self.SNAKE and draft_round % 2 == 0
+
+        reversal_round = int((self.draft.settings or {}).get("reversal_round") or 0)
+        if self.draft.type == self.SNAKE and reversal_round and draft_round >= reversal_round:
+            reversed_round = not reversed_round
+
+        return teams - round_idx if reversed_round else round_idx + 1
+
+
+    def slot_on_clock(self) -> int | None:
+        """Draft slot currently on the clock"""
+        return self.slot_for_pick(self.draft.last_pick_no + 1)
+
+
+    def seconds_on_clock(self) -> float | None:
+        """Seconds since the slot on the clock went on the clock, None if the draft info has no last pick time"""
+        last_picked = (self.draft.draft_json or {}).get("last_picked")
+        if not last_picked:
+            return None
+        return max(0.0, time.time() - float(last_picked) / 1000)
+
+
+    def next_interval(self) -> float:
+        """Returns the number of seconds to wait before the next poll of the draft"""
+        match self.draft.status:
+            case self.draft.DRAFTING:
+                interval = self._drafting_interval()
+
+            case self.draft.PAUSED:
+                interval = self.paused_interval
+
+            case self.draft.PRE_DRAFT:
+                start_time = self.draft.start_time
+                seconds_to_start = (start_time - datetime.now()).total_seconds() if start_time else self.max_interval
+                interval = self._clamp(seconds_to_start)
+
+            case _:
+                interval = self.max_interval
+
+        logger.debug(f"{self} next poll in {interval:.2f}s")
+        return interval
+
+
+    def sleep(self) -> float:
+        """Sleeps until the next poll is due and returns the time slept"""
+        interval = self.next_interval()
+        time.sleep(interval)
+        return interval
+
+
+    def _drafting_interval(self) -> float:
+        """Poll interval while the draft is running"""
+        slot = self.slot_on_clock()
+        if slot is None:
+            return self.default_interval
+
+        human_slots = set((self.draft.order or {}).values())
+        if slot == self.my_slot or slot not in human_slots:
+            return self.min_interval
+
+        on_deck = self.slot_for_pick(self.draft.last_pick_no + 2) == self.my_slot
+        elapsed = self.seconds_on_clock()
+        if not self.pick_timer or elapsed is None:
+            interval = self.default_interval
+        else:
+            # A human opponent just went on the clock: wait a fraction of their remaining time, tightening as the clock runs out
+            interval = self._clamp((self.pick_timer - elapsed) * self.clock_fraction)
+
+        return min(interval, self.on_deck_interval) if on_deck else interval
+
+
+    def _clamp(self, interval: float) -> float:
+        """Keeps an interval between the minimum and maximum poll interval"""
+        return min(self.max_interval, max(self.min_interval, interval))
+
+
+    def __repr__(self):
+        return f"{self.__class__.__name__}({self.draft}, my_slot={self.my_slot})"
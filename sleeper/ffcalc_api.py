@@ -1,66 +1,86 @@
+from concurrent.futures import ThreadPoolExecutor
 import logging
+import math
+import os
+import numpy as np
 import pandas as pd
-import requests
+
+from sleeper.http_transport import get_transport
 
 logging.basicConfig(format="%(asctime)s [%(levelname)s] %(message)s", level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 
-BASE_URL = "https://fantasyfootballcalculator.com/api/v1/adp"
+# Overridable so the stack can be pointed at a local mock server, see benchmarks/mock_api_server.py
+BASE_URL_ENV = "FFCALC_API_BASE_URL"
+BASE_URL = os.environ.get(BASE_URL_ENV, "https://fantasyfootballcalculator.com/api/v1/adp")
 
 
-def get_ppr_adp():
-    """Retrieve ADP data for full PPR draft"""
-    logger.debug(f"Retrieveing full PPR ADP data")
+def get_adp(scoring_format: str):
+    """Retrieve ADP data for a given FantasyFootballCalculator format (e.g. ppr, standard, half-ppr, 2qb, dynasty, rookie)"""
+    logger.debug(f"Retrieveing {scoring_format} ADP data")
 
-    url = f"{BASE_URL}/ppr"
-    response = requests.get(url)
+    url = f"{BASE_URL}/{scoring_format}"
+    response = get_transport().get(url, endpoint=f"adp_{scoring_format}")
     if response.status_code == 200:
         return response.json().get("players")
     else:
         response.raise_for_status()
 
 
+def get_ppr_adp():
+    """Retrieve ADP data for full PPR draft"""
+    return get_adp("ppr")
+
+
 def get_standard_adp():
     """Retrieve ADP data for standard draft"""
-    logger.debug(f"Retrieveing standard ADP data")
-
-    url = f"{BASE_URL}/standard"
-    response = requests.get(url)
-    if response.status_code == 200:
-        return response.json().get("players")
-    else:
-        response.raise_for_status()
+    return get_adp("standard")
 
 
 def get_rookie_adp():
     """Retrieve ADP data for rookie draft"""
-    logger.debug(f"Retrieveing full rookie data")
+    return get_adp("rookie")
+
+
+def get_weighted_adp_df(weights: dict[str, float]) -> pd.DataFrame:
+    """
+    Returns a pandas dataframe with the ADP blended over several formats, e.g. {"ppr": 0.5, "standard": 0.3, "2qb": 0.2}.
+    All formats are requested concurrently, only players present in every format are kept.
+    Player metadata comes from the first format, with the same column names as the original two-format merge (full_name, position_x, team_x, ...).
+    Each format's ADP is kept in a <format>_adp column next to the blended adp column.
+    """
+    if not weights or not math.isclose(sum(weights.values()), 1):
+        logger.error(f"Invalid weights for ADP calcualtion: {weights}")
+        raise ValueError(f"Invalid weights for ADP calcualtion: {weights}")
+
+    scoring_formats = list(weights)
+    with ThreadPoolExecutor(max_workers=len(scoring_formats)) as executor:
+        adp_jsons = list(executor.map(get_adp, scoring_formats))
+
+    adp_dfs = [pd.DataFrame.from_dict(adp_json).drop_duplicates(subset="player_id") for adp_json in adp_jsons]
+    adp_columns = [f"{scoring_format.replace('-', '_')}_adp" for scoring_format in scoring_formats]
+
+    adp_wide_df = pd.concat(
+        [adp_df.set_index("player_id")["adp"].rename(adp_col) for adp_df, adp_col in zip(adp_dfs, adp_columns)],
+        axis=1,
+        join="inner",
+    )
+    adp_wide_df["adp"] = adp_wide_df[adp_columns].to_numpy() @ np.array([weights[scoring_format] for scoring_format in scoring_formats])
+
+    metadata_df = adp_dfs[0].drop(columns="adp")
+    metadata_df = metadata_df.rename(columns={col: f"{col}_x" for col in metadata_df.columns if col != "player_id"})
+    merged_df = metadata_df.merge(adp_wide_df, left_on="player_id", right_index=True, how="inner")
+    merged_df.rename(columns={"name_x" : "full_name"}, inplace=True)
 
-    url = f"{BASE_URL}/rookie"
-    response = requests.get(url)
-    if response.status_code == 200:
-        return response.json().get("players")
-    else:
-        response.raise_for_status()
+    assert merged_df[adp_columns].notnull().all().all()
+
+    return merged_df
 
 
 def get_half_ppr_adp_df(ppr_weight: float=0.6, standard_weight: float=0.4) -> pd.DataFrame:
     """Returns a pandas dataframe with the weighted ADP between standard and full PPR"""
-    if ppr_weight + standard_weight != 1:
-        logger.error(f"Invalid weights for ADP calcualtion: ppr_weight={ppr_weight}, standard_weight={standard_weight}")
-        raise ValueError(f"Invalid weights for ADP calcualtion: ppr_weight={ppr_weight}, standard_weight={standard_weight}")
-
-    ppr_df = pd.DataFrame.from_dict(get_ppr_adp()).rename(columns={"adp" : "ppr_adp"})
-    standard_df = pd.DataFrame.from_dict(get_standard_adp()).rename(columns={"adp" : "standard_adp"})
-    merged_df = pd.merge(standard_df, ppr_df, on='player_id', how='inner')
-    merged_df['adp'] = 0.4 * merged_df['standard_adp'] + 0.6 * merged_df['ppr_adp']
-    merged_df.rename(columns={"name_x" : "full_name"}, inplace=True)
-
-    assert merged_df['standard_adp'].notnull().all()
-    assert merged_df['ppr_adp'].notnull().all()
-
-    return merged_df
+    return get_weighted_adp_df({"standard": standard_weight, "ppr": ppr_weight})
 
 
 def get_rookie_adp_df() -> pd.DataFrame:
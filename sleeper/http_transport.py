@@ -0,0 +1,160 @@
+import logging
+import random
+import threading
+import time
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from instrumentation.metrics import HTTP_REQUESTS, get_registry
+
+logging.basicConfig(format="%(asctime)s [%(levelname)s] %(message)s", level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+DEFAULT_TIMEOUT = (3.05, 10)
+
+# (connect, read) timeouts in seconds for endpoints that need something other than DEFAULT_TIMEOUT
+ENDPOINT_TIMEOUTS = {
+    "draft_info": (3.05, 5),
+    "draft_picks": (3.05, 5),
+    "players": (3.05, 60),
+}
+
+RETRY_STATUS_CODES = frozenset({429, 500, 502, 503, 504})
+
+
+
+class HttpTransport:
+    """
+    Shared HTTP layer for the Sleeper and FantasyFootballCalculator APIs.
+    Keeps a pool of keep-alive connections, applies per-endpoint timeouts, retries 429 / 5xx responses
+    and connection errors with jittered exponential backoff and caps the number of requests in flight.
+    """
+    def __init__(self,
+                 pool_size: int=10,
+                 max_concurrency: int=16,
+                 max_retries: int=4,
+                 backoff_base: float=0.25,
+                 backoff_max: float=8.0,
+                 timeouts: dict=None):
+        self.pool_size = pool_size
+        self.max_concurrency = max_concurrency
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.timeouts = {**ENDPOINT_TIMEOUTS, **(timeouts or {})}
+
+        self.session = self._create_session()
+        self._semaphore = threading.BoundedSemaphore(max_concurrency)
+
+
+    def get(self, url: str, endpoint: str=None, timeout: float | tuple=None) -> requests.Response:
+        """
+        Sends a GET request through the pooled session and returns the final response.
+        Responses with a retryable status are returned as-is once the retries are exhausted so the caller can raise_for_status.
+        """
+        registry = get_registry()
+        if not registry.enabled:
+            return self._get(url, endpoint, timeout)
+
+        started_at = time.perf_counter()
+        try:
+            response = self._get(url, endpoint, timeout)
+        except Exception:
+            registry.observe(HTTP_REQUESTS, endpoint or "unlabelled", time.perf_counter() - started_at, error=True)
+            raise
+
+        registry.observe(HTTP_REQUESTS, endpoint or "unlabelled", time.perf_counter() - started_at,
+                         nbytes=len(response.content), error=response.status_code >= 400)
+        return response
+
+
+    def _get(self, url: str, endpoint: str, timeout: float | tuple) -> requests.Response:
+        """Sends the request, retrying retryable statuses and connection errors"""
+        timeout = timeout or self.timeouts.get(endpoint, DEFAULT_TIMEOUT)
+
+        for attempt in range(self.max_retries + 1):
+            try:
+                with self._semaphore:
+                    response = self.session.get(url, timeout=timeout)
+
+            except (requests.ConnectionError, requests.Timeout) as e:
+                if attempt == self.max_retries:
+                    logger.error(f"Request to {url} failed after {attempt + 1} attempts: {e}")
+                    raise
+                delay = self._backoff_delay(attempt)
+                logger.warning(f"Request to {url} failed ({e}), retrying in {delay:.2f}s")
+
+            else:
+                if response.status_code not in RETRY_STATUS_CODES or attempt == self.max_retries:
+                    return response
+                delay = self._retry_after(response) or self._backoff_delay(attempt)
+                logger.warning(f"Request to {url} returned {response.status_code}, retrying in {delay:.2f}s")
+
+            time.sleep(delay)
+
+
+    def close(self):
+        """Closes all pooled connections"""
+        self.session.close()
+
+
+    def _create_session(self) -> requests.Session:
+        """Creates a session with a connection pool sized for the configured concurrency"""
+        session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=self.pool_size, pool_maxsize=max(self.pool_size, self.max_concurrency))
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+        return session
+
+
+    def _backoff_delay(self, attempt: int) -> float:
+        """Full-jitter exponential backoff delay for the given attempt number"""
+        return random.uniform(0, min(self.backoff_max, self.backoff_base * 2 ** attempt))
+
+
+    def _retry_after(self, response: requests.Response) -> float | None:
+        """Reads a numeric Retry-After header if the server sent one"""
+        retry_after = response.headers.get("Retry-After")
+        try:
+            return min(self.backoff_max, float(retry_after)) if retry_after else None
+        except ValueError:
+            return None
+
+
+    def __repr__(self):
+        return f"{self.__class__.__name__}(pool_size={self.pool_size}, max_concurrency={self.max_concurrency}, max_retries={self.max_retries})"
+
+
+
+_transport = None
+_transport_lock = threading.Lock()
+
+
+def get_transport() -> HttpTransport:
+    """Returns the process-wide transport, creating it with default settings on first use"""
+    global _transport
+    if _transport is None:
+        with _transport_lock:
+            if _transport is None:
+                _transport = HttpTransport()
+    return _transport
+
+
+def configure_transport(**kwargs) -> HttpTransport:
+    """Replaces the process-wide transport with one built from the given HttpTransport arguments"""
+    global _transport
+    with _transport_lock:
+        if _transport is not None:
+            _transport.close()
+        _transport = HttpTransport(**kwargs)
+        logger.info(f"Configured {_transport}")
+    return _transport
+
+
+def set_transport(transport: HttpTransport):
+    """Installs an already built transport (or compatible object) as the process-wide transport"""
+    global _transport
+    with _transport_lock:
+        _transport = transport
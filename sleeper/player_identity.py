@@ -0,0 +1,175 @@
+import difflib
+import json
+import logging
+import os
+import tempfile
+
+import pandas as pd
+
+from spreadsheets.spreadsheet_utils import normalize_name, normalize_names
+
+logging.basicConfig(format="%(asctime)s [%(levelname)s] %(message)s", level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+IDENTITY_ALIASES_FILE = "cache/player_identity_aliases.json"
+
+# Position labels used by external sources that differ from the sleeper ones
+POSITION_ALIASES = {"PK": "K", "DST": "DEF", "D/ST": "DEF"}
+
+
+
+class PlayerIdentityIndex:
+    """
+    Resolves external player names, optionally with position and team, to sleeper player_ids.
+    Exact normalized-name matches are O(1) dict lookups, misses fall back to a fuzzy match blocked by position (and team when it helps).
+    Every fuzzy result is cached, and matches are persisted to disk so later runs and joins never redo the fuzzy work.
+    """
+    def __init__(self, players_df: pd.DataFrame, path: str=IDENTITY_ALIASES_FILE, cutoff: float=0.88):
+        self.path = path
+        self.cutoff = cutoff
+
+        self._by_name = {}
+        self._by_position = {}
+        self._player_ids = set()
+        self._build(players_df)
+
+        self._aliases = self._load_aliases()
+        self._misses = set()
+        self._dirty = False
+
+        logger.info(f"Initialized {self}")
+
+
+    def resolve(self, name: str, position: str=None, team: str=None) -> str | None:
+        """Returns the sleeper player_id for an external player, None if nothing close enough exists"""
+        normalized = normalize_name(name)
+        position = self._clean_label(position, POSITION_ALIASES)
+        team = self._clean_label(team)
+        return self._resolve_normalized(normalized, position, team)
+
+
+    def resolve_frame(self, df: pd.DataFrame, name_col: str="full_name", position_col: str=None, team_col: str=None) -> pd.Series:
+        """Resolves every row of a dataframe to a sleeper player_id, returned as a Series aligned with df"""
+        normalized = normalize_names(df[name_col])
+        positions = df[position_col] if position_col in df.columns else pd.Series(None, index=df.index, dtype=object)
+        teams = df[team_col] if team_col in df.columns else pd.Series(None, index=df.index, dtype=object)
+
+        player_ids = [
+            self._resolve_normalized(name, self._clean_label(position, POSITION_ALIASES), self._clean_label(team))
+            for name, position, team in zip(normalized, positions, teams)
+        ]
+        self.save()
+
+        resolved = pd.Series(player_ids, index=df.index, dtype=object, name="player_id")
+        misses = resolved.isna().sum()
+        if misses:
+            logger.warning(f"{misses} of {len(df)} players could not be matched to a sleeper player_id")
+        return resolved
+
+
+    def save(self):
+        """Writes the fuzzy matches found since the last save to disk, atomically"""
+        if not self._dirty:
+            return
+
+        directory = os.path.dirname(self.path) or "."
+        os.makedirs(directory, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=".identity_", suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(self._aliases, f, indent=1, sort_keys=True)
+            os.replace(tmp_path, self.path)
+
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+
+        self._dirty = False
+        logger.info(f"Saved {len(self._aliases)} player aliases to {self.path}")
+
+
+    def _resolve_normalized(self, normalized: str, position: str | None, team: str | None) -> str | None:
+        """Resolves an already normalized name: exact match, then cached alias, then blocked fuzzy match"""
+        candidates = self._by_name.get(normalized)
+        if candidates:
+            return self._pick_candidate(candidates, position, team)
+
+        key = self._alias_key(normalized, position, team)
+        if self._aliases.get(key) in self._player_ids:
+            return self._aliases[key]
+        if key in self._misses:
+            return None
+
+        player_id = self._fuzzy_match(normalized, position, team)
+        if player_id is None:
+            self._misses.add(key)
+        else:
+            logger.debug(f"Fuzzy matched {normalized} ({position}, {team}) to player_id {player_id}")
+            self._aliases[key] = player_id
+            self._dirty = True
+        return player_id
+
+
+    def _fuzzy_match(self, normalized: str, position: str | None, team: str | None) -> str | None:
+        """Closest sleeper name within the position block, trying the player's team first"""
+        if not normalized:
+            return None
+
+        # Without a position the whole players table is one block
+        block = self._by_position.get(position, {}) if position else self._by_name
+        team_block = [name for name, entries in block.items() if any(entry[2] == team for entry in entries)] if team else []
+
+        for names in (team_block, list(block)):
+            matches = difflib.get_close_matches(normalized, names, n=1, cutoff=self.cutoff)
+            if matches:
+                return self._pick_candidate(block[matches[0]], position, team)
+        return None
+
+
+    @staticmethod
+    def _pick_candidate(candidates: list[tuple], position: str | None, team: str | None) -> str:
+        """Chooses among players sharing a normalized name, preferring the same position and then the same team"""
+        if len(candidates) == 1:
+            return candidates[0][0]
+        return max(candidates, key=lambda entry: (entry[1] == position, entry[2] == team))[0]
+
+
+    def _build(self, players_df: pd.DataFrame):
+        """Builds the exact name lookup and the per-position fuzzy blocks"""
+        positions = players_df["position"] if "position" in players_df.columns else pd.Series(None, index=players_df.index)
+        teams = players_df["team"] if "team" in players_df.columns else pd.Series(None, index=players_df.index)
+
+        for player_id, name, position, team in zip(players_df["player_id"].astype(str), players_df["normalized_name"], positions, teams):
+            entry = (player_id, self._clean_label(position, POSITION_ALIASES), self._clean_label(team))
+            self._player_ids.add(player_id)
+            self._by_name.setdefault(name, []).append(entry)
+            self._by_position.setdefault(entry[1], {}).setdefault(name, []).append(entry)
+
+
+    def _load_aliases(self) -> dict:
+        """Loads previously persisted fuzzy matches"""
+        if not os.path.exists(self.path):
+            return {}
+        with open(self.path, encoding="utf-8") as f:
+            return json.load(f)
+
+
+    @staticmethod
+    def _alias_key(normalized: str, position: str | None, team: str | None) -> str:
+        """Key of a fuzzy match in the alias cache"""
+        return f"{normalized}|{position or ''}|{team or ''}"
+
+
+    @staticmethod
+    def _clean_label(label, aliases: dict=None) -> str | None:
+        """Upper-cases a position or team label, treating missing values and 'N/A' as None"""
+        if not isinstance(label, str) or label in ("", "N/A", "None", "nan"):
+            return None
+        label = label.strip().upper()
+        return aliases.get(label, label) if aliases else label
+
+
+    def __repr__(self):
+        return f"{self.__class__.__name__}(names={len(self._by_name)}, aliases={len(self._aliases)})"
@@ -0,0 +1,184 @@
+import logging
+
+import numpy as np
+import pandas as pd
+
+logging.basicConfig(format="%(asctime)s [%(levelname)s] %(message)s", level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+
+class PlayerPool:
+    """
+    Tracks which players of a draft are still available over a fixed players table.
+    Each row keeps its integer position for the life of the pool, availability is a boolean array over those positions,
+    so marking a pick is O(1) and the players table itself is never copied or modified.
+    The ADP ordered positions of the available players are kept as well and compacted once per batch of picks,
+    remaining_players returns a view over them and only the rows a consumer reads are taken from the table.
+    """
+    def __init__(self, players_df: pd.DataFrame):
+        self.players_df = players_df
+
+        player_ids = players_df["player_id"].astype(str).str.strip().to_numpy()
+        self.player_ids = player_ids
+        self._position_by_id = {}
+        for position, player_id in enumerate(player_ids):
+            self._position_by_id.setdefault(player_id, position)
+
+        self.available = np.ones(len(players_df), dtype=bool)
+        self.drafted_ids = set()
+
+        if "adp" in players_df.columns:
+            self.adp_order = np.argsort(players_df["adp"].to_numpy(dtype=float), kind="stable")
+        else:
+            self.adp_order = np.arange(len(players_df))
+        self._remaining_order = self.adp_order
+        self._compacted = True
+        self._position_masks = {}
+        self._values = {}
+
+        logger.debug(f"Initialized {self}")
+
+
+    def mark_drafted(self, player_id: str) -> bool:
+        """Flags a player as drafted, returns False if the player is not in the pool"""
+        player_id = str(player_id).strip()
+        self.drafted_ids.add(player_id)
+        position = self._position_by_id.get(player_id)
+        if position is None:
+            return False
+
+        if self.available[position]:
+            self.available[position] = False
+            self._compacted = False
+        return True
+
+
+    def mark_drafted_many(self, player_ids) -> int:
+        """Flags several players as drafted, returns how many were found in the pool"""
+        return sum(self.mark_drafted(player_id) for player_id in player_ids)
+
+
+    def positions_of(self, player_ids) -> np.ndarray:
+        """Row positions of the given players, -1 for players not in the pool"""
+        return np.array([self._position_by_id.get(str(player_id).strip(), -1) for player_id in player_ids], dtype=int)
+
+
+    def is_available(self, player_id: str) -> bool:
+        """Checks whether a player is in the pool and not drafted yet"""
+        position = self._position_by_id.get(str(player_id).strip())
+        return position is not None and bool(self.available[position])
+
+
+    def available_positions(self, positions: str | list[str]=None, sort_by_adp: bool=True) -> np.ndarray:
+        """Integer row positions of the available players, optionally limited to fantasy positions, in ADP order by default"""
+        rows = self._remaining_positions() if sort_by_adp else np.flatnonzero(self.available)
+        if positions:
+            rows = rows[self._position_mask(positions)[rows]]
+        return rows
+
+
+    def remaining(self, positions: str | list[str]=None, n: int=None, sort_by_adp: bool=True) -> pd.DataFrame:
+        """Returns the available players as a dataframe, only the selected rows are materialized"""
+        rows = self.available_positions(positions, sort_by_adp=sort_by_adp)
+        if n is not None:
+            rows = rows[:n]
+        return self.players_df.take(rows)
+
+
+    def remaining_players(self) -> "RemainingPlayers":
+        """Lazy view of the available players in ADP order, nothing is taken from the players table until a consumer asks for rows"""
+        return RemainingPlayers(self, self._remaining_positions())
+
+
+    def values(self, column: str) -> np.ndarray:
+        """Numeric values of a column for every row of the pool as floats, missing values are NaN, computed once per column"""
+        if column not in self._values:
+            self._values[column] = pd.to_numeric(self.players_df[column], errors="coerce").to_numpy(dtype=float, na_value=np.nan)
+        return self._values[column]
+
+
+    @property
+    def remaining_count(self) -> int:
+        """Number of players still available"""
+        return int(self.available.sum())
+
+
+    def _remaining_positions(self) -> np.ndarray:
+        """Available positions in ADP order, the drafted players are only filtered out once after each batch of picks"""
+        if not self._compacted:
+            self._remaining_order = self._remaining_order[self.available[self._remaining_order]]
+            self._compacted = True
+        return self._remaining_order
+
+
+    def _position_mask(self, positions: str | list[str]) -> np.ndarray:
+        """Boolean mask of the rows at the given positions, computed once per position set"""
+        key = (positions,) if isinstance(positions, str) else tuple(sorted(positions))
+        if key not in self._position_masks:
+            self._position_masks[key] = self.players_df["position"].isin(key).to_numpy()
+        return self._position_masks[key]
+
+
+    def __repr__(self):
+        return f"{self.__class__.__name__}(players={len(self.available)}, drafted={len(self.drafted_ids)})"
+
+
+
+class RemainingPlayers:
+    """
+    The available players of a PlayerPool at one point of the draft, in ADP order.
+    Holds the row positions only, head and take materialize just the rows asked for and to_frame the whole table.
+    """
+    def __init__(self, pool: PlayerPool, positions: np.ndarray):
+        self.pool = pool
+        self.positions = positions
+        self._frame = None
+
+
+    def __len__(self):
+        return len(self.positions)
+
+
+    @property
+    def empty(self) -> bool:
+        return len(self.positions) == 0
+
+
+    @property
+    def player_ids(self) -> np.ndarray:
+        """Player ids of the remaining players, in ADP order"""
+        return self.pool.player_ids[self.positions]
+
+
+    def rows(self, positions: str | list[str]=None) -> np.ndarray:
+        """Row positions of the remaining players, optionally limited to fantasy positions, in ADP order"""
+        if not positions:
+            return self.positions
+        return self.positions[self.pool._position_mask(positions)[self.positions]]
+
+
+    def values(self, column: str, rows: np.ndarray=None) -> np.ndarray:
+        """Numeric values of a column for the given rows, every remaining player by default"""
+        return self.pool.values(column)[self.positions if rows is None else rows]
+
+
+    def take(self, rows: np.ndarray) -> pd.DataFrame:
+        """Materializes the given rows of the players table"""
+        return self.pool.players_df.take(rows)
+
+
+    def head(self, n: int=10, positions: str | list[str]=None) -> pd.DataFrame:
+        """Top n remaining players by ADP, optionally limited to fantasy positions"""
+        return self.take(self.rows(positions)[:n])
+
+
+    def to_frame(self) -> pd.DataFrame:
+        """Every remaining player as a dataframe, taken once per view"""
+        if self._frame is None:
+            self._frame = self.take(self.positions)
+        return self._frame
+
+
+    def __repr__(self):
+        return f"{self.__class__.__name__}(remaining={len(self)}, {self.pool})"
@@ -0,0 +1,115 @@
+from datetime import datetime, timedelta
+import gzip
+import json
+import logging
+import os
+import tempfile
+
+import numpy as np
+import pandas as pd
+
+import sleeper.sleeper_api as sleeper_api
+
+logging.basicConfig(format="%(asctime)s [%(levelname)s] %(message)s", level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+PLAYERS_CACHE_FILE = "cache/players_nfl.json.gz"
+
+
+
+class PlayersCache:
+    """
+    Local gzip-compressed copy of the sleeper /players/nfl payload.
+    The payload is only downloaded when the cached copy is older than the ttl, so get_players is called at most once per ttl.
+    """
+    def __init__(self, path: str=PLAYERS_CACHE_FILE, ttl: timedelta=timedelta(days=1)):
+        self.path = path
+        self.ttl = ttl
+
+
+    def load(self, force_refresh: bool=False) -> dict:
+        """Returns the players payload, downloading and caching it if the cached copy is missing or expired"""
+        if not force_refresh and self.is_fresh():
+            logger.info(f"Loading NFL players from {self}, age {self.age()}")
+            return self._read()
+
+        try:
+            players = sleeper_api.get_players()
+
+        except Exception as e:
+            if not os.path.exists(self.path):
+                raise
+            logger.warning(f"Unable to download NFL players, falling back to stale {self} (age {self.age()}): {e}")
+            return self._read()
+
+        self._write(players)
+        return players
+
+
+    def load_df(self, force_refresh: bool=False) -> pd.DataFrame:
+        """
+        Returns the players payload as a dataframe with one row per player, the layout PlayersDataWorksheet.clean_df expects.
+        Values keep their raw json types (object dtype, missing fields as NaN) so the cleaned output matches the transposed API dict.
+        """
+        players = self.load(force_refresh=force_refresh)
+        players_df = pd.DataFrame(list(players.values()), index=list(players.keys()), dtype=object)
+        return players_df.where(players_df.notna(), np.nan)
+
+
+    def is_fresh(self) -> bool:
+        """Checks whether a cached payload exists and is younger than the ttl"""
+        age = self.age()
+        return age is not None and age < self.ttl
+
+
+    def age(self) -> timedelta | None:
+        """Time since the cached payload was written, None if there is no cached payload"""
+        if not os.path.exists(self.path):
+            return None
+        return datetime.now() - datetime.fromtimestamp(os.path.getmtime(self.path))
+
+
+    def invalidate(self):
+        """Removes the cached payload so the next load downloads it again"""
+        logger.info(f"Invalidating {self}")
+        if os.path.exists(self.path):
+            os.remove(self.path)
+
+
+    def _read(self) -> dict:
+        """Reads and decompresses the cached payload"""
+        with gzip.open(self.path, "rt", encoding="utf-8") as f:
+            return json.load(f)
+
+
+    def _write(self, players: dict):
+        """Writes the payload to a temporary file next to the cache and atomically swaps it into place"""
+        logger.info(f"Writing {len(players)} NFL players to {self}")
+        directory = os.path.dirname(self.path) or "."
+        os.makedirs(directory, exist_ok=True)
+
+        fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=".players_", suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as raw:
+                with gzip.GzipFile(fileobj=raw, mode="wb", compresslevel=6) as f:
+                    f.write(json.dumps(players, separators=(",", ":")).encode("utf-8"))
+                raw.flush()
+                os.fsync(raw.fileno())
+            os.replace(tmp_path, self.path)
+
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+
+
+    def __repr__(self):
+        return f"{self.__class__.__name__}({self.path}, ttl={self.ttl})"
+
+
+
+if __name__ == "__main__":
+    players_cache = PlayersCache()
+    logger.info(f"PlayersCache test is_fresh: {players_cache.is_fresh()}")
+    logger.info(f"PlayersCache test load_df: {players_cache.load_df().shape}")
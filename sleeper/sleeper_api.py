@@ -1,11 +1,15 @@
 import logging
-import requests
+import os
+
+from sleeper.http_transport import get_transport
 
 logging.basicConfig(format="%(asctime)s [%(levelname)s] %(message)s", level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 
-BASE_URL = "https://api.sleeper.app/v1"
+# Overridable so the stack can be pointed at a local mock server, see benchmarks/mock_api_server.py
+BASE_URL_ENV = "SLEEPER_API_BASE_URL"
+BASE_URL = os.environ.get(BASE_URL_ENV, "https://api.sleeper.app/v1")
 
 
 
@@ -14,7 +18,7 @@ def get_user_info(username: str):
     logger.debug(f"Retrieveing user information from user {username} from sleeper API")
 
     url = f"{BASE_URL}/user/{username}"
-    response = requests.get(url)
+    response = get_transport().get(url, endpoint="user_info")
     if response.status_code == 200:
         return response.json()
     else:
@@ -26,7 +30,7 @@ def get_user_leagues(user_id: str, sport: str = "nfl", year: int = 2025):
     logger.debug(f"Retrieveing user leagues for user ID {user_id} (sport={sport}, year={year}) from sleeper API")
 
     url = f"{BASE_URL}/user/{user_id}/leagues/{sport}/{year}"
-    response = requests.get(url)
+    response = get_transport().get(url, endpoint="user_leagues")
     if response.status_code == 200:
         return response.json()
     else:
@@ -38,7 +42,7 @@ def get_league_info(league_id: str):
     logger.debug(f"Retrieveing information on league ID {league_id} from sleeper API")
     
     url = f"{BASE_URL}/league/{league_id}"
-    response = requests.get(url)
+    response = get_transport().get(url, endpoint="league_info")
     if response.status_code == 200:
         return response.json()
     else:
@@ -50,7 +54,7 @@ def get_league_rosters(league_id: str):
     logger.debug(f"Retrieveing rosters for league ID {league_id} from sleeper API")
     
     url = f"{BASE_URL}/league/{league_id}/rosters"
-    response = requests.get(url)
+    response = get_transport().get(url, endpoint="league_rosters")
     if response.status_code == 200:
         return response.json()
     else:
@@ -62,7 +66,7 @@ def get_draft_info(draft_id: str):
     logger.debug(f"Retrieveing draft information for draft ID {draft_id} from sleeper API")
     
     url = f"{BASE_URL}/draft/{draft_id}"
-    response = requests.get(url)
+    response = get_transport().get(url, endpoint="draft_info")
     if response.status_code == 200:
         return response.json()
     else:
@@ -74,7 +78,7 @@ def get_draft_picks(draft_id: str):
     logger.debug(f"Retrieveing draft picks for draft ID {draft_id} from sleeper API")
     
     url = f"{BASE_URL}/draft/{draft_id}/picks"
-    response = requests.get(url)
+    response = get_transport().get(url, endpoint="draft_picks")
     if response.status_code == 200:
         return response.json()
     else:
@@ -89,7 +93,7 @@ def get_players():
     logger.info(f"Retrieveing data on all players in the nfl")
     
     url = f"{BASE_URL}/players/nfl"
-    response = requests.get(url)
+    response = get_transport().get(url, endpoint="players")
     if response.status_code == 200:
         return response.json()
     else:
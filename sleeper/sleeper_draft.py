@@ -1,13 +1,16 @@
+import asyncio
 from datetime import datetime, timedelta
 import logging
 import pandas as pd
 import time
 
-from sleeper.ffcalc_api import get_half_ppr_adp_df, get_rookie_adp_df
+from instrumentation.metrics import DATAFRAME_STAGES, instrumented
+from instrumentation.tracing import span
+from sleeper.adp_provider import AdpProvider
+from sleeper.player_pool import PlayerPool, RemainingPlayers
+import sleeper.async_sleeper_api as async_sleeper_api
 import sleeper.sleeper_api as sleeper_api
 
-from spreadsheets.spreadsheet_utils import normalize_name
-
 logging.basicConfig(format="%(asctime)s [%(levelname)s] %(message)s", level=logging.INFO)
 logger = logging.getLogger(__name__)
 
@@ -20,61 +23,128 @@ class Draft:
     PAUSED = "paused"
     COMPLETE = "complete"
 
-    def __init__(self, league):
+    # Fields of the draft info response that change whenever a pick is made or the draft changes state
+    CHANGE_MARKERS = ("status", "last_picked", "last_message_id", "last_message_time")
+
+    def __init__(self, league, draft_json: dict=None, picks: list=None, adp_provider: AdpProvider=None):
         self.league = league
         self.id = league.draft_id
+        self.adp_provider = adp_provider or AdpProvider(is_redraft=league.redraft)
         self.picks = []
-        self.last_picks = [] 
-        self._retrieve_draft_info(league.draft_id)
-        self.update_picks()
+        self.new_picks = []
+        self.last_pick_no = 0
+        self.picks_df = pd.DataFrame()
+        self._enriched_picks_df = pd.DataFrame()
+        self._enriched_pick_no = 0
+        self._enriched_players_df = None
+        self._picks_marker = None
+        self._fetched_marker = None
+        self.requests_saved = 0
+        self.player_pool = None
+        self._pooled_pick_count = 0
+        self._retrieve_draft_info(league.draft_id, draft_json)
+        if picks is None:
+            self.update_picks()
+        else:
+            self._set_picks(picks)
+            self._record_picks_marker(self._change_marker(self.draft_json))
 
         logger.info(f"{self} Initialized")
 
+
+    @classmethod
+    async def create_async(cls, league, draft_json: dict=None, adp_provider: AdpProvider=None):
+        """Creates a Draft, fetching the draft information and picks concurrently"""
+        if draft_json is None:
+            draft_json, picks = await asyncio.gather(
+                async_sleeper_api.get_draft_info(league.draft_id),
+                async_sleeper_api.get_draft_picks(league.draft_id),
+            )
+        else:
+            picks = await async_sleeper_api.get_draft_picks(league.draft_id)
+
+        return cls(league, draft_json=draft_json, picks=picks, adp_provider=adp_provider)
+
     
     def update_picks(self) -> str:
         """
         Updates the picks attribute with the most recent picks from the draft.
+        Picks made since the last update are stored in new_picks.
+        The picks endpoint is skipped when the draft info shows nothing changed since the picks were last fetched.
         Returns the draft status as a string.
         """
         logger.debug(f"Updating {self} with most recent picks from the draft")
-        self.last_picks = self.picks # convert last_picks to the current picks before update
-        draft_status = self.update_status()
-        self.status = draft_status
-        self.picks = sleeper_api.get_draft_picks(self.id)
-        if self.picks != []:
-            self.picks_df = self._convert_picks_json_to_df(self.picks)
+        with span("status_poll") as status_span:
+            self.update_status()
+            status_span.set(status=self.status)
+
+        with span("picks_fetch") as fetch_span:
+            if self._picks_unchanged():
+                self._skip_picks_fetch()
+                fetch_span.set(skipped=True)
+            else:
+                marker = self._change_marker(self.draft_json)
+                self._set_picks(sleeper_api.get_draft_picks(self.id))
+                self._record_picks_marker(marker)
+                fetch_span.set(skipped=False, new_picks=len(self.new_picks), pick_no=self.last_pick_no)
         
         return self.status
+
+
+    async def update_picks_async(self) -> str:
+        """Awaitable version of update_picks"""
+        logger.debug(f"Updating {self} with most recent picks from the draft")
+        self._set_status(await async_sleeper_api.get_draft_info(self.id))
+        if self._picks_unchanged():
+            self._skip_picks_fetch()
+        else:
+            marker = self._change_marker(self.draft_json)
+            self._set_picks(await async_sleeper_api.get_draft_picks(self.id))
+            self._record_picks_marker(marker)
+
+        return self.status
         
         
     def update_status(self):
         """Retrieves the most recent draft status"""
         logger.debug(f"Retrieving draft status for {self}")
-        self.status = sleeper_api.get_draft_info(self.id).get("status")
+        self._set_status(sleeper_api.get_draft_info(self.id))
         return self.status
     
 
-    def retrieve_draft_state(self, players_df: pd.DataFrame) -> tuple[pd.DataFrame, pd.DataFrame]:
-        """Uses the players_df and picks_df to return the current remaining players and picked players dataframes"""
-        self.update_picks()
-        if self.picks != []:
-            adp_df = self.merge_with_adp(players_df, is_redraft=self.league.redraft)
-            enriched_picks_df = self.merge_picks_with_players(players_df)
-            remaining_players_df = self.get_remaining_players(adp_df, enriched_picks_df)
+    def retrieve_draft_state(self, players_df: pd.DataFrame, refresh: bool=True) -> tuple[pd.DataFrame, RemainingPlayers]:
+        """
+        Uses the players_df and picks_df to return the picked players dataframe and a view of the remaining players.
+        Before the first pick the picks dataframe is empty and every player remains.
+        Set refresh to False when update_picks was already called for this tick.
+        """
+        if refresh:
+            self.update_picks()
+        with span("adp_merge") as adp_span:
+            adp_df = self.merge_with_adp(players_df, is_redraft=self.league.redraft, adp_provider=self.adp_provider)
+            adp_span.set(rows=len(adp_df))
 
-            return enriched_picks_df, remaining_players_df
-        
+        if self.picks != []:
+            with span("player_merge") as merge_span:
+                enriched_picks_df = self.merge_picks_with_players(players_df)
+                merge_span.set(rows=len(enriched_picks_df))
         else:
             logger.warning(f"No draft picks recorded yet: status={self.status}")
-            return pd.DataFrame(), pd.DataFrame()
+            enriched_picks_df = pd.DataFrame()
+
+        with span("remaining") as remaining_span:
+            remaining_players = self.remaining_players(adp_df)
+            remaining_span.set(rows=len(remaining_players))
+
+        return enriched_picks_df, remaining_players
     
 
-    def wait_until_draft_resumes(self):
-        """Checks the status of the draft continuously until it is no longer paused"""
+    def wait_until_draft_resumes(self, poll_interval: float=1):
+        """Checks the status of the draft every poll_interval seconds until it is no longer paused"""
         logger.info(f"{self} {self.status.upper()}, waiting for status change")
         while self.update_status() == self.PAUSED:
             logger.debug(f"Latest status={self.status}")
-            time.sleep(1)
+            time.sleep(poll_interval)
 
 
     def wait_until_draft(self):
@@ -91,50 +161,66 @@ class Draft:
         logger.info(f"{self} has begun, good luck!")
     
 
+    @instrumented(DATAFRAME_STAGES)
     def merge_picks_with_players(self, players_df: pd.DataFrame) -> pd.DataFrame:
         """
         Enriches draft picks with player metadata by merging on 'player_id'. 
         Returns a DataFrame indexed by 'player_id', sorted by round and pick number.
+        Only picks made since the last call are merged, unless a different players_df is passed.
         """
-        self.picks_df["player_id"] = self.picks_df["player_id"].astype(str)
-        players_df["player_id"] = players_df["player_id"].astype(str)
-
-        merged_df = self.picks_df.merge(players_df, on="player_id", how="left", suffixes=("_player", ""))
-
-        # Optional: sort and index for roster logic
-        merged_df = merged_df.sort_values(by=["round", "pick_no"])
-        merged_df = merged_df.set_index("player_id")
-
-        for col in merged_df.columns:
-            if merged_df[col].isna().all():
-                merged_df.drop(columns=col, inplace=True)
-
-        return merged_df
+        if players_df is not self._enriched_players_df:
+            players_df["player_id"] = players_df["player_id"].astype(str)
+            self._enriched_players_df = players_df
+            self._enriched_picks_df = pd.DataFrame()
+            self._enriched_pick_no = 0
+
+        pending_picks_df = self.picks_df[self.picks_df["pick_no"] > self._enriched_pick_no]
+        if not pending_picks_df.empty:
+            pending_picks_df = pending_picks_df.assign(player_id=pending_picks_df["player_id"].astype(str))
+            merged_df = pending_picks_df.merge(players_df, on="player_id", how="left", suffixes=("_player", ""))
+
+            # Optional: sort and index for roster logic
+            merged_df = merged_df.sort_values(by=["round", "pick_no"])
+            merged_df = merged_df.set_index("player_id")
+
+            self._enriched_picks_df = pd.concat([self._enriched_picks_df, merged_df]) if not self._enriched_picks_df.empty else merged_df
+            self._enriched_pick_no = self.last_pick_no
+
+        enriched_picks_df = self._enriched_picks_df
+        return enriched_picks_df.loc[:, enriched_picks_df.notna().any()]
     
 
     @staticmethod
-    def merge_with_adp(players_df: pd.DataFrame, is_redraft: bool=True) -> pd.DataFrame:
-        """Sorts the players dataframe by ADP gathered from FantasyFootballCalculator.com API"""
-        logger.info(f"Sorting players dataframe by ADP")
-        if is_redraft:
-            adp_df = get_half_ppr_adp_df()
-        
-        else:
-            adp_df = get_rookie_adp_df()
+    @instrumented(DATAFRAME_STAGES)
+    def merge_with_adp(players_df: pd.DataFrame, is_redraft: bool=True, adp_provider: AdpProvider=None) -> pd.DataFrame:
+        """
+        Sorts the players dataframe by ADP gathered from FantasyFootballCalculator.com API.
+        Pass an AdpProvider to reuse its cached ADP and merged table, otherwise the ADP is fetched fresh.
+        """
+        adp_provider = adp_provider or AdpProvider(is_redraft=is_redraft)
+        return adp_provider.merge(players_df)
+    
 
-        adp_df = adp_df[adp_df['full_name'].notna()]
-        adp_df.loc[adp_df['position_x'] == 'DEF', 'full_name'] = adp_df.loc[adp_df['position_x'] == 'DEF', 'team_x'] + ' Defense'
-        adp_df['normalized_name'] = adp_df['full_name'].apply(normalize_name)
+    @instrumented(DATAFRAME_STAGES)
+    def remaining_players(self, adp_df: pd.DataFrame) -> RemainingPlayers:
+        """
+        Returns a view of the players of adp_df who have not been drafted, in ADP order, call to_frame on it for the full table.
+        Availability is kept in a PlayerPool over adp_df, only picks made since the last call are marked.
+        The pool is rebuilt when a different adp_df is passed, e.g. after the ADP was refreshed.
+        """
+        if self.player_pool is None or self.player_pool.players_df is not adp_df:
+            logger.debug(f"Building player pool for {self}")
+            self.player_pool = PlayerPool(adp_df)
+            self._pooled_pick_count = 0
 
-        merged_df = pd.merge(players_df, adp_df[['normalized_name', 'adp']], on='normalized_name', how='left')
+        self.player_pool.mark_drafted_many(pick["player_id"] for pick in self.picks[self._pooled_pick_count:])
+        self._pooled_pick_count = len(self.picks)
 
-        max_adp = adp_df['adp'].max()
-        merged_df['adp'] = merged_df['adp'].fillna(max_adp + 1)
+        return self.player_pool.remaining_players()
 
-        return merged_df.sort_values('adp')
-    
 
     @staticmethod
+    @instrumented(DATAFRAME_STAGES)
     def get_remaining_players(players_df: pd.DataFrame, picks_df: pd.DataFrame) -> pd.DataFrame:
         """
         Returns a DataFrame of players who have not been drafted.
@@ -156,11 +242,99 @@ class Draft:
 
 
 
+    def _set_status(self, draft_json: dict):
+        """Stores the latest draft info response, its status and the settings that can change before the draft starts"""
+        self.draft_json = draft_json
+        self.status = draft_json.get("status")
+        self.settings = draft_json.get("settings", self.settings)
+        self.order = draft_json.get("draft_order", self.order)
+
+
+    @classmethod
+    def _change_marker(cls, draft_json: dict) -> tuple | None:
+        """Returns the change markers of a draft info response, None if the response carries none of them"""
+        marker = tuple(draft_json.get(key) for key in cls.CHANGE_MARKERS)
+        return marker if any(value is not None for value in marker) else None
+
+
+    def _picks_unchanged(self) -> bool:
+        """Checks whether the latest draft info matches the one seen when the picks were last fetched"""
+        marker = self._change_marker(self.draft_json)
+        return marker is not None and marker == self._picks_marker
+
+
+    def _record_picks_marker(self, marker: tuple | None):
+        """
+        Stores the draft info marker the picks were fetched under once the picks are known to have caught up with it,
+        later polls with the same marker then skip the picks request.
+        The picks endpoint can lag the draft info by a pick, so a marker is only trusted when the picks reach the pick count of a
+        complete draft, or when a second fetch under the same marker brings no new picks. Otherwise the next poll fetches again.
+        """
+        expected_picks = self._expected_pick_count()
+        if expected_picks is not None:
+            caught_up = self.last_pick_no >= expected_picks
+        else:
+            caught_up = marker == self._fetched_marker and not self.new_picks
+
+        self._fetched_marker = marker
+        self._picks_marker = marker if caught_up else None
+
+
+    def _expected_pick_count(self) -> int | None:
+        """Number of picks the draft info accounts for, sleeper only tells it for a complete draft"""
+        settings = (self.draft_json or {}).get("settings") or {}
+        if self.status != self.COMPLETE or not settings.get("teams") or not settings.get("rounds"):
+            return None
+        return settings["teams"] * settings["rounds"]
+
+
+    def _skip_picks_fetch(self):
+        """Records a skipped picks request, nothing was picked since the last fetch"""
+        self.new_picks = []
+        self.requests_saved += 1
+        logger.debug(f"No change in {self} since the last picks fetch, {self.requests_saved} picks requests saved")
+
+
+    def _set_picks(self, picks: list) -> list:
+        """
+        Appends the picks with a pick_no past the last one seen to the pick log and picks_df.
+        The appended picks are stored in new_picks and returned.
+        """
+        latest_pick_no = max((pick["pick_no"] for pick in picks), default=0)
+        if latest_pick_no < self.last_pick_no:
+            logger.warning(f"{self} returned fewer picks than already recorded, the draft was reset. Rebuilding the pick log")
+            self._reset_picks()
+
+        self.new_picks = sorted(
+            (pick for pick in picks if pick["pick_no"] > self.last_pick_no),
+            key=lambda pick: pick["pick_no"],
+        )
+        if self.new_picks:
+            logger.debug(f"{len(self.new_picks)} new picks in {self}")
+            new_picks_df = self._convert_picks_json_to_df(self.new_picks)
+            self.picks_df = pd.concat([self.picks_df, new_picks_df], ignore_index=True) if not self.picks_df.empty else new_picks_df
+            self.picks.extend(self.new_picks)
+            self.last_pick_no = self.new_picks[-1]["pick_no"]
+
+        return self.new_picks
+
+
+    def _reset_picks(self):
+        """Clears the pick log and every table derived from it"""
+        self.picks = []
+        self.last_pick_no = 0
+        self.picks_df = pd.DataFrame()
+        self._enriched_picks_df = pd.DataFrame()
+        self._enriched_pick_no = 0
+        self.player_pool = None
+        self._pooled_pick_count = 0
+
+
     def _convert_picks_json_to_df(self, picks: dict) -> pd.DataFrame:
         """Converts the picks json API return to a dataframe with other metadata"""
         picks_df = pd.DataFrame.from_dict(picks)
 
-        picks_df.drop(columns=["is_keeper", "metadata"], inplace=True)
+        picks_df.drop(columns=["is_keeper", "metadata"], errors="ignore", inplace=True)
 
         # Add username column to picks_df
         picks_df['username'] = picks_df['picked_by'].map(self.league.id_username_map)
@@ -169,11 +343,14 @@ class Draft:
         return picks_df
     
 
-    def _retrieve_draft_info(self, draft_id: str):
+    def _retrieve_draft_info(self, draft_id: str, draft_json: dict | None=None):
         """Collects the data of teh given draft and assigns it to attributes in this class instance."""
         logger.debug(f"Retrieveing draft information for {self}")
         
-        self.draft_json = sleeper_api.get_draft_info(draft_id)
+        if not draft_json:
+            draft_json = sleeper_api.get_draft_info(draft_id)
+
+        self.draft_json = draft_json
         self.id = self.draft_json.get("draft_id")
         self.type = self.draft_json.get("type")
         self.status = self.draft_json.get("status")
@@ -1,7 +1,10 @@
+import asyncio
 import logging
 
+import sleeper.async_sleeper_api as async_sleeper_api
 import sleeper.sleeper_api as sleeper_api
 
+from sleeper.adp_provider import AdpProvider
 from sleeper.sleeper_user import User
 from sleeper.sleeper_draft import Draft
 
@@ -12,16 +15,57 @@ logger = logging.getLogger(__name__)
 
 class League:
     """Represents a sleeper league, contains scoring and roster information"""
-    def __init__(self, league_id: str, league_json: dict=None, redraft: bool=True):
+    def __init__(self, league_id: str, league_json: dict=None, redraft: bool=True, adp_provider: AdpProvider=None):
         self.redraft = redraft
+        self.adp_provider = adp_provider
         self._retrieve_league_info(league_id, league_json)
         self._retrieve_users()
-        self.id_username_map = {user_id: user.name for user_id, user in self.users.items()}
-        self.username_id_map = {user.name: user_id for user_id, user in self.users.items()}
+        self._map_usernames()
 
         self._add_draft()
 
         logger.info(f"Initialized {self}")
+
+
+    @classmethod
+    async def create_async(cls, league_id: str, league_json: dict=None, redraft: bool=True, adp_provider: AdpProvider=None):
+        """
+        Creates a League with its users and draft, fanning the sleeper API requests out concurrently.
+        The league and its rosters are requested together, then every user and the draft in one batch.
+        """
+        logger.info(f"Retrieveing league information for league ID {league_id}")
+        league = cls.__new__(cls)
+        league.redraft = redraft
+        league.adp_provider = adp_provider
+
+        if league_json:
+            rosters_json = await async_sleeper_api.get_league_rosters(league_id)
+        else:
+            league_json, rosters_json = await asyncio.gather(
+                async_sleeper_api.get_league_info(league_id),
+                async_sleeper_api.get_league_rosters(league_id),
+            )
+        league._retrieve_league_info(league_id, league_json)
+        league.rosters_json = rosters_json
+
+        owner_ids = [roster.get("owner_id") for roster in rosters_json]
+        users_info, draft_json, picks = await asyncio.gather(
+            async_sleeper_api.get_users_info(owner_ids),
+            async_sleeper_api.get_draft_info(league.draft_id),
+            async_sleeper_api.get_draft_picks(league.draft_id),
+        )
+
+        league.users = {}
+        for owner_id, user_info in zip(owner_ids, users_info):
+            user = User.from_info(user_info, username=owner_id)
+            league.users[user.id] = user
+        league._map_usernames()
+
+        logger.info(f"Adding draft ID {league.draft_id} to {league}")
+        league.draft = Draft(league, draft_json=draft_json, picks=picks, adp_provider=adp_provider)
+
+        logger.info(f"Initialized {league}")
+        return league
     
 
     def update_rosters(self, players_df):
@@ -73,11 +117,17 @@ class League:
             self.users[user.id] = user
     
 
+    def _map_usernames(self):
+        """Builds the user ID to username lookups used to label picks"""
+        self.id_username_map = {user_id: user.name for user_id, user in self.users.items()}
+        self.username_id_map = {user.name: user_id for user_id, user in self.users.items()}
+
+
     def _add_draft(self):
         """Adds a draft object to the league."""
         logger.info(f"Adding draft ID {self.draft_id} to {self}")
 
-        self.draft = Draft(self)
+        self.draft = Draft(self, adp_provider=self.adp_provider)
     
 
     def __repr__(self):
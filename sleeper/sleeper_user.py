@@ -22,11 +22,19 @@ class User:
         return instance
     
     def __init__(self, username: str):
-        self.info = sleeper_api.get_user_info(username)
-        self.name = self.info.get("username")
-        self.id = self.info.get("user_id")
+        self._set_info(sleeper_api.get_user_info(username))
         
         logger.info(f"Initialized {self}")
+
+
+    @classmethod
+    def from_info(cls, user_info: dict, username: str=None):
+        """Creates a User from an already retrieved user info json without calling the sleeper API"""
+        user = cls.__new__(cls, username or user_info.get("username"))
+        user._set_info(user_info)
+
+        logger.info(f"Initialized {user}")
+        return user
     
 
     def retrieve_league_info(self, league_name: str) -> tuple[str, dict] | None:
@@ -61,6 +69,13 @@ class User:
         self.roster = Roster(roster_obj, player_df)
 
 
+    def _set_info(self, user_info: dict):
+        """Assigns the sleeper user info json to this instance's attributes"""
+        self.info = user_info
+        self.name = self.info.get("username")
+        self.id = self.info.get("user_id")
+
+
     def __repr__(self):
         return f"{self.__class__.__name__}({self.name}, {self.id})"
 
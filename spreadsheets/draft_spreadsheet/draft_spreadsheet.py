@@ -1,12 +1,16 @@
 import logging
 import pandas as pd
 
+from instrumentation.tracing import span
 from spreadsheets.sheet_manager import SheetManager, Spreadsheet
+from spreadsheets.sheet_write_queue import SheetWriteQueue
+from spreadsheets.spreadsheet_utils import dataframe_to_rows
 from spreadsheets.draft_spreadsheet.league_settings_worksheet import LeagueSettingsWorksheet
 from spreadsheets.draft_spreadsheet.draftboard_worksheet import DraftboardWorksheet
 from spreadsheets.draft_spreadsheet.picks_worksheet import PicksWorksheet
 from spreadsheets.draft_spreadsheet.member_roster_worksheet import MemberRosterWorksheet
 
+from sleeper.draft_scheduler import DraftPollScheduler
 from sleeper.sleeper_league import League
 from sleeper.sleeper_user import User
 
@@ -30,6 +34,10 @@ class DraftSpreadsheet(SheetManager):
         self.draft = self.league.draft
         self.players_df = players_df
         self.my_user = my_user
+        self.scheduler = DraftPollScheduler(self.draft, my_user_id=my_user.id)
+        self.write_queue = SheetWriteQueue(spreadsheet)
+        # (rows, cols) last written to each my_roster block, a smaller table is padded with blanks over the old cells
+        self._roster_blocks = {}
         
         if not self.is_empty():
             self.clear_spreadsheet()
@@ -96,14 +104,22 @@ class DraftSpreadsheet(SheetManager):
         Returns boolean if the draft spreadsheet was successfully updates or not.
         """
         logger.debug(f"Updating the draft spreadsheet depending on the current status of the draft.")
+        with span("tick", draft_id=self.draft.id) as tick_span:
+            update_status = self._update_draftboard_spreadsheet()
+            tick_span.set(status=self.draft.status, pick_no=self.draft.last_pick_no, new_picks=len(self.draft.new_picks), updated=update_status)
 
+        return update_status
+
+
+    def _update_draftboard_spreadsheet(self) -> bool:
+        """One tick of update_draftboard_spreadsheet, traced by it"""
         self.draft.update_picks()
         status = self.draft.status
         logger.debug(f"Current draft status: {status}")
 
         match status:
             case self.draft.DRAFTING:
-                if (self.draft.picks == self.draft.last_picks):
+                if not self.draft.new_picks:
                     update_status = False
                 
                 else:
@@ -117,7 +133,7 @@ class DraftSpreadsheet(SheetManager):
                 update_status = False
 
             case self.draft.PAUSED:
-                self.draft.wait_until_draft_resumes()
+                self.draft.wait_until_draft_resumes(poll_interval=self.scheduler.paused_interval)
                 update_status = False
 
             case _:
@@ -128,22 +144,49 @@ class DraftSpreadsheet(SheetManager):
     
 
     def update_worksheets(self):
-        """Updates the draftboard, picks, and my_roster worksheets with the latest picks"""
+        """
+        Queues updates of the draftboard, picks, and my_roster worksheets with the latest picks.
+        The writes are sent in the background by the write_queue, call flush_writes to wait for them.
+        """
         # Turn the picks API return into a df and merge with player data
-        picks_df, remaining_players_df = self.draft.retrieve_draft_state(self.players_df)
+        picks_df, remaining_players_df = self.draft.retrieve_draft_state(self.players_df, refresh=False)
 
         # Update the picks WS with new picks
         picks_ws = self.get_sheet(self.PICKS, PicksWorksheet)
-        picks_ws.update_picks(picks_df)
+        picks_ws.write_budget = self.write_queue.bucket
+        self.write_queue.submit(self.PICKS, lambda: picks_ws.update_picks(picks_df), paced=True)
 
         # Update the user roster with new picks
-        self.my_user.set_roster(picks_df, self.players_df)
-        my_team_ws = self.get_sheet(self.MY_ROSTER, MemberRosterWorksheet)
-        my_team_ws.update_position_count()
-        my_team_ws.update_roster()
+        with span("roster_update") as roster_span:
+            self.my_user.set_roster(picks_df, self.players_df)
+            roster = self.my_user.roster
+            roster_span.set(rows=len(roster.df))
+        self.write_queue.submit_values_batch(self.MY_ROSTER, {
+            "A4": self._roster_block("A4", dataframe_to_rows(roster.position_count, include_headers=True)),
+            "A12": self._roster_block("A12", dataframe_to_rows(roster.df.reindex(columns=MemberRosterWorksheet.HEADERS), include_headers=True)),
+        })
         
         # Subtract the picked players from the players df to get the remaining players and repost to draftboard
         draftboard_ws = self.get_sheet(self.DRAFTBOARD, DraftboardWorksheet)
-        draftboard_ws.update_draftboard(remaining_players_df)
+        draftboard_ws.write_budget = self.write_queue.bucket
+        self.write_queue.submit(self.DRAFTBOARD, lambda: draftboard_ws.update_draftboard(remaining_players_df), paced=True)
+
+        return True
+
+
+    def _roster_block(self, start_cell: str, rows: list[list]) -> list[list]:
+        """Pads a table of the my_roster worksheet with blanks over the rows and columns left over from a larger previous table"""
+        previous_rows, previous_cols = self._roster_blocks.get(start_cell, (0, 0))
+        cols = max(len(row) for row in rows)
+        self._roster_blocks[start_cell] = (len(rows), cols)
+
+        width = max(cols, previous_cols)
+        padded = [list(row) + [""] * (width - len(row)) for row in rows]
+        padded += [[""] * width for _ in range(previous_rows - len(rows))]
+        return padded
+
 
-        return True
\ No newline at end of file
+    def flush_writes(self, timeout: float=None) -> bool:
+        """Waits until every queued worksheet write was sent, returns False if the timeout expired first"""
+        logger.info(f"Flushing {self.write_queue.pending} pending writes for {self}")
+        return self.write_queue.flush(timeout=timeout)
@@ -1,7 +1,10 @@
 import logging
+import numpy as np
 import pandas as pd
 
+from sleeper.player_pool import RemainingPlayers
 from sleeper.sleeper_league import League
+from spreadsheets.sheet_write_queue import is_quota_error
 from spreadsheets.worksheet_wrapper import WorksheetWrapper, Worksheet
 
 logging.basicConfig(format="%(asctime)s [%(levelname)s] %(message)s", level=logging.INFO)
@@ -10,26 +13,107 @@ logger = logging.getLogger(__name__)
 
 
 class DraftboardWorksheet(WorksheetWrapper):
-    """Contains the live draftboard for the current league draft"""
+    """
+    Contains the live draftboard for the current league draft.
+    The worksheet tracks the player pool position on each row so picks only delete the drafted players' rows,
+    the whole board is rewritten on the first update, when the board order changed and every reconcile_every updates.
+    """
 
     HEADERS = ["adp", "full_name", "team", "fantasy_positions", "injury_status", "height", "weight", "age"]
 
-    def __init__(self, worksheet: Worksheet):
+    def __init__(self, worksheet: Worksheet, reconcile_every: int=25):
         super().__init__(worksheet)
+        self.reconcile_every = reconcile_every
+        self.row_positions = None
+        self._pool = None
+        # Players written from a dataframe, located in the pool of the first RemainingPlayers view diffed against them
+        self._row_ids = None
+        self._updates_since_rewrite = 0
 
         logger.info(f"Initialized {self}")
     
 
-    def update_draftboard(self, draftboard_df: pd.DataFrame):
-        """Updates the current draft board with a new DataFrame without the most recent picks"""
+    def update_draftboard(self, remaining_players: RemainingPlayers | pd.DataFrame, full_rewrite: bool=False):
+        """
+        Updates the current draft board with the players remaining after the most recent picks.
+        A RemainingPlayers view is diffed against the board by pool position, a dataframe is always written in full.
+        """
         logger.info(f"Updating {self} with most recent pick")
+        if isinstance(remaining_players, RemainingPlayers) and self._row_ids is not None:
+            self.row_positions, self._pool = remaining_players.pool.positions_of(self._row_ids), remaining_players.pool
+            self._row_ids = None
+
+        if full_rewrite or not self._can_diff(remaining_players):
+            self.rewrite_draftboard(remaining_players)
+            return
+
+        still_remaining = np.isin(self.row_positions, remaining_players.positions)
+        kept_positions = self.row_positions[still_remaining]
+        if not np.array_equal(kept_positions, remaining_players.positions):
+            logger.info(f"{self} rows no longer match the remaining players, rewriting the board")
+            self.rewrite_draftboard(remaining_players)
+            return
+
+        removed_rows = (np.flatnonzero(~still_remaining) + 2).tolist()
+        try:
+            self.delete_row_ranges(self._contiguous_ranges(removed_rows))
+
+        except Exception as e:
+            # Over quota a rewrite would only send more requests, let the caller back off and retry the delete
+            if is_quota_error(e):
+                raise
+            logger.warning(f"Failed to delete drafted players from {self}, rewriting the board: {e}")
+            self.rewrite_draftboard(remaining_players)
+            return
+
+        logger.debug(f"Removed {len(removed_rows)} drafted players from {self}")
+        self.row_positions = kept_positions
+        self._updates_since_rewrite += 1
+
+
+    def rewrite_draftboard(self, remaining_players: RemainingPlayers | pd.DataFrame):
+        """Clears the board and writes every remaining player, resetting the tracked rows"""
+        logger.info(f"Rewriting every remaining player to {self}")
+        self.row_positions = self._row_ids = None
+        draftboard_df = remaining_players.to_frame() if isinstance(remaining_players, RemainingPlayers) else remaining_players
         self.clear()
         try:
             self.write_dataframe(draftboard_df[self.HEADERS])
         
         except Exception as e:
+            if is_quota_error(e):
+                raise
             logger.warning(f"Failed to post draftboard_df to {self}, attempting to remove 'adp': {e}")
             modified_headers = self.HEADERS.copy()
             modified_headers.remove("adp")
             self.write_dataframe(draftboard_df[modified_headers])
-            
\ No newline at end of file
+
+        if isinstance(remaining_players, RemainingPlayers):
+            self.row_positions = remaining_players.positions
+            self._pool = remaining_players.pool
+        elif "player_id" in draftboard_df.columns:
+            self._row_ids = draftboard_df["player_id"].astype(str).tolist()
+        self._updates_since_rewrite = 0
+
+
+    def _can_diff(self, remaining_players: RemainingPlayers | pd.DataFrame) -> bool:
+        """Checks whether the tracked rows can be diffed against remaining_players instead of rewriting the board"""
+        return (
+            isinstance(remaining_players, RemainingPlayers)
+            and self.row_positions is not None
+            and remaining_players.pool is self._pool
+            and not remaining_players.empty
+            and self._updates_since_rewrite < self.reconcile_every
+        )
+
+
+    @staticmethod
+    def _contiguous_ranges(rows: list[int]) -> list[tuple[int, int]]:
+        """Groups sorted row numbers into (start_row, end_row) blocks of consecutive rows"""
+        ranges = []
+        for row in rows:
+            if ranges and ranges[-1][1] == row - 1:
+                ranges[-1] = (ranges[-1][0], row)
+            else:
+                ranges.append((row, row))
+        return ranges
@@ -26,13 +26,14 @@ class LeagueSettingsWorksheet(WorksheetWrapper):
 
 
     def update_settings(self):
-        """Updates the league settings with the current set league. ALWAYS CALL set_league FIRST"""
+        """Updates the league settings with the current set league, the four sections are sent in one batch. ALWAYS CALL set_league FIRST"""
         logger.info(f"Updating league settings in {self}")
         self.clear()
-        self.add_league_name()
-        self.add_league_settings()
-        self.add_scoring_settings()
-        self.add_draft_settings()
+        with self.batch_writes():
+            self.add_league_name()
+            self.add_league_settings()
+            self.add_scoring_settings()
+            self.add_draft_settings()
 
 
     def add_league_name(self):
@@ -22,7 +22,7 @@ class MemberRosterWorksheet(WorksheetWrapper):
 
 
    def set_user(self, user: User):
-      """Sets the user attribute for the spreadsheet"""
+      """Sets the user attribute for the spreadsheet, the user info and any existing roster are written in one batch"""
       logger.info(f"Setting user attributes for {self}")
       self.user = user
       user_info = convert_single_level_dict_to_matrix(
@@ -31,8 +31,12 @@ class MemberRosterWorksheet(WorksheetWrapper):
          "User_ID" : self.user.id
          }
       )
-      self.update_user_info(user_info)
-   
+      with self.batch_writes():
+         self.update_user_info(user_info)
+         if getattr(self.user, "roster", None) is not None:
+            self.update_position_count()
+            self.update_roster()
+
 
    def update_user_info(self, user_info: dict):
       """Adds basic user informaiton to the top of the worksheet"""
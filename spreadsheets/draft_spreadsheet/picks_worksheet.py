@@ -1,6 +1,7 @@
 import logging
 import pandas as pd
 
+from spreadsheets.spreadsheet_utils import dataframe_to_rows
 from spreadsheets.worksheet_wrapper import WorksheetWrapper, Worksheet
 
 logging.basicConfig(format="%(asctime)s [%(levelname)s] %(message)s", level=logging.INFO)
@@ -9,23 +10,51 @@ logger = logging.getLogger(__name__)
 
 
 class PicksWorksheet(WorksheetWrapper):
-    """Contains the live picks for the current league draft"""
+    """
+    Contains the live picks for the current league draft.
+    The worksheet keeps the pick_no of the last pick on the sheet and only appends picks past it,
+    the whole table is rewritten when the sheet and the mark disagree.
+    """
 
     HEADERS = ["pick_no", "full_name", "adp", "fantasy_positions", "injury_status", "team", "username", "draft_slot", "height", "weight", "age"]
 
     def __init__(self, worksheet: Worksheet):
         super().__init__(worksheet)
+        self.last_pick_no = None
 
         logger.info(f"Initialized {self}")
     
 
-    def update_picks(self, picks_df: pd.DataFrame):
+    def update_picks(self, picks_df: pd.DataFrame, full_rewrite: bool=False):
         """updates the pick board with the latest picks from the draft"""
         logger.info(f"Updating {self} with the latest picks from the draft")
-        try:
-            self.write_dataframe(picks_df[self.HEADERS])
-        
-        except Exception as e:
-            logger.warning(f"Update failed for {self}, exception: {e}")
-
-
+        if picks_df.empty:
+            return
+
+        if full_rewrite or self.last_pick_no is None:
+            self.rewrite_picks(picks_df)
+            return
+
+        new_picks_df = picks_df[picks_df["pick_no"] > self.last_pick_no].sort_values("pick_no")
+        if picks_df["pick_no"].max() < self.last_pick_no or (not new_picks_df.empty and new_picks_df["pick_no"].iloc[0] != self.last_pick_no + 1):
+            logger.warning(f"{self} last pick {self.last_pick_no} does not line up with the draft picks, repairing the sheet")
+            self.rewrite_picks(picks_df)
+            return
+
+        if new_picks_df.empty:
+            return
+
+        # A failed append is left to the caller (the write queue retries quota errors), the sheet is only rewritten on a real mismatch
+        self.append_rows(dataframe_to_rows(new_picks_df.reindex(columns=self.HEADERS)))
+        self.last_pick_no = int(new_picks_df["pick_no"].iloc[-1])
+
+
+    def rewrite_picks(self, picks_df: pd.DataFrame):
+        """
+        Repair path, rewrites every pick and resets the last pick mark.
+        Errors are raised so the caller can retry, the mark stays cleared until a rewrite succeeds.
+        """
+        logger.info(f"Rewriting every pick to {self}")
+        self.last_pick_no = None
+        self.write_dataframe(picks_df.reindex(columns=self.HEADERS).sort_values("pick_no"))
+        self.last_pick_no = int(picks_df["pick_no"].max())
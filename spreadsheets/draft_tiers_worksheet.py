@@ -1,7 +1,8 @@
 import logging
 import pandas as pd
-import re
 
+from sleeper.player_identity import PlayerIdentityIndex
+from spreadsheets.spreadsheet_utils import normalize_names
 from spreadsheets.worksheet_wrapper import WorksheetWrapper, Worksheet
 
 logging.basicConfig(format="%(asctime)s [%(levelname)s] %(message)s", level=logging.INFO)
@@ -24,27 +25,14 @@ class DraftTiersWorksheet(WorksheetWrapper):
         return self.read_dataframe()
     
 
-    def add_player_ids(self, player_df: pd.DataFrame):
+    def add_player_ids(self, player_df: pd.DataFrame, identity_index: PlayerIdentityIndex=None):
         """Retrieves the tiers and adds an index column with the sleeper player ids"""
         logger.info(f"Adding player ids to {self}")
-        tiers_df = self.retrieve_tiers()
-        tiers_df["normalized_name"] = tiers_df["full_name"].apply(self._normalize_name)
+        tiers_df = self.retrieve_tiers().drop(columns=["player_id"], errors="ignore")
+        tiers_df["normalized_name"] = normalize_names(tiers_df["full_name"])
 
-        merged_df = pd.merge(tiers_df, player_df[["player_id", "normalized_name"]], on="normalized_name", how="left")
+        identity_index = identity_index or PlayerIdentityIndex(player_df)
+        tiers_df["player_id"] = identity_index.resolve_frame(tiers_df, name_col="full_name", position_col="position", team_col="team")
 
-        merged_df.set_index("player_id")
         self.clear()
-        self.write_dataframe(merged_df)
-
-    
-    def _normalize_name(self, name: str):
-        """Normalized the names of players to match accross datasets"""
-        if not isinstance(name, str):
-            name = ""
-        name = name.lower().strip()
-        # Remove common suffixes
-        name = re.sub(r'\b(jr\.?|sr\.?|ii|iii|iv|v)\b', '', name)
-        # Remove punctuation and extra whitespace
-        name = re.sub(r'[^\w\s]', '', name)
-        name = re.sub(r'\s+', ' ', name)
-        return name.strip()
\ No newline at end of file
+        self.write_dataframe(tiers_df)
\ No newline at end of file
@@ -1,6 +1,7 @@
 import gspread
 from gspread import Spreadsheet
 import logging
+import os
 from oauth2client.service_account import ServiceAccountCredentials
 
 
@@ -50,6 +51,10 @@ def list_service_account_drive_files(service_acct_file: str, scopes: list[str])
 SCOPES = ["https://spreadsheets.google.com/feeds", "https://www.googleapis.com/auth/drive"]
 SERVICE_ACCOUNT_FILE = 'spreadsheets/spreadsheet_credentials.json' 
 
+SPREADSHEET_BACKEND_ENV = "SPREADSHEET_BACKEND"
+GSPREAD_BACKEND = "gspread"
+MEMORY_BACKEND = "memory"
+
 
 def get_gspread_client(scopes: list[str]=SCOPES, service_acct: str=SERVICE_ACCOUNT_FILE):
     """Creates and returns an authorized gspread client connection"""
@@ -63,8 +68,18 @@ def get_gspread_client(scopes: list[str]=SCOPES, service_acct: str=SERVICE_ACCOU
         logger.error(f"Unable to create connection to gspread client, errors: {e}")
 
 
-def get_spreadsheet(spreadsheet_name: str, scopes: list[str]=SCOPES, service_acct: str=SERVICE_ACCOUNT_FILE) -> Spreadsheet:
-    """Retrieves a Spreadsheet object using the gspread client"""
+def get_spreadsheet(spreadsheet_name: str, scopes: list[str]=SCOPES, service_acct: str=SERVICE_ACCOUNT_FILE, backend: str=None) -> Spreadsheet:
+    """
+    Retrieves a Spreadsheet object using the gspread client.
+    backend (or the SPREADSHEET_BACKEND environment variable) set to "memory" returns an in-memory stand-in instead, see memory_backend.
+    """
+    backend = backend or os.environ.get(SPREADSHEET_BACKEND_ENV, GSPREAD_BACKEND)
+    if backend == MEMORY_BACKEND:
+        from spreadsheets.memory_backend import get_memory_client
+
+        logger.info(f"Opening {spreadsheet_name} from the in-memory spreadsheet backend")
+        return get_memory_client().open(str(spreadsheet_name))
+
     client = get_gspread_client(scopes=scopes, service_acct=service_acct)
     return client.open(spreadsheet_name)
 
@@ -0,0 +1,472 @@
+from collections import Counter, deque
+import functools
+import itertools
+import json
+import logging
+import threading
+import time
+
+from gspread.cell import Cell
+from gspread.exceptions import APIError, WorksheetNotFound
+from gspread.utils import a1_range_to_grid_range, rowcol_to_a1
+import requests
+
+logging.basicConfig(format="%(asctime)s [%(levelname)s] %(message)s", level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+READ = "read"
+WRITE = "write"
+
+
+
+def _api_call(kind: str):
+    """Marks a MemorySpreadsheet or MemoryWorksheet method as one Sheets API request of the given kind"""
+    def decorator(method):
+        @functools.wraps(method)
+        def wrapper(self, *args, **kwargs):
+            client = self.client
+            client._before_request(kind, f"{self.__class__.__name__}.{method.__name__}")
+            with client._lock:
+                return method(self, *args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def _api_error(status_code: int, message: str, status: str) -> APIError:
+    """Builds a gspread APIError around a fake Sheets API response"""
+    response = requests.Response()
+    response.status_code = status_code
+    response._content = json.dumps({"error": {"code": status_code, "message": message, "status": status}}).encode()
+    return APIError(response)
+
+
+def _cell_value(value) -> str:
+    """Renders a written value the way the Sheets API returns formatted values"""
+    if value is None:
+        return ""
+    if isinstance(value, bool):
+        return "TRUE" if value else "FALSE"
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    return str(value)
+
+
+
+class RequestStats:
+    """Counts the requests made against the memory backend, per method and kind, and the cells they read and wrote"""
+    def __init__(self):
+        self.requests = Counter()
+        self.reads = 0
+        self.writes = 0
+        self.cells_read = 0
+        self.cells_written = 0
+
+
+    @property
+    def total_requests(self) -> int:
+        return self.reads + self.writes
+
+
+    def as_dict(self) -> dict:
+        """Snapshot of the counters"""
+        return {
+            "requests": self.total_requests,
+            "reads": self.reads,
+            "writes": self.writes,
+            "cells_read": self.cells_read,
+            "cells_written": self.cells_written,
+            "by_method": dict(self.requests),
+        }
+
+
+    def reset(self):
+        """Zeroes every counter"""
+        self.__init__()
+
+
+    def __repr__(self):
+        return f"{self.__class__.__name__}(requests={self.total_requests}, cells_read={self.cells_read}, cells_written={self.cells_written})"
+
+
+
+class MemoryClient:
+    """
+    In-memory stand-in for an authorized gspread client, holds spreadsheets by title and the request accounting.
+    latency is added to every request, read_quota and write_quota are requests per rolling minute past which
+    requests fail with a 429 APIError, like the Sheets API per-user quotas.
+    """
+    def __init__(self, latency: float=0.0, read_quota: int=None, write_quota: int=None):
+        self.latency = latency
+        self.read_quota = read_quota
+        self.write_quota = write_quota
+        self.stats = RequestStats()
+
+        self._lock = threading.RLock()
+        self._spreadsheets = {}
+        self._recent = {READ: deque(), WRITE: deque()}
+        self._ids = itertools.count(1)
+
+
+    def open(self, title: str) -> "MemorySpreadsheet":
+        """Returns the spreadsheet with the given title, created with an empty Sheet1 the first time"""
+        with self._lock:
+            if title not in self._spreadsheets:
+                self._spreadsheets[title] = MemorySpreadsheet(self, title, f"memory-{next(self._ids)}")
+            return self._spreadsheets[title]
+
+
+    def _before_request(self, kind: str, method: str):
+        """Accounts for one request, enforcing the quota and sleeping the simulated latency"""
+        with self._lock:
+            quota = self.read_quota if kind == READ else self.write_quota
+            if quota is not None:
+                recent = self._recent[kind]
+                now = time.monotonic()
+                while recent and now - recent[0] >= 60:
+                    recent.popleft()
+                if len(recent) >= quota:
+                    raise _api_error(429, f"Quota exceeded for quota metric '{kind} requests' per minute per user", "RESOURCE_EXHAUSTED")
+                recent.append(now)
+
+            self.stats.requests[method] += 1
+            if kind == READ:
+                self.stats.reads += 1
+            else:
+                self.stats.writes += 1
+
+        if self.latency:
+            time.sleep(self.latency)
+
+
+    def __repr__(self):
+        return f"{self.__class__.__name__}(spreadsheets={list(self._spreadsheets)}, {self.stats})"
+
+
+
+class MemorySpreadsheet:
+    """In-memory stand-in for a gspread Spreadsheet"""
+    def __init__(self, client: MemoryClient, title: str, spreadsheet_id: str):
+        self.client = client
+        self.title = title
+        self.id = spreadsheet_id
+        self._sheet_ids = itertools.count(0)
+        self._worksheets = []
+        self._add_worksheet("Sheet1", 1000, 26)
+
+
+    @_api_call(READ)
+    def worksheets(self) -> list["MemoryWorksheet"]:
+        return list(self._worksheets)
+
+
+    @_api_call(READ)
+    def worksheet(self, title: str) -> "MemoryWorksheet":
+        return self._find(title)
+
+
+    @_api_call(WRITE)
+    def add_worksheet(self, title: str, rows: int, cols: int, index: int=None) -> "MemoryWorksheet":
+        if any(ws.title == title for ws in self._worksheets):
+            raise _api_error(400, f"A sheet with the name \"{title}\" already exists", "INVALID_ARGUMENT")
+        return self._add_worksheet(title, int(rows), int(cols), index)
+
+
+    @_api_call(WRITE)
+    def del_worksheet(self, worksheet: "MemoryWorksheet"):
+        self._delete_sheet(worksheet.id)
+
+
+    @_api_call(READ)
+    def fetch_sheet_metadata(self, params: dict=None) -> dict:
+        return {
+            "properties": {"title": self.title},
+            "sheets": [
+                {
+                    "properties": {
+                        "sheetId": ws.id,
+                        "title": ws.title,
+                        "index": index,
+                        "gridProperties": {"rowCount": ws.row_count, "columnCount": ws.col_count},
+                    }
+                }
+                for index, ws in enumerate(self._worksheets)
+            ],
+        }
+
+
+    @_api_call(READ)
+    def values_get(self, range_name: str, params: dict=None) -> dict:
+        worksheet, grid_range = self._resolve_range(range_name)
+        values = worksheet._read(grid_range)
+        # Like the API, an empty range has no values key at all
+        return {"range": range_name, "majorDimension": "ROWS", **({"values": values} if values else {})}
+
+
+    @_api_call(WRITE)
+    def values_batch_update(self, body: dict) -> dict:
+        for entry in body.get("data", []):
+            worksheet, grid_range = self._resolve_range(entry["range"])
+            worksheet._write(grid_range, entry["values"])
+        return {"totalUpdatedCells": sum(len(row) for entry in body.get("data", []) for row in entry["values"])}
+
+
+    @_api_call(WRITE)
+    def batch_update(self, body: dict) -> dict:
+        for request in body.get("requests", []):
+            (kind, params), = request.items()
+            match kind:
+                case "deleteSheet":
+                    self._delete_sheet(params["sheetId"])
+
+                case "deleteDimension":
+                    self._find_by_id(params["range"]["sheetId"])._delete_dimension(params["range"])
+
+                case "updateCells":
+                    self._find_by_id(params["range"]["sheetId"])._values = []
+
+                case "updateSheetProperties":
+                    properties = params["properties"]
+                    if "title" in properties:
+                        self._find_by_id(properties["sheetId"]).title = properties["title"]
+
+                case _:
+                    raise NotImplementedError(f"{self} does not support {kind} batch requests")
+
+        return {"spreadsheetId": self.id, "replies": [{} for _ in body.get("requests", [])]}
+
+
+    def _add_worksheet(self, title: str, rows: int, cols: int, index: int=None) -> "MemoryWorksheet":
+        worksheet = MemoryWorksheet(self, title, next(self._sheet_ids), rows, cols)
+        self._worksheets.insert(len(self._worksheets) if index is None else index, worksheet)
+        return worksheet
+
+
+    def _delete_sheet(self, sheet_id: int):
+        if len(self._worksheets) == 1:
+            raise _api_error(400, "You can't remove all the sheets in a document", "INVALID_ARGUMENT")
+        self._worksheets.remove(self._find_by_id(sheet_id))
+
+
+    def _find(self, title: str) -> "MemoryWorksheet":
+        for ws in self._worksheets:
+            if ws.title == title:
+                return ws
+        raise WorksheetNotFound(title)
+
+
+    def _find_by_id(self, sheet_id: int) -> "MemoryWorksheet":
+        for ws in self._worksheets:
+            if ws.id == sheet_id:
+                return ws
+        raise _api_error(400, f"No grid with id: {sheet_id}", "INVALID_ARGUMENT")
+
+
+    def _resolve_range(self, range_name: str) -> tuple["MemoryWorksheet", dict]:
+        """Splits a "'title'!A1:B2" range into its worksheet and grid range, a bare title covers the whole sheet"""
+        title, _, cells = range_name.rpartition("!") if "!" in range_name else (range_name, "", "")
+        title = title[1:-1].replace("''", "'") if title.startswith("'") else title
+        return self._find(title), (a1_range_to_grid_range(cells) if cells else {})
+
+
+    def __repr__(self):
+        return f"{self.__class__.__name__}({self.title}, {self.id})"
+
+
+
+class MemoryWorksheet:
+    """
+    In-memory stand-in for a gspread Worksheet, values are stored as the formatted strings the API returns.
+    Writes outside the grid fail like they do against Google, appends and resize grow it.
+    """
+    def __init__(self, spreadsheet: MemorySpreadsheet, title: str, sheet_id: int, rows: int, cols: int):
+        self.spreadsheet = spreadsheet
+        self.client = spreadsheet.client
+        self.title = title
+        self.id = sheet_id
+        self.row_count = rows
+        self.col_count = cols
+        self._values = []
+
+
+    @property
+    def spreadsheet_id(self) -> str:
+        return self.spreadsheet.id
+
+
+    @_api_call(WRITE)
+    def update(self, values: list[list], range_name: str=None, **kwargs) -> dict:
+        # gspread < 6 took the range first
+        if isinstance(values, str):
+            values, range_name = range_name, values
+        grid_range = a1_range_to_grid_range(range_name or "A1")
+        self._write(grid_range, values)
+        return {"updatedRange": range_name, "updatedCells": sum(len(row) for row in values)}
+
+
+    @_api_call(WRITE)
+    def update_cells(self, cells: list[Cell], value_input_option: str=None) -> dict:
+        for cell in cells:
+            self._write({"startRowIndex": cell.row - 1, "startColumnIndex": cell.col - 1}, [[cell.value]])
+        return {"updatedCells": len(cells)}
+
+
+    @_api_call(WRITE)
+    def batch_update(self, data: list[dict], **kwargs) -> dict:
+        for entry in data:
+            cells = entry["range"].rpartition("!")[2]
+            self._write(a1_range_to_grid_range(cells), entry["values"])
+        return {"totalUpdatedCells": sum(len(row) for entry in data for row in entry["values"])}
+
+
+    @_api_call(WRITE)
+    def append_row(self, values: list, **kwargs) -> dict:
+        return self._append([values])
+
+
+    @_api_call(WRITE)
+    def append_rows(self, values: list[list], **kwargs) -> dict:
+        return self._append(values)
+
+
+    @_api_call(WRITE)
+    def clear(self) -> dict:
+        self._values = []
+        return {"clearedRange": self.title}
+
+
+    @_api_call(WRITE)
+    def resize(self, rows: int=None, cols: int=None) -> dict:
+        if rows is not None:
+            self.row_count = int(rows)
+            del self._values[self.row_count:]
+        if cols is not None:
+            self.col_count = int(cols)
+            self._values = [row[:self.col_count] for row in self._values]
+        return {}
+
+
+    @_api_call(WRITE)
+    def update_title(self, title: str) -> dict:
+        self.title = title
+        return {}
+
+
+    @_api_call(READ)
+    def get_all_values(self, **kwargs) -> list[list]:
+        return self._read({}) or [[]]
+
+
+    @_api_call(READ)
+    def get_all_records(self, **kwargs) -> list[dict]:
+        values = self._read({})
+        if not values:
+            return []
+        headers, *rows = values
+        return [dict(zip(headers, row + [""] * (len(headers) - len(row)))) for row in rows]
+
+
+    @_api_call(READ)
+    def get(self, range_name: str=None, **kwargs) -> list[list]:
+        # gspread answers an empty range with [[]] rather than []
+        return self._read(a1_range_to_grid_range(range_name) if range_name else {}) or [[]]
+
+
+    @_api_call(READ)
+    def col_values(self, col: int, **kwargs) -> list:
+        values = self._read({"startColumnIndex": col - 1, "endColumnIndex": col})
+        return [row[0] if row else "" for row in values]
+
+
+    @_api_call(READ)
+    def row_values(self, row: int, **kwargs) -> list:
+        values = self._read({"startRowIndex": row - 1, "endRowIndex": row})
+        return values[0] if values else []
+
+
+    def _write(self, grid_range: dict, values: list[list]):
+        """Writes a matrix at the top left corner of the grid range"""
+        start_row, start_col = grid_range.get("startRowIndex", 0), grid_range.get("startColumnIndex", 0)
+        last_row = start_row + len(values)
+        last_col = start_col + max((len(row) for row in values), default=0)
+        if last_row > self.row_count or last_col > self.col_count:
+            raise _api_error(400, f"Range ({self.title}!{rowcol_to_a1(last_row, last_col)}) exceeds grid limits. Max rows: {self.row_count}, max columns: {self.col_count}", "INVALID_ARGUMENT")
+
+        while len(self._values) < last_row:
+            self._values.append([])
+        for row_values, row in zip(values, self._values[start_row:last_row]):
+            if len(row) < start_col + len(row_values):
+                row.extend([""] * (start_col + len(row_values) - len(row)))
+            row[start_col:start_col + len(row_values)] = [_cell_value(value) for value in row_values]
+
+        self.client.stats.cells_written += sum(len(row) for row in values)
+
+
+    def _read(self, grid_range: dict) -> list[list]:
+        """Reads the values inside a grid range, trailing empty cells and rows are dropped like the API does"""
+        rows = self._values[grid_range.get("startRowIndex", 0):grid_range.get("endRowIndex", len(self._values))]
+        start_col, end_col = grid_range.get("startColumnIndex", 0), grid_range.get("endColumnIndex")
+        values = []
+        for row in rows:
+            row = row[start_col:end_col]
+            while row and row[-1] == "":
+                row = row[:-1]
+            values.append(list(row))
+        while values and not values[-1]:
+            values.pop()
+
+        self.client.stats.cells_read += sum(len(row) for row in values)
+        return values
+
+
+    def _append(self, rows: list[list]) -> dict:
+        """Appends rows after the last row with a value, growing the grid when needed"""
+        last_row = len(self._values)
+        while last_row and not any(self._values[last_row - 1]):
+            last_row -= 1
+        self.row_count = max(self.row_count, last_row + len(rows))
+        self.col_count = max(self.col_count, max((len(row) for row in rows), default=0))
+        self._write({"startRowIndex": last_row, "startColumnIndex": 0}, rows)
+        return {"updates": {"updatedRange": f"{self.title}!A{last_row + 1}", "updatedRows": len(rows)}}
+
+
+    def _delete_dimension(self, dimension_range: dict):
+        """Deletes a block of rows or columns, shrinking the grid"""
+        start, end = dimension_range["startIndex"], dimension_range["endIndex"]
+        if dimension_range["dimension"] == "ROWS":
+            del self._values[start:end]
+            self.row_count -= end - start
+        else:
+            self._values = [row[:start] + row[end:] for row in self._values]
+            self.col_count -= end - start
+
+
+    def __repr__(self):
+        return f"{self.__class__.__name__}({self.title}, {self.id})"
+
+
+
+_memory_client = None
+_memory_client_lock = threading.Lock()
+
+
+def get_memory_client() -> MemoryClient:
+    """Returns the process wide MemoryClient, creating it on first use"""
+    global _memory_client
+    with _memory_client_lock:
+        if _memory_client is None:
+            _memory_client = MemoryClient()
+        return _memory_client
+
+
+def configure_memory_client(**kwargs) -> MemoryClient:
+    """Replaces the process wide MemoryClient with one built from the given MemoryClient arguments"""
+    return set_memory_client(MemoryClient(**kwargs))
+
+
+def set_memory_client(client: MemoryClient) -> MemoryClient:
+    """Installs the given client as the process wide MemoryClient"""
+    global _memory_client
+    with _memory_client_lock:
+        _memory_client = client
+        return client
@@ -0,0 +1,99 @@
+import logging
+
+import pandas as pd
+
+from spreadsheets.spreadsheet_utils import ARROW_STRING_DTYPE
+
+logging.basicConfig(format="%(asctime)s [%(levelname)s] %(message)s", level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+# Compact string dtype for free text columns, falls back to the python backed string dtype without pyarrow
+STRING_DTYPE = ARROW_STRING_DTYPE or "string"
+
+# Sleeper sends these as strings, search_rank defaults to 9999999 for unranked players
+INTEGER_COLUMNS = {
+    "age": "Int16",
+    "weight": "Int16",
+    "height": "Int16",
+    "years_exp": "Int16",
+    "number": "Int16",
+    "depth_chart_order": "Int16",
+    "tier": "Int16",
+    "intra_tier_ranking": "Int16",
+    "search_rank": "Int32",
+    "news_updated": "Int64",
+}
+
+BOOLEAN_COLUMNS = ["active"]
+
+# Low cardinality labels repeated across thousands of players
+CATEGORY_COLUMNS = [
+    "position", "team", "team_abbr", "status", "injury_status", "injury_body_part", "practice_participation",
+    "depth_chart_position", "fantasy_positions", "college", "birth_state", "birth_country",
+]
+
+# Placeholders written to the sheet or produced by astype(str) that stand for a missing value
+NULL_VALUES = frozenset(["", "N/A", "nan", "NaN", "None", "<NA>"])
+
+
+
+def coerce_player_dtypes(players_df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Returns the players table with compact typed columns: nullable ints for the numeric fields, a nullable boolean for the flags,
+    categoricals for the repeated labels and the pyarrow string dtype for free text.
+    player_id and the other *_id columns stay python strings since every join in the project is on str ids.
+    """
+    typed_df = pd.DataFrame({col: _coerce_column(col, series) for col, series in players_df.items()}, index=players_df.index)
+    if typed_df.index.name == "player_id":
+        typed_df.index = _id_strings(typed_df.index.to_series()).to_numpy()
+        typed_df.index.name = "player_id"
+    return typed_df
+
+
+def to_sheet_df(players_df: pd.DataFrame, default_val: str="N/A") -> pd.DataFrame:
+    """Converts a typed players table back to the all-string layout of the player_data worksheet, missing values become default_val"""
+    sheet_df = players_df.astype(object)
+    return sheet_df.where(players_df.notna(), default_val).astype(str)
+
+
+def memory_report(players_df: pd.DataFrame) -> pd.DataFrame:
+    """Returns the dtype and deep memory usage in bytes of every column, plus a total row"""
+    usage = players_df.memory_usage(deep=True, index=False)
+    report = pd.DataFrame({"dtype": players_df.dtypes.astype(str), "bytes": usage}).sort_values("bytes", ascending=False)
+    report.loc["total"] = ["", int(usage.sum())]
+    return report
+
+
+def _coerce_column(col: str, series: pd.Series) -> pd.Series:
+    """Casts one column of the players table to its compact dtype"""
+    is_text = series.dtype == object or pd.api.types.is_string_dtype(series.dtype)
+    if is_text:
+        series = series.map(lambda x: None if isinstance(x, str) and x in NULL_VALUES else x)
+
+    if col == "player_id" or col.endswith("_id"):
+        return _id_strings(series)
+
+    if col in INTEGER_COLUMNS:
+        numbers = pd.to_numeric(series, errors="coerce")
+        if (numbers.dropna() % 1 != 0).any():
+            return numbers.astype("Float64")
+        return numbers.astype(INTEGER_COLUMNS[col])
+
+    if col in BOOLEAN_COLUMNS:
+        return series.map(lambda x: x if pd.isna(x) or isinstance(x, bool) else str(x).strip().lower() == "true").astype("boolean")
+
+    if col in CATEGORY_COLUMNS:
+        return series.astype("category")
+
+    if is_text and pd.api.types.infer_dtype(series, skipna=True) in ("string", "empty"):
+        return series.astype(STRING_DTYPE)
+
+    return series
+
+
+def _id_strings(series: pd.Series) -> pd.Series:
+    """Ids as python strings, undoing the float parsing the sheet reader applies to numeric ids (4046.0 -> '4046')"""
+    if pd.api.types.is_float_dtype(series) and (series.dropna() % 1 == 0).all():
+        series = series.astype("Int64")
+    return series.astype(object).where(series.notna(), None).map(lambda x: x if x is None else str(x).strip())
@@ -1,8 +1,9 @@
 import logging
 import pandas as pd
 
-from sleeper.sleeper_api import get_players
-from spreadsheets.spreadsheet_utils import normalize_name
+from sleeper.players_cache import PlayersCache
+from spreadsheets.players_spreadsheet.player_store import coerce_player_dtypes, to_sheet_df
+from spreadsheets.spreadsheet_utils import normalize_names
 from spreadsheets.worksheet_wrapper import WorksheetWrapper, Worksheet
 
 logging.basicConfig(format="%(asctime)s [%(levelname)s] %(message)s", level=logging.INFO)
@@ -27,22 +28,32 @@ class PlayersDataWorksheet(WorksheetWrapper):
         logger.info(f"{self} Initialized")
 
 
-    def update_players(self, default_val: str="N/A"):
-        """Uses the sleeper API to update the information on all the players in the spreadsheet"""
+    def update_players(self, default_val: str="N/A", refresh: bool=False) -> pd.DataFrame:
+        """
+        Uses the sleeper API to update the information on all the players in the spreadsheet.
+        The players payload comes from the local PlayersCache unless it is expired or refresh is set.
+        Returns the typed players table that was written.
+        """
         logger.info(f"Updating player data on {self}")
 
-        players_df = pd.DataFrame.from_dict(get_players())
+        players_df = PlayersCache().load_df(force_refresh=refresh)
         clean_players_df = self.clean_df(players_df, default_val=default_val)
 
         # clean_players_df.to_excel("players_df_output.xlsx", index=False)
-        self.write_dataframe(clean_players_df, clear=True, include_index=True)
+        self.write_dataframe(to_sheet_df(clean_players_df, default_val=default_val), clear=True, include_index=True)
+        return clean_players_df
 
 
     def clean_df(self, players_df: pd.DataFrame, default_val: str="N/A") -> pd.DataFrame:
-        """Cleans the raw player dataframe by removing extra columns and replacing null / unnacceptable value types"""
+        """
+        Cleans the raw player dataframe by removing extra columns and unnacceptable value types.
+        Returns the typed player store, use to_sheet_df to get the string values written to the worksheet.
+        """
         logger.info(f"Cleaning player info Dataframe for worksheet upload")
 
-        players_df = players_df.T
+        # The raw API dict loads with one column per player, the PlayersCache dataframe with one row per player
+        if "player_id" not in players_df.columns:
+            players_df = players_df.T
         players_df.set_index("player_id", inplace=True)
 
         players_df.dropna(axis=1, how="all", inplace=True)
@@ -67,10 +78,6 @@ class PlayersDataWorksheet(WorksheetWrapper):
         # Add defense abbreviation to full_name column
         players_df.loc[players_df['position'] == 'DEF', 'full_name'] = players_df.loc[players_df['position'] == 'DEF', 'team'] + ' Defense'
 
-        players_df['normalized_name'] = players_df['full_name'].apply(normalize_name)
+        players_df['normalized_name'] = normalize_names(players_df['full_name'])
 
-        # Fill nulls
-        for col in players_df.columns:
-            players_df[col] = players_df[col].astype(str).fillna(default_val)
-
-        return players_df
\ No newline at end of file
+        return coerce_player_dtypes(players_df)
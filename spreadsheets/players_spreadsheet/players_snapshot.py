@@ -0,0 +1,120 @@
+from datetime import datetime, timedelta
+import json
+import logging
+import os
+import tempfile
+
+import pandas as pd
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = pq = None
+
+logging.basicConfig(format="%(asctime)s [%(levelname)s] %(message)s", level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+PLAYERS_SNAPSHOT_FILE = "cache/players_snapshot.parquet"
+
+# Bump when the typed player store layout changes so older snapshots are ignored
+SNAPSHOT_LAYOUT_VERSION = 1
+
+SNAPSHOT_METADATA_KEY = b"players_snapshot"
+
+
+
+class PlayersSnapshot:
+    """
+    Local parquet copy of the typed player_data table so startup does not have to pull the whole sheet.
+    The file carries the layout version, when it was written and when its source data was last updated.
+    It is read through a memory map and only used while its source data is younger than the ttl, requires pyarrow.
+    """
+    def __init__(self, path: str=PLAYERS_SNAPSHOT_FILE, ttl: timedelta=timedelta(days=1)):
+        self.path = path
+        self.ttl = ttl
+
+
+    def load(self) -> pd.DataFrame | None:
+        """Returns the snapshot players table, None if the snapshot is missing, stale or unreadable"""
+        if not self.is_fresh():
+            return None
+
+        try:
+            table = pq.read_table(self.path, memory_map=True)
+            players_df = table.to_pandas()
+
+        except Exception as e:
+            logger.warning(f"Unable to read {self}, falling back to the players spreadsheet: {e}")
+            return None
+
+        metadata = self.metadata() or {}
+        logger.info(f"Loaded {len(players_df)} players from {self}, source updated {metadata.get('source_updated_at')}")
+        return players_df
+
+
+    def write(self, players_df: pd.DataFrame, source_updated_at: datetime):
+        """Writes the players table to the snapshot atomically, source_updated_at is when the players data itself was last updated"""
+        if pq is None:
+            logger.warning(f"pyarrow is not installed, skipping {self} write")
+            return
+
+        metadata = {
+            "layout_version": SNAPSHOT_LAYOUT_VERSION,
+            "written_at": datetime.now().isoformat(timespec="seconds"),
+            "source_updated_at": source_updated_at.isoformat(timespec="seconds"),
+        }
+        table = pa.Table.from_pandas(players_df, preserve_index=False)
+        table = table.replace_schema_metadata({**(table.schema.metadata or {}), SNAPSHOT_METADATA_KEY: json.dumps(metadata).encode()})
+
+        logger.info(f"Writing {len(players_df)} players to {self}")
+        directory = os.path.dirname(self.path) or "."
+        os.makedirs(directory, exist_ok=True)
+
+        fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=".players_snapshot_", suffix=".tmp")
+        os.close(fd)
+        try:
+            pq.write_table(table, tmp_path, compression="zstd")
+            os.replace(tmp_path, self.path)
+
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+
+
+    def metadata(self) -> dict | None:
+        """Snapshot metadata read from the parquet footer only, None if there is no readable snapshot"""
+        if pq is None or not os.path.exists(self.path):
+            return None
+
+        try:
+            schema_metadata = pq.read_schema(self.path).metadata or {}
+            return json.loads(schema_metadata[SNAPSHOT_METADATA_KEY])
+
+        except Exception as e:
+            logger.warning(f"Unable to read the metadata of {self}: {e}")
+            return None
+
+
+    def is_fresh(self) -> bool:
+        """
+        Checks whether a snapshot with the current layout exists and its source data is younger than the ttl.
+        The age is taken from source_updated_at so re-saving old sheet data does not make it look fresh.
+        """
+        metadata = self.metadata()
+        if not metadata or metadata.get("layout_version") != SNAPSHOT_LAYOUT_VERSION:
+            return False
+        return datetime.now() - datetime.fromisoformat(metadata["source_updated_at"]) < self.ttl
+
+
+    def invalidate(self):
+        """Removes the snapshot so the next startup reads the players spreadsheet"""
+        logger.info(f"Invalidating {self}")
+        if os.path.exists(self.path):
+            os.remove(self.path)
+
+
+    def __repr__(self):
+        return f"{self.__class__.__name__}({self.path}, ttl={self.ttl})"
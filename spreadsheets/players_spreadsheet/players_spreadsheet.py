@@ -4,7 +4,9 @@ from gspread import Spreadsheet
 import pandas as pd
 
 from spreadsheets.sheet_manager import SheetManager
+from spreadsheets.players_spreadsheet.player_store import coerce_player_dtypes, memory_report
 from spreadsheets.players_spreadsheet.players_data_worksheet import PlayersDataWorksheet
+from spreadsheets.players_spreadsheet.players_snapshot import PlayersSnapshot
 from spreadsheets.players_spreadsheet.update_log_worksheet import UpdateLogWorksheet
 
 logging.basicConfig(format="%(asctime)s [%(levelname)s] %(message)s", level=logging.INFO)
@@ -42,7 +44,8 @@ class PlayersSpreadsheet(SheetManager):
     def create_log_worksheet(self):
         """Creates the log post worksheet"""
         logger.info(f"Creating new post log worksheet")
-        return self.create_sheet(self.UPDATE_LOGS, UpdateLogWorksheet, cols=len(UpdateLogWorksheet.HEADERS))
+        # A tight grid keeps the last log on the last grid row, appends grow it
+        return self.create_sheet(self.UPDATE_LOGS, UpdateLogWorksheet, rows=1, cols=len(UpdateLogWorksheet.HEADERS))
     
 
     def create_player_data_worksheet(self):
@@ -53,15 +56,21 @@ class PlayersSpreadsheet(SheetManager):
     
 
     def update_player_data(self, update_description: str, force: bool=False):
-        """Updates the player data in the player_data worksheet and posts a time log"""
+        """Updates the player data in the player_data worksheet, posts a time log and refreshes the local PlayersSnapshot"""
         update = self.check_update_required()
         
         if update or force:
             player_ws = self._cache[self.PLAYER_DATA]
-            player_ws.update_players()
+            players_df = player_ws.update_players(refresh=force)
 
             logs_ws = self._cache[self.UPDATE_LOGS]
-            logs_ws.post_log(description=update_description)
+            updated_at = logs_ws.post_log(description=update_description)
+
+            # The snapshot only speeds up the next startup, a failed write must not fail the update
+            try:
+                PlayersSnapshot().write(players_df.reset_index(), source_updated_at=updated_at)
+            except Exception as e:
+                logger.warning(f"Unable to refresh the players snapshot after updating {self}: {e}")
         
         else:
             logger.info(f"Player data updated within 1 day, skipping update.")
@@ -69,20 +78,35 @@ class PlayersSpreadsheet(SheetManager):
 
     def check_update_required(self) -> bool:
         """Checks the update_logs sheet to see if the last player update was within the last 24 hours"""
+        return self.last_update_time().date() < datetime.datetime.now().date()
+
+
+    def last_update_time(self) -> datetime.datetime:
+        """Returns the datetime of the last posted update log"""
         logs_ws = self._cache[self.UPDATE_LOGS]
         last_log = logs_ws.retrieve_last_log()
 
         last_log_datetime_str = last_log["datetime_stamp"]
-        last_log_datetime_obj = datetime.datetime.strptime(last_log_datetime_str, "%Y-%m-%d %H:%M:%S")
-
-        return last_log_datetime_obj.date() < datetime.datetime.now().date()
+        return datetime.datetime.strptime(last_log_datetime_str, "%Y-%m-%d %H:%M:%S")
 
 
-    def retrieve_player_data(self) -> pd.DataFrame:
-        """Retrieves the all of the player data from the spreadsheet and returns it as a pd.Dataframe"""
+    def retrieve_player_data(self, write_snapshot: bool=True, source_updated_at: datetime.datetime=None) -> pd.DataFrame:
+        """
+        Retrieves the all of the player data from the spreadsheet and returns it as a typed pd.Dataframe.
+        The result is also written to the local PlayersSnapshot so the next startup can skip the sheet,
+        stamped with source_updated_at or else the time of the last update log, so the snapshot ages with the sheet data.
+        """
         logger.info(f"Retrieving player data from {self}")
         player_data_ws = self.get_sheet(self.PLAYER_DATA, PlayersDataWorksheet)
-        return player_data_ws.read_dataframe()
+        players_df = coerce_player_dtypes(player_data_ws.read_dataframe())
+
+        logger.info(f"Player data takes {memory_report(players_df).loc['total', 'bytes'] / 1e6:.1f} MB in memory")
+        if write_snapshot:
+            try:
+                PlayersSnapshot().write(players_df, source_updated_at=source_updated_at or self.last_update_time())
+            except Exception as e:
+                logger.warning(f"Unable to write the players snapshot from {self}: {e}")
+        return players_df
 
 
 
@@ -16,19 +16,20 @@ class UpdateLogWorksheet(WorksheetWrapper):
     def __init__(self, worksheet: Worksheet):
         super().__init__(worksheet)
 
-        if self.is_empty() or not self.retrieve_headers():
+        if self.first_cell() != self.HEADERS[0]:
             self.write_cell_range([self.HEADERS])
 
         logger.info(f"{self} Initialized")
     
 
-    def post_log(self, description: str):
-        """Posts the date that an upload occured showing how up to date the data is"""
+    def post_log(self, description: str) -> datetime.datetime:
+        """Posts the date that an upload occured showing how up to date the data is, returns the posted timestamp"""
         logger.info(f"Posting log for player upload to {self}")
         now = datetime.datetime.now()
         formatted_date = now.strftime("%Y-%m-%d %H:%M:%S")
 
         self.append_row([formatted_date, description])
+        return now.replace(microsecond=0)
 
 
     def retrieve_logs(self):
@@ -38,6 +39,7 @@ class UpdateLogWorksheet(WorksheetWrapper):
 
 
     def retrieve_last_log(self):
-        """Retrieves the last postes log"""
-        logger.info("Retrieveing the last posted log for {self}")
-        return self.get_records()[-1]
\ No newline at end of file
+        """Retrieves the last postes log, only the bottom row of the sheet is read"""
+        logger.info(f"Retrieveing the last posted log for {self}")
+        last_row = self.last_rows(1)[-1]
+        return dict(zip(self.HEADERS, last_row + [""] * (len(self.HEADERS) - len(last_row))))
\ No newline at end of file
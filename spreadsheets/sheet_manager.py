@@ -13,6 +13,8 @@ class SheetManager:
         self.spreadsheet = spreadsheet
         self.name = self.spreadsheet.title
         self.id = self.spreadsheet.id
+        self._worksheets = {}
+        self.refresh_metadata()
         self._cache = self._init_cache()
 
 
@@ -20,16 +22,23 @@ class SheetManager:
         """Checks to see if the spreadsheet is empty"""
         sheetnames = self.list_sheet_titles()
         if len(sheetnames) == 1:
-            if self.spreadsheet.worksheet(sheetnames[0]).get_all_values() == [[]]:
+            if WorksheetWrapper(self._worksheets[sheetnames[0]]).is_empty():
                 return True
             
         return False
     
 
     def get_sheet(self, title: str, worksheet_class: WorksheetWrapper=WorksheetWrapper) -> Worksheet:
-        """Retrieves a single worksheet object and returns it"""
+        """Retrieves a single worksheet object and returns it, reusing the cached wrapper when it already has the requested class"""
+        cached = self._cache.get(title)
+        if isinstance(cached, worksheet_class):
+            return cached
+
         logger.info(f"Retrieving worksheet {title} from {self}")
-        ws = self.spreadsheet.worksheet(title)
+        ws = self._worksheets.get(title)
+        if ws is None:
+            ws = self.spreadsheet.worksheet(title)
+            self._worksheets[title] = ws
         self._cache[title] = worksheet_class(ws)
         return self._cache[title]
 
@@ -46,6 +55,9 @@ class SheetManager:
             wswrapper.ws.update_title(new_title)
             wswrapper.title = new_title
             self._cache[new_title] = wswrapper
+            self._worksheets = {
+                (new_title if sheet_title == title else sheet_title): ws for sheet_title, ws in self._worksheets.items()
+            }
 
 
     def create_sheet(self, new_title: str, worksheet_class: WorksheetWrapper=WorksheetWrapper, rows: int=100, cols: int=26) -> Worksheet:
@@ -58,6 +70,7 @@ class SheetManager:
 
         else:
             ws = self.spreadsheet.add_worksheet(new_title, rows, cols)
+            self._worksheets[new_title] = ws
             self._cache[new_title] = worksheet_class(ws)
         
         return self._cache[new_title]
@@ -66,13 +79,34 @@ class SheetManager:
     def delete_sheet(self, title: str):
         """Deletes a worksheet from the google spreadsheet"""
         logger.info(f"Deleting worksheet {title} from {self}")
-        ws_wrapper = self._cache.pop(title)
-        self.spreadsheet.del_worksheet(ws_wrapper.ws)
+        self._cache.pop(title, None)
+        ws = self._worksheets.pop(title)
+        self.spreadsheet.del_worksheet(ws)
+
+
+    def delete_sheets(self, titles: list[str]):
+        """Deletes several worksheets from the google spreadsheet in a single batch request"""
+        if not titles:
+            return
+
+        logger.info(f"Deleting worksheets {titles} from {self}")
+        self.spreadsheet.batch_update({
+            "requests": [{"deleteSheet": {"sheetId": self._worksheets[title].id}} for title in titles]
+        })
+        for title in titles:
+            self._cache.pop(title, None)
+            self._worksheets.pop(title)
 
 
     def list_sheet_titles(self) -> list:
-        """Returns a list of the sheet titles in the spreadsheet"""
-        return [ws.title for ws in self.spreadsheet.worksheets()]
+        """Returns a list of the sheet titles in the spreadsheet, from the cached metadata"""
+        return list(self._worksheets)
+
+
+    def refresh_metadata(self):
+        """Fetches the worksheets of the spreadsheet in one request, the cached metadata is kept in sync by the methods above"""
+        logger.debug(f"Fetching worksheet metadata for {self}")
+        self._worksheets = {ws.title: ws for ws in self.spreadsheet.worksheets()}
 
 
     def clear_cache(self):
@@ -82,24 +116,29 @@ class SheetManager:
         
     
     def clear_spreadsheet(self):
-        """Clears all of the worksheets in the SpreadsheetManager"""
+        """
+        Resets the spreadsheet to a single empty Sheet1.
+        Deleting the other worksheets, clearing the first one and renaming it go out in one batch request.
+        """
         logger.info(f"Clearing the contents of the Worksheets in {self}")
 
-        for ws in self._cache.values():
-            ws.clear()
-        
-        while len(self.list_sheet_titles()) > 1:
-            next_sheet = self.list_sheet_titles()[-1]
-            self.delete_sheet(next_sheet)
-        
-        self.rename_sheet("Sheet1", title=self.list_sheet_titles()[0])
+        first_title, *other_titles = self.list_sheet_titles()
+        first_ws = self._worksheets[first_title]
+
+        requests = [{"deleteSheet": {"sheetId": self._worksheets[title].id}} for title in other_titles]
+        requests.append({"updateCells": {"range": {"sheetId": first_ws.id}, "fields": "userEnteredValue"}})
+        if first_title != "Sheet1":
+            requests.append({"updateSheetProperties": {"properties": {"sheetId": first_ws.id, "title": "Sheet1"}, "fields": "title"}})
+        self.spreadsheet.batch_update({"requests": requests})
+
+        self.refresh_metadata()
         self.clear_cache()
     
 
     def _init_cache(self) -> dict:
         """Initialized the cache with the names of the worksheets in the spreadsheet"""
         return {
-            title: WorksheetWrapper(self.spreadsheet.worksheet(title)) for title in self.list_sheet_titles()
+            title: WorksheetWrapper(ws) for title, ws in self._worksheets.items()
         }
 
     
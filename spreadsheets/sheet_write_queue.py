@@ -0,0 +1,261 @@
+import asyncio
+import logging
+import random
+import threading
+import time
+
+from gspread import Spreadsheet
+
+from instrumentation.tracing import current_span, span
+
+logging.basicConfig(format="%(asctime)s [%(levelname)s] %(message)s", level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+# Google Sheets allows 60 write requests per minute per user, keep a little headroom for reads and other tools
+DEFAULT_WRITES_PER_MINUTE = 50
+
+
+
+class TokenBucket:
+    """
+    Thread safe token bucket pacing requests to rate_per_minute with bursts of up to capacity.
+    penalize empties the bucket and blocks every acquire for a while, used when the API answers 429.
+    """
+    def __init__(self, rate_per_minute: float=DEFAULT_WRITES_PER_MINUTE, capacity: int=5):
+        self.rate = rate_per_minute / 60
+        self.capacity = capacity
+
+        self._lock = threading.Lock()
+        self._tokens = float(capacity)
+        self._updated_at = time.monotonic()
+        self._blocked_until = 0.0
+
+
+    def acquire(self, tokens: int=1) -> float:
+        """Blocks until tokens are available and takes them, returns the time spent waiting"""
+        waited = 0.0
+        while (delay := self.try_acquire(tokens)) > 0:
+            time.sleep(delay)
+            waited += delay
+        return waited
+
+
+    async def acquire_async(self, tokens: int=1) -> float:
+        """Awaitable acquire, waits on the event loop instead of blocking the thread"""
+        waited = 0.0
+        while (delay := self.try_acquire(tokens)) > 0:
+            await asyncio.sleep(delay)
+            waited += delay
+        return waited
+
+
+    def try_acquire(self, tokens: int=1) -> float:
+        """Takes the tokens and returns 0 if they are available, otherwise returns the seconds to wait before trying again"""
+        with self._lock:
+            now = time.monotonic()
+            self._refill(now)
+            if now >= self._blocked_until and self._tokens >= tokens:
+                self._tokens -= tokens
+                return 0.0
+            return max(self._blocked_until - now, (tokens - self._tokens) / self.rate)
+
+
+    def penalize(self, seconds: float):
+        """Drops the available tokens and blocks acquire for the given number of seconds"""
+        with self._lock:
+            self._tokens = 0.0
+            self._blocked_until = max(self._blocked_until, time.monotonic() + seconds)
+
+
+    def _refill(self, now: float):
+        """Adds the tokens earned since the last refill, up to capacity"""
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated_at) * self.rate)
+        self._updated_at = now
+
+
+    def __repr__(self):
+        return f"{self.__class__.__name__}(rate_per_minute={self.rate * 60:g}, capacity={self.capacity})"
+
+
+
+class SheetWriteQueue:
+    """
+    Write-behind queue for one spreadsheet, worksheet writes are submitted from the polling loop and sent by a background thread.
+    Pending writes are coalesced by key so only the latest state of a range or worksheet is sent:
+    value writes are keyed by worksheet and range and go out together in one values_batch_update call,
+    other writes are callables keyed by the caller (e.g. the incremental picks and draftboard updates).
+    Every request takes a token from the bucket and a 429 answer backs the whole queue off and retries.
+    A callable that sends several requests is submitted as paced and takes its own tokens per request (see WorksheetWrapper.write_budget),
+    it must let quota errors propagate so the queue can back off and retry it.
+    Each write is traced as a <key>_write span under the span that submitted it, with the time it spent queued.
+    """
+    def __init__(self, spreadsheet: Spreadsheet, bucket: TokenBucket=None, backoff_base: float=2.0, backoff_max: float=64.0, max_retries: int=6):
+        self.spreadsheet = spreadsheet
+        self.bucket = bucket or TokenBucket()
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.max_retries = max_retries
+
+        self._condition = threading.Condition()
+        self._pending_values = {}
+        self._pending_calls = {}
+        self._in_flight = False
+        self._closing = False
+        self._retries = 0
+        self._thread = None
+
+
+    def submit_values(self, worksheet_title: str, cell_range: str, values: list[list]):
+        """Queues a value write to a range of a worksheet, replacing any pending write to the same range"""
+        self.submit_values_batch(worksheet_title, {cell_range: values})
+
+
+    def submit_values_batch(self, worksheet_title: str, ranges: dict[str, list[list]]):
+        """
+        Queues value writes to several ranges of a worksheet at once, so the writer thread always sends them in the same batch.
+        Replaces any pending write to the same ranges.
+        """
+        with self._condition:
+            parent, submitted_at = current_span(), time.monotonic()
+            for cell_range, values in ranges.items():
+                self._pending_values[(worksheet_title, cell_range)] = (values, parent, submitted_at)
+            self._start()
+            self._condition.notify_all()
+
+
+    def submit(self, key, func, paced: bool=False):
+        """
+        Queues a callable that performs its own worksheet writes, replacing any pending callable with the same key.
+        paced callables take a token from the bucket for each request they send, others are charged a single token.
+        """
+        with self._condition:
+            self._pending_calls[key] = (func, paced, current_span(), time.monotonic())
+            self._start()
+            self._condition.notify_all()
+
+
+    @property
+    def pending(self) -> int:
+        """Number of writes waiting to be sent"""
+        with self._condition:
+            return len(self._pending_values) + len(self._pending_calls)
+
+
+    def flush(self, timeout: float=None) -> bool:
+        """Blocks until every queued write was sent, returns False if the timeout expired first"""
+        with self._condition:
+            return self._condition.wait_for(
+                lambda: not (self._pending_values or self._pending_calls or self._in_flight),
+                timeout=timeout,
+            )
+
+
+    def close(self, timeout: float=None):
+        """Sends the remaining writes and stops the background thread"""
+        logger.info(f"Closing {self}")
+        with self._condition:
+            self._closing = True
+            self._condition.notify_all()
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+
+    def _start(self):
+        """Starts the background writer thread on the first submission, must hold the condition"""
+        if self._thread is None or not self._thread.is_alive():
+            self._closing = False
+            self._thread = threading.Thread(target=self._run, name=f"sheet_writer_{self.spreadsheet.id}", daemon=True)
+            self._thread.start()
+
+
+    def _run(self):
+        """Background loop, takes every pending write at once and sends it"""
+        while True:
+            with self._condition:
+                self._condition.wait_for(lambda: self._pending_values or self._pending_calls or self._closing)
+                if self._closing and not (self._pending_values or self._pending_calls):
+                    return
+
+                values, self._pending_values = self._pending_values, {}
+                calls, self._pending_calls = self._pending_calls, {}
+                self._in_flight = True
+
+            failed_values, failed_calls = self._send(values, calls)
+
+            with self._condition:
+                # Writes submitted while these were in flight are newer and win over the retried ones
+                self._pending_values = {**failed_values, **self._pending_values}
+                self._pending_calls = {**failed_calls, **self._pending_calls}
+                self._in_flight = False
+                self._condition.notify_all()
+
+
+    def _send(self, values: dict, calls: dict) -> tuple[dict, dict]:
+        """Sends the value writes in one batch and then the callables, returns the writes to retry after a 429"""
+        if values:
+            self.bucket.acquire()
+            _, parent, submitted_at = next(reversed(values.values()))
+            titles = "+".join(sorted({title for title, _ in values}))
+            try:
+                with span(f"{titles}_write", parent=parent, queued_ms=(time.monotonic() - submitted_at) * 1000) as write_span:
+                    data = [
+                        {"range": self._a1_range(title, cell_range), "values": rows}
+                        for (title, cell_range), (rows, _, _) in values.items()
+                    ]
+                    if write_span:
+                        write_span.add(
+                            rows_written=sum(len(entry["values"]) for entry in data),
+                            cells_written=sum(len(row) for entry in data for row in entry["values"]),
+                        )
+                    self.spreadsheet.values_batch_update({"valueInputOption": "USER_ENTERED", "data": data})
+                self._retries = 0
+
+            except Exception as e:
+                if self._handle_error(e, f"{len(values)} value ranges"):
+                    return values, calls
+
+        for i, (key, (func, paced, parent, submitted_at)) in enumerate(calls.items()):
+            if not paced:
+                self.bucket.acquire()
+            try:
+                with span(f"{key}_write", parent=parent, queued_ms=(time.monotonic() - submitted_at) * 1000):
+                    func()
+                self._retries = 0
+
+            except Exception as e:
+                if self._handle_error(e, key):
+                    return {}, dict(list(calls.items())[i:])
+
+        return {}, {}
+
+
+    def _handle_error(self, e: Exception, label) -> bool:
+        """Backs off on quota errors and returns True if the write should be retried, other errors drop the write"""
+        if is_quota_error(e) and self._retries < self.max_retries:
+            delay = random.uniform(0, min(self.backoff_max, self.backoff_base * 2 ** self._retries))
+            self._retries += 1
+            logger.warning(f"Sheets write quota exceeded for {self}, backing off {delay:.1f}s (retry {self._retries}/{self.max_retries})")
+            self.bucket.penalize(delay)
+            return True
+
+        logger.error(f"Dropping write {label} in {self}: {e}")
+        self._retries = 0
+        return False
+
+
+    @staticmethod
+    def _a1_range(worksheet_title: str, cell_range: str) -> str:
+        """A1 notation of a range in a given worksheet"""
+        escaped_title = worksheet_title.replace("'", "''")
+        return f"'{escaped_title}'!{cell_range}"
+
+
+    def __repr__(self):
+        return f"{self.__class__.__name__}({self.spreadsheet.title}, {self.bucket})"
+
+
+
+def is_quota_error(e: Exception) -> bool:
+    """Checks whether an exception is a Sheets API 429 quota answer"""
+    return getattr(getattr(e, "response", None), "status_code", None) == 429
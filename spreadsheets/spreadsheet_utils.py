@@ -1,5 +1,9 @@
+import itertools
 import logging
+import numpy as np
+import pandas as pd
 import re
+import threading
 from gspread.utils import rowcol_to_a1, a1_to_rowcol
 
 
@@ -49,14 +53,110 @@ def sanitize_matrix(matrix: list[list], default_val: str="N/A"):
     ]
 
 
+def dataframe_to_rows(df: pd.DataFrame, default_val: str="", include_headers: bool=False) -> list[list]:
+    """Converts a DataFrame to a matrix of json serializable cell values, null cells become default_val"""
+    rows = df.astype(object).where(df.notna(), default_val).values.tolist()
+    return [list(df.columns)] + rows if include_headers else rows
+
+
+NAME_SUFFIX_PATTERN = re.compile(r'\b(jr\.?|sr\.?|ii|iii|iv|v)\b')
+NAME_PUNCTUATION_PATTERN = re.compile(r'[^\w\s]')
+NAME_WHITESPACE_PATTERN = re.compile(r'\s+')
+
+try:
+    import pyarrow  # noqa: F401
+    ARROW_STRING_DTYPE = "string[pyarrow]"
+except ImportError:
+    ARROW_STRING_DTYPE = None
+
+# Bounded memo of raw name -> normalized name shared by normalize_name and normalize_names, oldest entries are evicted first
+# Writes and evictions hold _name_memo_lock, lookups use get since an entry can be evicted by another thread at any time
+NAME_MEMO_SIZE = 50_000
+_name_memo = {}
+_name_memo_lock = threading.Lock()
+
+
 def normalize_name(name: str):
         """Normalized the names of players to match accross datasets"""
         if not isinstance(name, str):
             name = ""
-        name = name.lower().strip()
+        memoized = _name_memo.get(name)
+        if memoized is not None:
+            return memoized
+
+        normalized = name.lower().strip()
         # Remove common suffixes
-        name = re.sub(r'\b(jr\.?|sr\.?|ii|iii|iv|v)\b', '', name)
+        normalized = NAME_SUFFIX_PATTERN.sub('', normalized)
         # Remove punctuation and extra whitespace
-        name = re.sub(r'[^\w\s]', '', name)
-        name = re.sub(r'\s+', ' ', name)
-        return name.strip()
\ No newline at end of file
+        normalized = NAME_PUNCTUATION_PATTERN.sub('', normalized)
+        normalized = NAME_WHITESPACE_PATTERN.sub(' ', normalized)
+        normalized = normalized.strip()
+
+        _remember_names([name], [normalized])
+        return normalized
+
+
+def normalize_names(names: pd.Series) -> pd.Series:
+    """
+    Vectorized normalize_name over a whole Series.
+    Each distinct name is normalized once, names already in the memo are not normalized again.
+    """
+    codes, uniques = pd.factorize(names, use_na_sentinel=True)
+    unique_names = [name if isinstance(name, str) else "" for name in uniques]
+
+    normalized_by_name = {name: memoized for name in unique_names if (memoized := _name_memo.get(name)) is not None}
+    unseen_names = [name for name in dict.fromkeys(unique_names) if name not in normalized_by_name]
+    if unseen_names:
+        normalized = _normalize_unseen_names(unseen_names)
+        normalized_by_name.update(zip(unseen_names, normalized))
+        _remember_names(unseen_names, normalized)
+
+    # The extra trailing entry is what factorize's -1 code for missing names points at
+    normalized_uniques = np.array([normalized_by_name[name] for name in unique_names] + [""], dtype=object)
+    return pd.Series(normalized_uniques[codes], index=names.index, name=names.name, dtype=object)
+
+
+def _normalize_unseen_names(names: list[str]) -> list[str]:
+    """
+    Normalizes a batch of names with vectorized string ops.
+    With pyarrow installed, printable ASCII names run through arrow compute kernels, where RE2 and python regex semantics agree.
+    Every other name uses python regex over an object Series.
+    """
+    if ARROW_STRING_DTYPE is None:
+        return _normalize_name_series(pd.Series(names, dtype=object), NAME_SUFFIX_PATTERN, NAME_PUNCTUATION_PATTERN, NAME_WHITESPACE_PATTERN)
+
+    is_simple = [name.isascii() and name.isprintable() for name in names]
+    simple_names = iter(_normalize_name_series(
+        pd.Series([name for name, simple in zip(names, is_simple) if simple], dtype=ARROW_STRING_DTYPE),
+        NAME_SUFFIX_PATTERN.pattern, NAME_PUNCTUATION_PATTERN.pattern, NAME_WHITESPACE_PATTERN.pattern,
+    ))
+    other_names = iter(_normalize_name_series(
+        pd.Series([name for name, simple in zip(names, is_simple) if not simple], dtype=object),
+        NAME_SUFFIX_PATTERN, NAME_PUNCTUATION_PATTERN, NAME_WHITESPACE_PATTERN,
+    ))
+    return [next(simple_names) if simple else next(other_names) for simple in is_simple]
+
+
+def _normalize_name_series(names: pd.Series, suffix_pattern, punctuation_pattern, whitespace_pattern) -> list[str]:
+    """Applies the normalize_name steps to a whole Series"""
+    if names.empty:
+        return []
+    return (
+        names
+        .str.lower()
+        .str.strip()
+        .str.replace(suffix_pattern, '', regex=True)
+        .str.replace(punctuation_pattern, '', regex=True)
+        .str.replace(whitespace_pattern, ' ', regex=True)
+        .str.strip()
+        .tolist()
+    )
+
+
+def _remember_names(names: list[str], normalized_names: list[str]):
+    """Stores normalized names in the memo, evicting the oldest entries once it is over NAME_MEMO_SIZE"""
+    with _name_memo_lock:
+        _name_memo.update(zip(names, normalized_names))
+        overflow = len(_name_memo) - NAME_MEMO_SIZE
+        for name in list(itertools.islice(_name_memo, max(overflow, 0))):
+            _name_memo.pop(name, None)
@@ -1,10 +1,13 @@
+from contextlib import contextmanager
 import logging
 from gspread import Worksheet
+from gspread.utils import a1_to_rowcol, rowcol_to_a1
 import pandas as pd
 from gspread_dataframe import set_with_dataframe, get_as_dataframe
 
-
-from spreadsheets.spreadsheet_utils import build_range
+from instrumentation.metrics import WORKSHEET_OPERATIONS, instrumented
+from instrumentation.tracing import current_span
+from spreadsheets.spreadsheet_utils import build_range, dataframe_to_rows
 
 logging.basicConfig(format="%(asctime)s [%(levelname)s] %(message)s", level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -17,6 +20,9 @@ class WorksheetWrapper:
         self.ws = worksheet
         self.name = self.ws.title
         self.id = self.ws.id
+        self._batch = None
+        # TokenBucket paying for every write request this worksheet sends, set when its writes run through a SheetWriteQueue
+        self.write_budget = None
     
 
     def retrieve_headers(self) -> list[str]:
@@ -26,12 +32,41 @@ class WorksheetWrapper:
         return current_headers[0] if current_headers else None
 
 
+    @instrumented(WORKSHEET_OPERATIONS)
     def write_cell_range(self, values: list[list], start_cell: str="A1"):
-        """Write a data in a matrix format to a given cell range"""
+        """Write a data in a matrix format to a given cell range, queued instead when called inside batch_writes"""
         cell_range = build_range(start_cell, len(values), len(values[0]))
+        if self._batch is not None:
+            self._batch.append({"range": cell_range, "values": values})
+            return
+        self._trace_write(values)
+        self._spend_writes()
         self.ws.update(values, cell_range)
 
+
+    @contextmanager
+    def batch_writes(self):
+        """
+        Collects the write_cell_range and write_dataframe calls made inside the block and sends them in a single batch_update on exit.
+        Nested blocks join the outer batch, nothing is sent if the block raises.
+        """
+        if self._batch is not None:
+            yield self
+            return
+
+        self._batch = []
+        try:
+            yield self
+            batch = self._batch
+        finally:
+            self._batch = None
+
+        if batch:
+            logger.debug(f"Sending {len(batch)} ranges to {self} in one batch update")
+            self._send_batch(batch)
+
     
+    @instrumented(WORKSHEET_OPERATIONS)
     def write_dataframe(self, df: pd.DataFrame, clear: bool = True, include_index: bool = False, row: int=1, col: int=1):
         """
         Writes a pandas DataFrame to the worksheet.
@@ -44,11 +79,24 @@ class WorksheetWrapper:
             print("Warning: DataFrame is empty. Skipping sheet update.")
             return
 
+        if self._batch is not None and not clear:
+            df = df.reset_index() if include_index else df
+            self.write_cell_range(dataframe_to_rows(df, include_headers=True), rowcol_to_a1(row, col))
+            return
+
         if clear:
+            self._spend_writes()
             self.ws.clear()
+        # The frame plus its header row, counted from its shape rather than converted
+        current_span().add(rows_written=len(df) + 1, cells_written=(len(df) + 1) * (len(df.columns) + (df.index.nlevels if include_index else 0)))
+        # set_with_dataframe resizes the grid first when the frame does not fit, then updates the cells
+        last_row = row + len(df)
+        last_col = col - 1 + len(df.columns) + (df.index.nlevels if include_index else 0)
+        self._spend_writes(1 + (last_row > self.ws.row_count or last_col > self.ws.col_count))
         set_with_dataframe(self.ws, df, row=row, col=col, include_index=include_index)
 
 
+    @instrumented(WORKSHEET_OPERATIONS)
     def read_dataframe(self, evaluate_formulas: bool = False, header_row: int = 1) -> pd.DataFrame:
         """
         Reads the worksheet into a pandas DataFrame.
@@ -62,36 +110,161 @@ class WorksheetWrapper:
         return df
 
 
+    @instrumented(WORKSHEET_OPERATIONS, label="batch_writes")
+    def _send_batch(self, batch: list[dict]):
+        """Sends the ranges collected by batch_writes"""
+        self._ensure_grid(batch)
+        for entry in batch:
+            self._trace_write(entry["values"])
+        self._spend_writes()
+        self.ws.batch_update(batch)
+
+
+    def _ensure_grid(self, batch: list[dict]):
+        """Adds rows or columns so every range of a batch fits in the worksheet grid, like set_with_dataframe does"""
+        last_rows, last_cols = zip(*(a1_to_rowcol(entry["range"].split(":")[-1]) for entry in batch))
+        rows, cols = max(max(last_rows), self.ws.row_count), max(max(last_cols), self.ws.col_count)
+        if (rows, cols) != (self.ws.row_count, self.ws.col_count):
+            self._spend_writes()
+            self.ws.resize(rows=rows, cols=cols)
+
+
+    @instrumented(WORKSHEET_OPERATIONS)
     def get_list_matrix(self) -> list[list]:
         """Returns a 2d matrix of all the cells containing values on the worksheet"""
         return self.ws.get_all_values()
     
 
+    @instrumented(WORKSHEET_OPERATIONS)
     def get_records(self) -> list[dict]:
         """Returns a list of dictionaries of the rows with the headers as keys"""
         return self.ws.get_all_records()
 
 
+    @instrumented(WORKSHEET_OPERATIONS)
     def append_row(self, row: list):
         """Add a row to the spreadsheet"""
+        self._trace_write([row])
+        self._spend_writes()
         self.ws.append_row(row)
     
 
+    @instrumented(WORKSHEET_OPERATIONS)
     def append_rows(self, rows: list[list]):
         """Adds multiple rows to the spreadsheet"""
+        self._trace_write(rows)
+        self._spend_writes()
         self.ws.append_rows(rows)
     
 
+    @instrumented(WORKSHEET_OPERATIONS)
+    def delete_row_ranges(self, row_ranges: list[tuple[int, int]]):
+        """
+        Deletes several blocks of rows in a single batch request.
+        Each range is a (start_row, end_row) pair, 1-indexed and inclusive, ranges are deleted bottom up so earlier rows keep their index.
+        """
+        if not row_ranges:
+            return
+
+        requests = [
+            {
+                "deleteDimension": {
+                    "range": {"sheetId": self.id, "dimension": "ROWS", "startIndex": start_row - 1, "endIndex": end_row}
+                }
+            }
+            for start_row, end_row in sorted(row_ranges, reverse=True)
+        ]
+        current_span().add(rows_deleted=sum(end_row - start_row + 1 for start_row, end_row in row_ranges))
+        self._spend_writes()
+        self.ws.spreadsheet.batch_update({"requests": requests})
+
+
     def is_empty(self) -> bool:
-        """Checks to see if the Worksheet is empty (No cells with values)"""
-        return True if self.ws.get_all_values() == [[]] else False
+        """Checks to see if the Worksheet is empty, every worksheet in the project writes from A1 so only that cell is read"""
+        return self.first_cell() is None
 
 
+    @instrumented(WORKSHEET_OPERATIONS)
+    def first_cell(self):
+        """Returns the value of A1, None if the cell is empty"""
+        values = self.ws.get("A1")
+        return values[0][0] if values and values[0] else None
+
+
+    @instrumented(WORKSHEET_OPERATIONS)
+    def header_row(self) -> list:
+        """Returns the values of the first row"""
+        return self.ws.row_values(1)
+
+
+    @instrumented(WORKSHEET_OPERATIONS)
+    def last_rows(self, n: int=1, skip_header: bool=True) -> list[list]:
+        """
+        Returns the last n rows with data, reading only the bottom of the sheet.
+        Rows are located from the grid row count, worksheets with blank rows at the bottom fall back to the length of column A.
+        """
+        first_row = 2 if skip_header else 1
+        row_count = self.grid_row_count()
+        if row_count < first_row:
+            return []
+
+        tail_start = max(first_row, row_count - n + 1)
+        tail = self._read_rows(tail_start, row_count)
+        if len(tail) == row_count - tail_start + 1:
+            return tail
+
+        last_row = self._last_data_row()
+        if last_row < first_row:
+            return []
+        return self._read_rows(max(first_row, last_row - n + 1), last_row)
+
+
+    @instrumented(WORKSHEET_OPERATIONS)
+    def grid_row_count(self) -> int:
+        """Current number of rows in the worksheet grid, Worksheet.row_count is not updated by appends so it is fetched"""
+        metadata = self.ws.spreadsheet.fetch_sheet_metadata({"fields": "sheets.properties(sheetId,gridProperties)"})
+        for sheet in metadata["sheets"]:
+            if sheet["properties"]["sheetId"] == self.id:
+                return sheet["properties"]["gridProperties"]["rowCount"]
+        return self.ws.row_count
+
+
+    def _read_rows(self, start_row: int, end_row: int) -> list[list]:
+        """Reads the rows between start_row and end_row (inclusive) across every column, trailing empty rows are dropped"""
+        values = self.ws.get(f"A{start_row}:{rowcol_to_a1(end_row, self.ws.col_count)}")
+        rows = [list(row) for row in values]
+        while rows and not any(rows[-1]):
+            rows.pop()
+        return rows
+
+
+    def _last_data_row(self) -> int:
+        """Last row with a value in column A, read in one request since the API drops the trailing empty cells of the column"""
+        return len(self.ws.col_values(1))
+
+
+    @instrumented(WORKSHEET_OPERATIONS)
     def clear(self):
         """Clears all cells in the current worksheet """
         logger.info(f"Clearing all values from {self}")
+        self._spend_writes()
         self.ws.clear()
     
 
+    def _spend_writes(self, requests: int=1):
+        """Takes one token per write request about to be sent from write_budget, if the worksheet is paced by one"""
+        if self.write_budget is not None:
+            for _ in range(requests):
+                self.write_budget.acquire()
+
+
+    @staticmethod
+    def _trace_write(rows: list[list]):
+        """Adds the rows and cells of a write to the current trace span, if any, without serializing the payload"""
+        write_span = current_span()
+        if write_span:
+            write_span.add(rows_written=len(rows), cells_written=sum(len(row) for row in rows))
+
+
     def __repr__(self):
         return f"{self.__class__.__name__}({self.name}, {self.id})"
\ No newline at end of file
@@ -0,0 +1,39 @@
+import json
+import os
+import time
+
+import pandas as pd
+
+from benchmarks.draft_replay import ADP_FILE, record_draft, run_replay
+from benchmarks.mock_api_server import MockApiServer, MockApiState
+import sleeper.sleeper_api as sleeper_api
+from spreadsheets.players_spreadsheet.players_data_worksheet import PlayersDataWorksheet
+from spreadsheets.spreadsheet_utils import normalize_names
+
+
+
+def test_record_then_replay_round_trip(tmp_path):
+    teams, rounds = 4, 3
+    state = MockApiState(drafts=1, teams=teams, rounds=rounds, players=200, pick_clock=0.01)
+    server = MockApiServer(state)
+    server.start()
+    try:
+        with server.patch_api_base_urls():
+            players_df = PlayersDataWorksheet.clean_df(object.__new__(PlayersDataWorksheet), pd.DataFrame(sleeper_api.get_players())).reset_index()
+            players_df["normalized_name"] = normalize_names(players_df["full_name"])
+
+            draft = state.drafts[0]
+            while draft.status(time.time()) != "complete":
+                time.sleep(0.01)
+            record_draft(draft.league_id, str(tmp_path), players_df)
+    finally:
+        server.stop()
+
+    # The ADP is recorded as the raw response body, which ffcalc_api.get_adp unwraps
+    with open(os.path.join(tmp_path, ADP_FILE.format(scoring_format="ppr")), encoding="utf-8") as f:
+        assert "players" in json.load(f)
+
+    results = run_replay(str(tmp_path))
+    assert results["picks"] == teams * rounds
+    assert results["polls"] == teams * rounds
+    assert results["sleeper_requests"]["adp_ppr"] == 1
@@ -0,0 +1,46 @@
+from spreadsheets.memory_backend import MemoryClient
+from spreadsheets.players_spreadsheet.update_log_worksheet import UpdateLogWorksheet
+from spreadsheets.worksheet_wrapper import WorksheetWrapper
+
+
+
+def new_worksheet(title: str="sheet", rows: int=1000, cols: int=26):
+    return MemoryClient().open("test").add_worksheet(title, rows=rows, cols=cols)
+
+
+def test_get_empty_range_matches_gspread():
+    worksheet = new_worksheet()
+    assert worksheet.get("A1") == [[]]
+    assert worksheet.get("A1:C10") == [[]]
+    assert "values" not in worksheet.spreadsheet.values_get("sheet!A1:C10")
+
+
+def test_last_rows_with_blank_rows_at_the_bottom():
+    wrapper = WorksheetWrapper(new_worksheet())
+    wrapper.append_rows([["name", "value"], ["a", "1"], ["b", "2"], ["c", "3"]])
+
+    assert wrapper.last_rows(1) == [["c", "3"]]
+    assert wrapper.last_rows(2) == [["b", "2"], ["c", "3"]]
+    assert wrapper.last_rows(10) == [["a", "1"], ["b", "2"], ["c", "3"]]
+
+
+def test_last_rows_on_a_full_grid():
+    wrapper = WorksheetWrapper(new_worksheet(rows=3, cols=2))
+    wrapper.write_cell_range([["name", "value"], ["a", "1"], ["b", "2"]])
+
+    assert wrapper.last_rows(1) == [["b", "2"]]
+
+
+def test_last_rows_of_a_header_only_sheet():
+    wrapper = WorksheetWrapper(new_worksheet())
+    wrapper.write_cell_range([["name", "value"]])
+
+    assert wrapper.last_rows(1) == []
+
+
+def test_retrieve_last_log_on_a_default_grid():
+    update_logs = UpdateLogWorksheet(new_worksheet("update_logs"))
+    update_logs.post_log("first")
+    update_logs.post_log("second")
+
+    assert update_logs.retrieve_last_log()["upload_description"] == "second"
@@ -0,0 +1,20 @@
+from datetime import datetime, timedelta
+
+import pandas as pd
+
+from spreadsheets.players_spreadsheet.players_snapshot import PlayersSnapshot
+
+
+
+def test_snapshot_ages_with_its_source_data(tmp_path):
+    players_df = pd.DataFrame({"player_id": ["1", "2"], "full_name": ["A B", "C D"]})
+    snapshot = PlayersSnapshot(str(tmp_path / "players_snapshot.parquet"), ttl=timedelta(days=1))
+
+    snapshot.write(players_df, source_updated_at=datetime.now() - timedelta(hours=1))
+    assert snapshot.is_fresh()
+    assert snapshot.load()["player_id"].tolist() == ["1", "2"]
+
+    # Re-saving sheet data last updated two days ago must not make it look fresh
+    snapshot.write(players_df, source_updated_at=datetime.now() - timedelta(days=2))
+    assert not snapshot.is_fresh()
+    assert snapshot.load() is None
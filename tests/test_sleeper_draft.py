@@ -0,0 +1,100 @@
+from types import SimpleNamespace
+
+import pandas as pd
+
+from agents.prompts.draft_status_prompt import DraftStatusPrompt
+import sleeper.sleeper_draft as sleeper_draft
+from sleeper.sleeper_draft import Draft
+
+TEAMS, ROUNDS = 2, 2
+
+
+
+class LaggingDraftApi:
+    """Draft info and picks endpoints where the picks can trail the draft info by a number of picks"""
+    def __init__(self):
+        self.picks_made = 0
+        self.picks_lag = 0
+        self.picks_requests = 0
+
+
+    def get_draft_info(self, draft_id: str) -> dict:
+        return {
+            "draft_id": draft_id,
+            "type": "snake",
+            "status": "complete" if self.picks_made >= TEAMS * ROUNDS else "drafting",
+            "last_picked": self.picks_made * 1000 or None,
+            "last_message_id": str(self.picks_made),
+            "last_message_time": self.picks_made * 1000,
+            "settings": {"teams": TEAMS, "rounds": ROUNDS},
+        }
+
+
+    def get_draft_picks(self, draft_id: str) -> list[dict]:
+        self.picks_requests += 1
+        return [
+            {"pick_no": pick_no, "round": (pick_no - 1) // TEAMS + 1, "player_id": str(pick_no), "picked_by": "user"}
+            for pick_no in range(1, self.picks_made - self.picks_lag + 1)
+        ]
+
+
+def new_draft(monkeypatch) -> tuple[Draft, LaggingDraftApi]:
+    api = LaggingDraftApi()
+    monkeypatch.setattr(sleeper_draft, "sleeper_api", api)
+    league = SimpleNamespace(draft_id="draft", redraft=True, id_username_map={})
+    return Draft(league, adp_provider=object()), api
+
+
+def test_lagging_picks_are_fetched_again(monkeypatch):
+    draft, api = new_draft(monkeypatch)
+
+    api.picks_made, api.picks_lag = 1, 1
+    draft.update_picks()
+    assert draft.last_pick_no == 0
+
+    # Same draft info as the lagging fetch, the picks must not be skipped
+    api.picks_lag = 0
+    draft.update_picks()
+    assert draft.last_pick_no == 1
+
+
+def test_unchanged_picks_are_skipped_once_confirmed(monkeypatch):
+    draft, api = new_draft(monkeypatch)
+
+    api.picks_made = 1
+    draft.update_picks()
+    draft.update_picks()
+    requests = api.picks_requests
+    draft.update_picks()
+    assert api.picks_requests == requests
+    assert draft.requests_saved == 1
+
+
+def test_last_pick_of_a_lagging_complete_draft(monkeypatch):
+    draft, api = new_draft(monkeypatch)
+
+    api.picks_made, api.picks_lag = TEAMS * ROUNDS, 1
+    draft.update_picks()
+    assert draft.last_pick_no == TEAMS * ROUNDS - 1
+
+    api.picks_lag = 0
+    draft.update_picks()
+    assert draft.last_pick_no == TEAMS * ROUNDS
+
+    # Every pick of the complete draft is in, later polls skip the picks
+    requests = api.picks_requests
+    draft.update_picks()
+    assert api.picks_requests == requests
+
+
+def test_draft_state_before_the_first_pick(monkeypatch):
+    players_df = pd.DataFrame({"player_id": ["1", "2", "3"], "position": ["WR", "RB", "WR"], "adp": [2.0, 1.0, 99.0]})
+    draft, _ = new_draft(monkeypatch)
+    draft.adp_provider = SimpleNamespace(merge=lambda df: df.sort_values("adp"))
+
+    picks_df, remaining_players = draft.retrieve_draft_state(players_df, refresh=False)
+    assert picks_df.empty
+    assert len(remaining_players) == 3
+
+    prompt = DraftStatusPrompt(pd.DataFrame(), pd.DataFrame(), picks_df, remaining_players)
+    assert prompt.get_top_available_by_adp().player_id.tolist() == ["2", "1"]